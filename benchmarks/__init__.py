@@ -0,0 +1,4 @@
+"""
+Benchmarks for the documentation generator, run from the repository root,
+e.g. `python -m benchmarks.templates`.
+"""
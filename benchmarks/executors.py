@@ -0,0 +1,79 @@
+"""
+Compares parsing a project in worker processes, in worker threads and
+serially, and measures what pickling the parsed contents costs.
+
+Usage:
+
+    python -m benchmarks.executors [--path src] [--workers 4] [--repeat 3]
+"""
+
+import argparse
+import pickle
+import tempfile
+from os import makedirs
+from os.path import join
+from utils.file_tools import FileTools
+from utils.scheduler import ParseScheduler
+from .synthetic import SOURCE, best_of
+
+
+def write_project(root, files):
+    """
+    Writes a synthetic project of copies of the synthetic module.
+
+    Args:
+        root (str): The directory to write to.
+        files (int): The number of files.
+    """
+
+    for number in range(files):
+        directory = join(root, f"package{number // 50}")
+        makedirs(directory, exist_ok=True)
+        with open(join(directory, f"module{number}.py"), "wb") as file:
+            # Larger files, so parsing outweighs starting the workers
+            file.write(SOURCE * 10)
+
+
+def main():
+    """
+    Prefetches the project with each executor and prints the best times.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", help="Project to parse, a synthetic one if omitted")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = args.path
+        if root is None:
+            root = directory
+            write_project(root, args.files)
+        print(
+            f"GIL enabled: {ParseScheduler.gil_enabled()}, 'auto' picks "
+            f"{ParseScheduler.choose_executor('auto')} workers"
+        )
+        for executor in ("process", "thread"):
+            seconds, _ = best_of(
+                lambda: ParseScheduler(args.workers, executor=executor).prefetch(root),
+                args.repeat,
+            )
+            print(f"{args.workers} {executor} workers: {seconds * 1000:8.1f} ms")
+
+        files = FileTools.list_python_files(root)
+        seconds, contents = best_of(
+            lambda: [FileTools.build_file_content(path) for path, _ in files],
+            args.repeat,
+        )
+        print(f"serial parse:      {seconds * 1000:8.1f} ms")
+        seconds, _ = best_of(
+            lambda: [pickle.loads(pickle.dumps(content)) for content in contents],
+            args.repeat,
+        )
+        print(f"pickling contents: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Times resolving inherited methods on synthetic class hierarchies of growing
+size, to check the time grows linearly with the number of classes.
+
+Usage:
+
+    python -m benchmarks.hierarchy [--depth 10] [--repeat 3]
+"""
+
+import argparse
+from utils.hierarchy import ClassIndex
+from .synthetic import best_of
+
+
+CLASSES_PER_MODULE = 50
+METHODS_PER_CLASS = 4
+
+
+def hierarchy_tree(classes, depth):
+    """
+    Builds a file tree of chains of subclasses, each `depth` classes deep.
+
+    Every class subclasses the previous class of its chain, through a
+    qualified name when it lives in another module, and defines its own
+    documented methods.
+
+    Args:
+        classes (int): The number of classes.
+        depth (int): The length of each inheritance chain.
+
+    Returns:
+        dict: The file tree.
+    """
+
+    root = "/hierarchy"
+    files = []
+    for number in range(classes):
+        module, index = divmod(number, CLASSES_PER_MODULE)
+        if index == 0:
+            files.append(
+                {
+                    "name": f"module{module}",
+                    "type": "file",
+                    "path": f"{root}/module{module}.py",
+                    "content": {"functions": [], "classes": []},
+                }
+            )
+        bases = []
+        if number % depth:
+            base_module, _ = divmod(number - 1, CLASSES_PER_MODULE)
+            bases = [f"module{base_module}.Class{number - 1}"]
+        files[-1]["content"]["classes"].append(
+            {
+                "name": f"Class{number}",
+                "doc_string": {"short_description": f"Class {number}.", "meta": []},
+                "bases": bases,
+                "methods": [
+                    {
+                        "name": f"method{number % depth}_{method}",
+                        "doc_string": {"short_description": "A method.", "meta": []},
+                    }
+                    for method in range(METHODS_PER_CLASS)
+                ],
+            }
+        )
+    return {"name": "hierarchy", "type": "directory", "path": root, "files": files}
+
+
+def main():
+    """
+    Attaches the inherited methods to trees of 2k to 16k classes and prints
+    the best time of each.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for classes in (2000, 4000, 8000, 16000):
+        tree = hierarchy_tree(classes, args.depth)
+        seconds, count = best_of(lambda: ClassIndex.attach_inherited(tree), args.repeat)
+        print(
+            f"{classes:6} classes, depth {args.depth}: {seconds * 1000:7.1f} ms, "
+            f"{seconds / classes * 1e6:5.1f} us per class, {count} inheriting"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+This module builds synthetic file trees for the benchmarks.
+
+Functions:
+
+    synthetic_tree:
+        Builds a file tree with a given number of documented symbols, without
+        touching the filesystem.
+
+    best_of:
+        Times a function several times and keeps the fastest run.
+"""
+
+import time
+from utils.file_tools import FileTools
+
+
+# A module with 4 symbols: a class, its method, and two functions
+SOURCE = b'''
+class Model:
+    """
+    A model.
+
+    Attributes:
+        value (int): The value.
+    """
+
+    def method(self, value):
+        """
+        Doubles a value.
+
+        Args:
+            value (int): The value <1> & more.
+
+        Returns:
+            int: Twice the value.
+        """
+
+
+def function(name, count=1):
+    """
+    Repeats a name.
+
+    Args:
+        name (str): The name.
+        count (int, optional): The repetitions. Defaults to 1.
+
+    Returns:
+        str: The repeated name.
+    """
+
+
+def undocumented_returns(path):
+    """
+    Opens a path.
+
+    Args:
+        path (str): The path.
+    """
+'''
+
+SYMBOLS_PER_FILE = 4
+FILES_PER_DIRECTORY = 50
+
+
+def synthetic_tree(symbols, root="/synthetic"):
+    """
+    Builds a file tree with at least the given number of documented symbols.
+
+    One module is parsed, and its content is shared by every file of the tree,
+    so building a tree with 100k symbols takes milliseconds.
+
+    Args:
+        symbols (int): The number of symbols.
+        root (str, optional): The absolute path of the tree root.
+                              Defaults to "/synthetic".
+
+    Returns:
+        dict: The file tree.
+    """
+
+    files = -(-symbols // SYMBOLS_PER_FILE)
+    content = FileTools.build_file_content(f"{root}/module.py", source=SOURCE)
+    tree = {"name": "synthetic", "type": "directory", "path": root, "directories": []}
+    for number in range(-(-files // FILES_PER_DIRECTORY)):
+        path = f"{root}/package{number}"
+        count = min(FILES_PER_DIRECTORY, files - number * FILES_PER_DIRECTORY)
+        tree["directories"].append(
+            {
+                "name": f"package{number}",
+                "type": "directory",
+                "path": path,
+                "directories": [],
+                "files": [
+                    {
+                        "name": f"module{index}",
+                        "type": "file",
+                        "path": f"{path}/module{index}.py",
+                        "content": content,
+                    }
+                    for index in range(count)
+                ],
+            }
+        )
+    return tree
+
+
+def best_of(function, repeat=3):
+    """
+    Times a function several times and keeps the fastest run.
+
+    Args:
+        function (callable): The function to time, called without arguments.
+        repeat (int, optional): The number of runs. Defaults to 3.
+
+    Returns:
+        float: The seconds of the fastest run.
+        The return value of the last run.
+    """
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
@@ -0,0 +1,37 @@
+"""
+Compares the template renderer with the reference `Html` renderer.
+
+Usage:
+
+    python -m benchmarks.templates [--symbols 100000] [--repeat 3]
+"""
+
+import argparse
+from utils.output import Html, TemplateHtml
+from .synthetic import best_of, synthetic_tree
+
+
+def main():
+    """
+    Renders a synthetic tree with both renderers and prints the best times.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tree = synthetic_tree(args.symbols)
+    results = {}
+    for name, renderer in (("Html", Html()), ("TemplateHtml", TemplateHtml())):
+        seconds, results[name] = best_of(
+            lambda: renderer.build_html(tree), args.repeat
+        )
+        print(f"{name:<14} {seconds * 1000:8.1f} ms")
+    if results["Html"] != results["TemplateHtml"]:
+        raise SystemExit("The renderers produced different output")
+    print(f"Identical output, {len(results['Html']) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compares saving and loading the tree as `doc.json` and as `doc.tree`.
+
+Usage:
+
+    python -m benchmarks.tree_format [--symbols 40000] [--repeat 3]
+"""
+
+import argparse
+import json
+from utils.output import Json
+from utils.tree_format import TreeFormat
+from .synthetic import best_of, synthetic_tree
+
+
+def main():
+    """
+    Saves and loads a synthetic tree in both formats and prints the best times.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=40000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # A JSON round trip unshares the file contents and strings, like a parse
+    tree = json.loads(json.dumps(synthetic_tree(args.symbols)))
+    formats = {
+        "doc.json": (Json().build_json, json.loads),
+        "doc.tree": (TreeFormat.dumps, lambda data: TreeFormat.loads(data)[0]),
+    }
+    for name, (save, load) in formats.items():
+        save_seconds, data = best_of(lambda: save(tree), args.repeat)
+        load_seconds, loaded = best_of(lambda: load(data), args.repeat)
+        if loaded != tree:
+            raise SystemExit(f"{name} did not load back the saved tree")
+        print(
+            f"{name}: {len(data) / 1e6:6.1f} MB, save {save_seconds * 1000:7.1f} ms, "
+            f"load {load_seconds * 1000:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@
 This script is the entry point for the 'py-doc-generator' command-line application.
 """
 
+import sys
 from utils.cli import Cli
 
-cli = Cli()
-cli.run()
+if __name__ == "__main__":
+    cli = Cli()
+    sys.exit(cli.run())
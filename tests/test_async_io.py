@@ -0,0 +1,103 @@
+"""
+Tests the async I/O mode against a local directory with injected latency.
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from os import makedirs
+from os.path import join
+from unittest import mock
+
+from utils.async_io import AsyncFileTools
+from utils.file_tools import FileTools
+
+
+# Injected seconds per I/O call, and the size of the project
+LATENCY = 0.02
+DIRECTORIES = 4
+FILES = 10
+
+
+class CountingFileTools(AsyncFileTools):
+    """
+    Records the most I/O calls that were in flight at once.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def call_io(self, func, args):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return super().call_io(func, args)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class AsyncIoTest(unittest.TestCase):
+    """
+    Walks a small project with artificial network latency.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        for directory in range(DIRECTORIES):
+            path = join(self.root, f"package{directory}")
+            makedirs(path)
+            for file in range(FILES):
+                with open(join(path, f"module{file}.py"), "w") as out:
+                    out.write(f'def function{file}():\n    """Returns {file}."""\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_identical_tree(self):
+        walk = AsyncFileTools(max_in_flight=8, latency=LATENCY)
+        self.assertEqual(
+            walk.build_directories(self.root), FileTools.build_directories(self.root)
+        )
+
+    def test_concurrent_within_limit(self):
+        # One listing per directory and one read per file, one after the other
+        serial_seconds = (1 + DIRECTORIES + DIRECTORIES * FILES) * LATENCY
+        walk = CountingFileTools(max_in_flight=8, latency=LATENCY)
+        start = time.perf_counter()
+        walk.build_directories(self.root)
+        self.assertLess(time.perf_counter() - start, serial_seconds / 2)
+        self.assertEqual(walk.peak, 8)
+
+    def test_read_error_read_once(self):
+        broken = join(self.root, "package0", "module0.py")
+
+        def read_file(file_path):
+            if file_path == broken:
+                return None, FileTools.build_diagnostic(PermissionError("denied"))
+            return AsyncFileTools.read_file(file_path)
+
+        walk = AsyncFileTools(latency=LATENCY)
+        with mock.patch.object(walk, "read_file", read_file), mock.patch.object(
+            FileTools, "ast_parse", wraps=FileTools.ast_parse
+        ) as ast_parse:
+            tree = walk.build_directories(self.root)
+        self.assertEqual(
+            FileTools.collect_diagnostics(tree),
+            [(broken, {"type": "PermissionError", "message": "denied", "line": None})],
+        )
+        # Every other file was parsed from the bytes read by the walk
+        self.assertEqual(ast_parse.call_count, DIRECTORIES * FILES - 1)
+        self.assertTrue(
+            all(call.kwargs["source"] is not None for call in ast_parse.call_args_list)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
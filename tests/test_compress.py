@@ -0,0 +1,103 @@
+"""
+Tests that every compression codec writes outputs which decompress to the
+plain outputs, and that html keeps its plain page next to the compressed one.
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from importlib import import_module
+from os import makedirs, walk
+from os.path import join, relpath
+
+from utils.cli import Cli
+from utils.file_tools import COMPRESSION_CODECS
+
+
+SOURCE = '''
+class Model:
+    """
+    A model <with> & markup.
+
+    Args:
+        value (int, optional): The value. Defaults to 1.
+    """
+
+    def save(self, path):
+        """
+        Saves the model.
+
+        Args:
+            path (str): The path.
+        """
+'''
+
+OUTPUT_TYPES = "html,lazy-html,markdown,json,tree"
+
+# Outputs written plain as well, the page and the assets it fetches
+PLAIN_NAMES = ("index.html", "lazy.html")
+
+
+def read_files(directory):
+    files = {}
+    for path, _, names in walk(directory):
+        for name in names:
+            with open(join(path, name), "rb") as file:
+                files[relpath(join(path, name), directory)] = file.read()
+    return files
+
+
+class CompressTest(unittest.TestCase):
+    """
+    Documents a small project plain and with every codec.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = join(self.directory.name, "src")
+        self.package = join(self.root, "pkg")
+        makedirs(self.package)
+        for name in ("models", "views"):
+            with open(join(self.package, f"{name}.py"), "w", encoding="utf-8") as file:
+                file.write(SOURCE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self, name, *args):
+        out = join(self.directory.name, name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            Cli(["-p", self.root, "-o", out, "-ot", OUTPUT_TYPES, *args]).run()
+        return read_files(out)
+
+    def test_round_trip(self):
+        plain = self.build("plain")
+        self.assertIn("lazy.html", plain)
+        self.assertGreater(len(plain), len(PLAIN_NAMES) + 3)
+        for codec, (extension, module) in COMPRESSION_CODECS.items():
+            with self.subTest(codec=codec):
+                files = self.build(codec, "--compress", codec)
+                open_codec = import_module(module).open
+                decompressed = {}
+                for path, data in files.items():
+                    if path.endswith(extension):
+                        with open_codec(io.BytesIO(data), "rb") as file:
+                            decompressed[path[: -len(extension)]] = file.read()
+                self.assertEqual(decompressed, plain)
+                # The pages and lazy-html's fragments are kept plain
+                kept = {path: data for path, data in files.items() if path in plain}
+                self.assertEqual(
+                    sorted(kept),
+                    sorted(
+                        path
+                        for path in plain
+                        if path in PLAIN_NAMES or not path.startswith("doc.")
+                    ),
+                )
+                for path, data in kept.items():
+                    self.assertEqual(data, plain[path])
+
+
+if __name__ == "__main__":
+    unittest.main()
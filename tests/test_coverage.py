@@ -0,0 +1,90 @@
+"""
+Tests the coverage command's counts, thresholds and missing symbol listing.
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from os import mkdir
+from os.path import join
+
+from utils.cli import Cli
+from utils.coverage import Coverage
+
+
+# Three of the four public symbols are documented, one file is 50% covered
+SOURCES = {
+    "full.py": 'def documented():\n    """Is documented."""\n',
+    "half.py": (
+        "class Model:\n"
+        '    """A model."""\n'
+        "\n"
+        "    def save(self):\n"
+        "        pass\n"
+        "\n"
+        "    def _private(self):\n"
+        "        pass\n"
+    ),
+    "other.py": 'def other():\n    """Is documented."""\n',
+}
+
+
+class CoverageTest(unittest.TestCase):
+    """
+    Checks a small project with the coverage command.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        mkdir(join(self.root, "pkg"))
+        for name, source in SOURCES.items():
+            with open(join(self.root, "pkg", name), "w", encoding="utf-8") as file:
+                file.write(source)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_coverage(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = Cli(["coverage", "-p", self.root, *args]).run()
+        return status, output.getvalue()
+
+    def test_counts(self):
+        report = Coverage.check(self.root)
+        self.assertEqual(report["directories"][self.root], (3, 4))
+        self.assertEqual(
+            report["files"][join(self.root, "pkg", "half.py")], (1, 2, ["Model.save"])
+        )
+
+    def test_fail_under(self):
+        self.assertIsNone(self.run_coverage("--fail-under", "75")[0])
+        self.assertEqual(self.run_coverage("--fail-under", "80")[0], 1)
+
+    def test_fail_under_file(self):
+        self.assertIsNone(self.run_coverage("--fail-under-file", "50")[0])
+        status, output = self.run_coverage("--fail-under-file", "60")
+        self.assertEqual(status, 1)
+        self.assertIn("half.py", output)
+
+    def test_missing(self):
+        output = self.run_coverage()[1]
+        self.assertNotIn("Model.save", output)
+        output = self.run_coverage("--missing")[1]
+        self.assertIn("half.py: 1/2, missing Model.save", output)
+        self.assertNotIn("full.py", output)
+        self.assertNotIn("_private", output)
+
+    def test_coding_cookie_is_an_error(self):
+        # The build reports a UnicodeDecodeError for it, so must coverage
+        with open(join(self.root, "pkg", "latin.py"), "wb") as file:
+            file.write(b'# -*- coding: latin-1 -*-\ndef f():\n    """caf\xe9."""\n')
+        report = Coverage.check(self.root)
+        self.assertEqual(report["errors"][0][1]["type"], "UnicodeDecodeError")
+        self.assertEqual(report["directories"][self.root], (3, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
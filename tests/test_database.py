@@ -0,0 +1,125 @@
+"""
+Tests the SQLite output's schema, its symbol queries and full-text search, and
+the query command's exit codes.
+"""
+
+import contextlib
+import io
+import sqlite3
+import tempfile
+import unittest
+from os import mkdir
+from os.path import join
+
+from utils.api import build_tree
+from utils.cli import Cli
+from utils.database import Sqlite
+from utils.output import Builder
+
+
+SOURCES = {
+    "main.py": (
+        "def run(path):\n"
+        '    """\n'
+        "    Runs the parse( step on a path.\n"
+        "\n"
+        "    Args:\n"
+        "        path (str): The path.\n"
+        "\n"
+        "    Returns:\n"
+        "        int: The status.\n"
+        '    """\n'
+    ),
+    "utils/tools.py": (
+        "class Loader:\n"
+        '    """Loads configuration files."""\n'
+        "\n"
+        "    def load(self):\n"
+        '        """Reads the files."""\n'
+        "\n"
+        "\n"
+        "def settings():\n"
+        '    """\n'
+        "    Gets the settings.\n"
+        "\n"
+        "    Returns:\n"
+        "        dict: The settings.\n"
+        '    """\n'
+    ),
+}
+
+
+class SqliteTest(unittest.TestCase):
+    """
+    Builds the database of a small project and queries it.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        root = join(cls.directory.name, "src")
+        mkdir(root)
+        mkdir(join(root, "utils"))
+        for name, source in SOURCES.items():
+            with open(join(root, name), "w", encoding="utf-8") as file:
+                file.write(source)
+        cls.database = join(cls.directory.name, "doc.sqlite")
+        with open(cls.database, "wb") as file:
+            file.write(Builder().build(build_tree(root), "sqlite"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def names(self, **filters):
+        _, rows = Sqlite.execute(self.database, *Sqlite.build_query(**filters))
+        return [row[1] for row in rows]
+
+    def query(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Cli(["query", self.database, *args]).run()
+
+    def test_schema(self):
+        connection = sqlite3.connect(self.database)
+        try:
+            objects = dict(
+                connection.execute("SELECT name, type FROM sqlite_master").fetchall()
+            )
+        finally:
+            connection.close()
+        for table in ("directories", "files", "symbols", "params", "returns"):
+            self.assertEqual(objects[table], "table")
+        for index in ("symbols_kind_name", "returns_type", "files_relative_path"):
+            self.assertEqual(objects[index], "index")
+        self.assertEqual(objects["symbols_fts"], "table")
+
+    def test_filters(self):
+        self.assertEqual(self.names(returns="dict", under="utils/"), ["settings"])
+        self.assertEqual(self.names(kind="class", under="utils"), ["Loader"])
+        self.assertEqual(self.names(kind="method"), ["Loader.load"])
+        self.assertEqual(self.names(name="Lo*"), ["Loader"])
+        self.assertEqual(self.names(under="main"), [])
+
+    def test_under_root(self):
+        everything = self.names()
+        self.assertIn("run", everything)
+        for under in ("/", ".", "./", ""):
+            with self.subTest(under=under):
+                self.assertEqual(self.names(under=under), everything)
+
+    def test_search(self):
+        self.assertEqual(self.names(search="configuration"), ["Loader"])
+        self.assertEqual(self.names(search="parse( step"), ["run"])
+        self.assertEqual(self.names(search='"unbalanced'), [])
+
+    def test_query_exit_codes(self):
+        self.assertIsNone(self.query("--returns", "dict"))
+        self.assertIsNone(self.query("--search", "AND OR"))
+        self.assertEqual(self.query("--sql", "SELECT * FROM missing"), 1)
+        missing = join(self.directory.name, "missing.sqlite")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(Cli(["query", missing]).run(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
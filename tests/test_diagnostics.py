@@ -0,0 +1,102 @@
+"""
+Tests that files too deeply nested to parse, or not valid UTF-8, are
+documented with a diagnostic instead of stopping the run.
+"""
+
+import tempfile
+import unittest
+from os import mkdir
+from os.path import abspath, join
+
+from utils.api import build_tree
+from utils.coverage import Coverage
+from utils.file_tools import FileTools
+
+
+# Sources the parser cannot build an AST for, with the error they raise
+PATHOLOGICAL_SOURCES = {
+    "plus.py": ("x = " + "+".join(["1"] * 100000) + "\n", "RecursionError"),
+    "minus.py": ("x = " + "-" * 100000 + "1\n", "MemoryError"),
+}
+
+
+class PathologicalFileTest(unittest.TestCase):
+    """
+    Builds a project holding generated files that overflow the parser.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        mkdir(join(self.root, "pkg"))
+        for name, (source, _) in PATHOLOGICAL_SOURCES.items():
+            with open(join(self.root, "pkg", name), "w", encoding="utf-8") as file:
+                file.write(source)
+        with open(join(self.root, "pkg", "ok.py"), "w", encoding="utf-8") as file:
+            file.write('def documented():\n    """Is documented."""\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def diagnostics(self, tree):
+        return {
+            path.rsplit("/", 1)[-1]: diagnostic["type"]
+            for path, diagnostic in FileTools.collect_diagnostics(tree)
+        }
+
+    def assert_documented(self, tree):
+        expected = {name: error for name, (_, error) in PATHOLOGICAL_SOURCES.items()}
+        self.assertEqual(self.diagnostics(tree), expected)
+        files = tree["directories"][0]["files"]
+        ok = next(file for file in files if file["name"] == "ok")
+        self.assertEqual(ok["content"]["functions"][0]["name"], "documented")
+
+    def test_build_file_content(self):
+        for name, (_, error) in PATHOLOGICAL_SOURCES.items():
+            content = FileTools.build_file_content(join(self.root, "pkg", name))
+            self.assertEqual(content["diagnostics"][0]["type"], error)
+
+    def test_serial(self):
+        self.assert_documented(build_tree(self.root))
+
+    def test_async(self):
+        self.assert_documented(build_tree(self.root, io_mode="async"))
+
+    def test_parse_workers(self):
+        for executor in ("process", "thread"):
+            with self.subTest(executor=executor):
+                self.assert_documented(
+                    build_tree(self.root, parse_workers=2, parse_executor=executor)
+                )
+
+    def test_coverage(self):
+        report = Coverage.check(self.root)
+        errors = {
+            path.rsplit("/", 1)[-1]: diagnostic["type"]
+            for path, diagnostic in report["errors"]
+        }
+        self.assertEqual(
+            errors, {name: error for name, (_, error) in PATHOLOGICAL_SOURCES.items()}
+        )
+        self.assertEqual(report["directories"][abspath(self.root)], (1, 1))
+
+
+class EncodingTest(unittest.TestCase):
+    """
+    Checks that every I/O mode decodes sources the same way.
+    """
+
+    def test_coding_cookie_ignored(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(join(root, "latin.py"), "wb") as file:
+                file.write(b'# -*- coding: latin-1 -*-\ndef f():\n    """caf\xe9."""\n')
+            serial = FileTools.collect_diagnostics(build_tree(root))
+            asynchronous = FileTools.collect_diagnostics(
+                build_tree(root, io_mode="async")
+            )
+            self.assertEqual(serial, asynchronous)
+            self.assertEqual(serial[0][1]["type"], "UnicodeDecodeError")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Tests the class index's method resolution order against Python's own, its
+fallback for hierarchies Python rejects, and the `--inherited` output.
+"""
+
+import tempfile
+import unittest
+from os import mkdir
+from os.path import join
+
+from utils.api import build_tree
+from utils.hierarchy import ClassIndex
+from utils.output import Builder
+
+
+# The C3 example of the Python 2.3 MRO document, every class is documented
+C3_SOURCE = """
+class O:
+    '''O.'''
+
+class A(O):
+    '''A.'''
+
+class B(O):
+    '''B.'''
+
+class C(O):
+    '''C.'''
+
+class D(O):
+    '''D.'''
+
+class E(O):
+    '''E.'''
+
+class K1(A, B, C):
+    '''K1.'''
+
+class K2(D, B, E):
+    '''K2.'''
+
+class K3(D, A):
+    '''K3.'''
+
+class Z(K1, K2, K3):
+    '''Z.'''
+"""
+
+# Python raises a TypeError for Z, the index must still order it
+INCONSISTENT_SOURCE = """
+class A:
+    '''A.'''
+
+class B:
+    '''B.'''
+
+class X(A, B):
+    '''X.'''
+
+class Y(B, A):
+    '''Y.'''
+
+class Z(X, Y):
+    '''Z.'''
+
+class P(Q):
+    '''A cycle, which Python cannot define either.'''
+
+class Q(P):
+    '''Q.'''
+"""
+
+MODELS_SOURCE = """
+class Base:
+    '''The base.'''
+
+    def save(self):
+        '''Saves.'''
+
+    def load(self):
+        '''Loads.'''
+"""
+
+VIEWS_SOURCE = """
+from app import models
+
+class View(models.Base):
+    '''A view.'''
+
+    def load(self):
+        '''Loads the view.'''
+
+class Page(View):
+    '''A page.'''
+"""
+
+
+class ClassIndexTest(unittest.TestCase):
+    """
+    Indexes small projects and checks the resolved hierarchies.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, source):
+        with open(join(self.root, name), "w", encoding="utf-8") as file:
+            file.write(source)
+        return join(self.root, name)
+
+    def mro(self, index, path, name):
+        return [key[1] for key in index.mro((path, name))]
+
+    def test_c3_matches_python(self):
+        path = self.write("c3.py", C3_SOURCE)
+        index = ClassIndex(build_tree(self.root))
+        namespace = {}
+        exec(C3_SOURCE, namespace)  # pylint: disable=exec-used
+        for name in ("K1", "K2", "K3", "Z"):
+            with self.subTest(name=name):
+                expected = [item.__name__ for item in namespace[name].__mro__[:-1]]
+                self.assertEqual(self.mro(index, path, name), expected)
+
+    def test_inconsistent_hierarchy(self):
+        path = self.write("inconsistent.py", INCONSISTENT_SOURCE)
+        index = ClassIndex(build_tree(self.root))
+        self.assertEqual(self.mro(index, path, "Z"), ["Z", "X", "Y", "A", "B"])
+        self.assertEqual(self.mro(index, path, "P"), ["P", "Q"])
+
+    def test_deep_hierarchy(self):
+        depth = 3000
+        source = "class C0:\n    '''C0.'''\n    def method(self):\n        '''M.'''\n"
+        source += "".join(
+            f"class C{number}(C{number - 1}):\n    '''C{number}.'''\n"
+            for number in range(1, depth)
+        )
+        path = self.write("deep.py", source)
+        index = ClassIndex(build_tree(self.root))
+        self.assertEqual(len(index.mro((path, f"C{depth - 1}"))), depth)
+        # Every subclass shares the method dicts of the defining class
+        first, last = (
+            index.inherited_methods((path, f"C{number}")) for number in (1, depth - 1)
+        )
+        self.assertIs(first[0], last[0])
+
+    def test_inherited_output(self):
+        mkdir(join(self.root, "app"))
+        self.write("app/models.py", MODELS_SOURCE)
+        self.write("app/views.py", VIEWS_SOURCE)
+        tree = build_tree(self.root, inherited=True)
+        files = {file["name"]: file for file in tree["directories"][0]["files"]}
+        classes = {
+            class_doc["name"]: class_doc
+            for class_doc in files["views"]["content"]["classes"]
+        }
+
+        def inherited(name):
+            return [
+                (method["name"], method["inherited_from"])
+                for method in classes[name]["inherited"]
+            ]
+
+        self.assertEqual(inherited("View"), [("save", "app.models.Base")])
+        self.assertEqual(
+            inherited("Page"), [("load", "app.views.View"), ("save", "app.models.Base")]
+        )
+        self.assertNotIn("inherited", files["models"]["content"]["classes"][0])
+        html = Builder().build(tree, "html")
+        self.assertIn("save (inherited from app.models.Base)", html)
+        html = Builder().build(build_tree(self.root), "html")
+        self.assertNotIn("inherited from", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
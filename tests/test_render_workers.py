@@ -0,0 +1,102 @@
+"""
+Tests that rendering with several processes produces output byte-identical to
+a serial render.
+"""
+
+import tempfile
+import unittest
+from os import makedirs
+from os.path import join
+
+from utils.api import build_tree
+from utils.output import Builder
+
+
+# Size of the synthetic project: directories, files per directory, and
+# classes and functions per file
+DIRECTORIES = 12
+FILES = 10
+SYMBOLS = 8
+
+SYMBOL_SOURCE = '''
+class Model{number}(Model{previous}):
+    """
+    A model number {number}.
+
+    Attributes:
+        value (int): The value.
+    """
+
+    def method{number}(self, value):
+        """
+        Doubles a value.
+
+        Args:
+            value (int): The value <{number}> & more.
+
+        Returns:
+            int: Twice the value.
+        """
+
+
+def function{number}(name, count=1):
+    """
+    Repeats a name.
+
+    Args:
+        name (str): The name.
+        count (int, optional): The repetitions. Defaults to 1.
+
+    Returns:
+        str: The repeated name.
+    """
+'''
+
+
+class RenderWorkersTest(unittest.TestCase):
+    """
+    Renders a large synthetic tree serially and with 3 render workers.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        root = cls.directory.name
+        for directory in range(DIRECTORIES):
+            # Nest every other directory to exercise subdirectories
+            path = join(root, f"package{directory // 2}", f"module{directory}")
+            makedirs(path)
+            for file in range(FILES):
+                source = "class Model0:\n    pass\n" + "".join(
+                    SYMBOL_SOURCE.format(number=number + 1, previous=number)
+                    for number in range(SYMBOLS)
+                )
+                with open(join(path, f"file{file}.py"), "w", encoding="utf-8") as out:
+                    out.write(source)
+        cls.tree = build_tree(root, inherited=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_identical_output(self):
+        for output_type in ("html", "markdown", "lazy-html", "json"):
+            with self.subTest(output_type=output_type):
+                serial = Builder()
+                expected = serial.build(self.tree, output_type)
+                self.assertTrue(expected)
+                parallel = Builder()
+                content = parallel.build(self.tree, output_type, workers=3)
+                self.assertEqual(content, expected)
+                self.assertEqual(parallel.assets, serial.assets)
+
+    def test_identical_minified_output(self):
+        serial = Builder(external_css=True, minify=True)
+        expected = serial.build(self.tree, "lazy-html")
+        parallel = Builder(external_css=True, minify=True)
+        self.assertEqual(parallel.build(self.tree, "lazy-html", workers=3), expected)
+        self.assertEqual(parallel.assets, serial.assets)
+
+
+if __name__ == "__main__":
+    unittest.main()
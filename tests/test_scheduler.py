@@ -0,0 +1,136 @@
+"""
+Tests that the parse scheduler skips files over the size limit, replaces
+workers that time out or crash while the other files are still parsed, and
+picks threads only without the GIL.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+from os.path import basename, join
+from unittest import mock
+
+from utils.api import build_tree
+from utils.file_tools import FileTools
+from utils.scheduler import ParseScheduler
+
+
+BUILD_FILE_CONTENT = FileTools.build_file_content
+TIMEOUT = 0.5
+
+
+def build_file_content(path, source=None, style="auto"):
+    """
+    Parses files like `FileTools.build_file_content`, except "slow.py", which
+    takes far longer than the timeout, and "crash.py", which kills the worker.
+    """
+
+    if basename(path) == "slow.py":
+        time.sleep(10 * TIMEOUT)
+    elif basename(path) == "crash.py":
+        os._exit(1)
+    return BUILD_FILE_CONTENT(path, source=source, style=style)
+
+
+class ParseSchedulerTest(unittest.TestCase):
+    """
+    Prefetches a small project with a file the workers cannot parse.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        for number in range(4):
+            self.write(f"module{number}.py", f'def f{number}():\n    """F."""\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, source):
+        with open(join(self.root, name), "w", encoding="utf-8") as file:
+            file.write(source)
+        return join(self.root, name)
+
+    def prefetch(self, scheduler):
+        cache = scheduler.prefetch(self.root)
+        parsed = sorted(
+            basename(path)
+            for path, content in cache.prefetched.items()
+            if content["functions"]
+        )
+        self.assertEqual(parsed, [f"module{number}.py" for number in range(4)])
+        return [(path, reason) for path, _, _, reason in scheduler.skipped]
+
+    def test_max_file_size(self):
+        large = self.write("large.py", 'def large():\n    """L."""\n' + "#" * 200)
+        scheduler = ParseScheduler(2, max_file_size=100)
+        self.assertEqual(
+            self.prefetch(scheduler), [(large, "larger than the maximum file size")]
+        )
+        self.assertTrue(scheduler.summary()[-1].startswith(f"Skipped {large}"))
+        tree = build_tree(self.root, max_file_size=100)
+        names = [file["name"] for file in tree["files"]]
+        self.assertNotIn("large", names)
+        self.assertIn("module0", names)
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "the workers must inherit the patched parser",
+    )
+    def test_process_timeout_and_crash(self):
+        slow = self.write("slow.py", "")
+        crash = self.write("crash.py", "")
+        scheduler = ParseScheduler(2, timeout=TIMEOUT, executor="process")
+        with mock.patch.object(FileTools, "build_file_content", build_file_content):
+            start = time.perf_counter()
+            skipped = self.prefetch(scheduler)
+        self.assertLess(time.perf_counter() - start, 5 * TIMEOUT)
+        self.assertEqual(
+            sorted(skipped), sorted([(slow, "timed out"), (crash, "worker crashed")])
+        )
+        timed_out = next(entry for entry in scheduler.skipped if entry[0] == slow)
+        self.assertGreaterEqual(timed_out[2], TIMEOUT)
+
+    def test_thread_timeout(self):
+        slow = self.write("slow.py", "")
+        scheduler = ParseScheduler(2, timeout=TIMEOUT, executor="thread")
+        with mock.patch.object(FileTools, "build_file_content", build_file_content):
+            start = time.perf_counter()
+            self.assertEqual(self.prefetch(scheduler), [(slow, "timed out")])
+        # The abandoned thread is still sleeping, the run did not wait for it
+        self.assertLess(time.perf_counter() - start, 5 * TIMEOUT)
+
+
+class ChooseExecutorTest(unittest.TestCase):
+    """
+    Resolves the parse executor with and without the GIL.
+    """
+
+    def test_choose_executor(self):
+        for gil, timeout, expected in [
+            (True, None, "process"),
+            (False, None, "thread"),
+            (False, TIMEOUT, "process"),
+        ]:
+            with self.subTest(gil=gil, timeout=timeout), mock.patch.object(
+                ParseScheduler, "gil_enabled", return_value=gil
+            ):
+                executor = ParseScheduler.choose_executor("auto", timeout)
+                self.assertEqual(executor, expected)
+        self.assertEqual(ParseScheduler.choose_executor("thread", TIMEOUT), "thread")
+        with self.assertRaises(ValueError):
+            ParseScheduler.choose_executor("fiber")
+
+    def test_gil_enabled(self):
+        with mock.patch.object(sys, "_is_gil_enabled", lambda: False, create=True):
+            self.assertFalse(ParseScheduler.gil_enabled())
+        # Before Python 3.13 there is always a GIL
+        with mock.patch("utils.scheduler.sys", object()):
+            self.assertTrue(ParseScheduler.gil_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
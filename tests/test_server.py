@@ -0,0 +1,68 @@
+"""
+Tests that serve mode only builds the tree again when a file changed.
+"""
+
+import tempfile
+import unittest
+from os import remove
+from os.path import join
+from unittest import mock
+
+from utils import server
+from utils.file_tools import ParseCache
+from utils.scheduler import ParseScheduler
+from utils.server import DocServer
+
+
+class DocServerTest(unittest.TestCase):
+    """
+    Serves a small project and changes it between requests.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        for name in ("first", "second"):
+            self.write(name, f'def {name}():\n    """Is {name}."""\n')
+        self.server = DocServer(self.root)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, source):
+        with open(join(self.root, f"{name}.py"), "w", encoding="utf-8") as file:
+            file.write(source)
+
+    def render(self):
+        with mock.patch.object(server, "build_tree", wraps=server.build_tree) as build:
+            content = self.server.render("json")[0]
+        return content, build.call_count
+
+    def test_unchanged_not_rebuilt(self):
+        content, builds = self.render()
+        self.assertEqual(builds, 1)
+        self.assertEqual(self.render(), (content, 0))
+
+    def test_changes_rebuilt(self):
+        self.render()
+        changes = [
+            lambda: self.write("first", 'def changed():\n    """Is changed."""\n'),
+            lambda: self.write("third", 'def third():\n    """Is third."""\n'),
+            lambda: remove(join(self.root, "second.py")),
+        ]
+        for change in changes:
+            change()
+            content, builds = self.render()
+            self.assertEqual(builds, 1)
+        self.assertIn('"changed"', content)
+        self.assertIn('"third"', content)
+        self.assertNotIn('"second"', content)
+
+    def test_removed_file_not_pending(self):
+        path = join(self.root, "second.py")
+        remove(path)
+        self.assertEqual(ParseScheduler.pending_files([(path, 0)], ParseCache()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
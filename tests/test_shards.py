@@ -0,0 +1,102 @@
+"""
+Tests that shards built by separate processes merge into the output of a
+single build, and that shards which do not form one partition are rejected.
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from os import makedirs, mkdir
+from os.path import dirname, join
+
+
+MAIN = join(dirname(dirname(__file__)), "main.py")
+
+# Shards run in parallel, like CI nodes on one machine
+SHARDS = 3
+
+
+def run(*args):
+    return subprocess.run(
+        [sys.executable, MAIN, *args], capture_output=True, text=True
+    ).returncode
+
+
+class ShardsTest(unittest.TestCase):
+    """
+    Builds a small project with shards in local processes and merges them.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = join(self.directory.name, "src")
+        for package in range(4):
+            path = join(self.root, f"package{package}")
+            makedirs(path)
+            for module in range(5):
+                # Files of different sizes, so the strategies disagree
+                with open(join(path, f"module{module}.py"), "w") as file:
+                    for number in range(module + package + 1):
+                        file.write(
+                            f"def function{number}(value):\n"
+                            f'    """Returns {number}."""\n'
+                        )
+        # The shards create their shared output directory concurrently
+        self.out = join(self.directory.name, "out")
+        mkdir(self.out)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build_shards(self, strategies):
+        processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    MAIN,
+                    *("-p", self.root, "-o", join(self.out, "shards")),
+                    *("--shard", f"{number}/{SHARDS}", "--shard-strategy", strategy),
+                ],
+                stdout=subprocess.DEVNULL,
+            )
+            for number, strategy in enumerate(strategies, 1)
+        ]
+        for process in processes:
+            self.assertEqual(process.wait(), 0)
+        return [
+            join(self.out, "shards", f"shard-{number}-of-{SHARDS}.json")
+            for number in range(1, SHARDS + 1)
+        ]
+
+    def read(self, name):
+        with open(join(self.out, name, "doc.json"), encoding="utf-8") as file:
+            return file.read()
+
+    def test_merge_matches_single_build(self):
+        for strategy in ("hash", "size"):
+            with self.subTest(strategy=strategy):
+                shards = self.build_shards([strategy] * SHARDS)
+                merge = ("-p", self.root, "-o", join(self.out, "merged"), "-ot", "json")
+                self.assertEqual(run("merge", *shards, *merge), 0)
+                self.assertEqual(
+                    run("-p", self.root, "-o", join(self.out, "single"), "-ot", "json"),
+                    0,
+                )
+                self.assertEqual(self.read("merged"), self.read("single"))
+
+    def test_mixed_strategies_rejected(self):
+        shards = self.build_shards(["hash", "size", "hash"])
+        merge = ("-p", self.root, "-o", join(self.out, "merged"), "-ot", "json")
+        self.assertEqual(run("merge", *shards, *merge), 1)
+
+    def test_file_in_no_shard_rejected(self):
+        shards = self.build_shards(["hash"] * SHARDS)
+        with open(join(self.root, "package0", "added.py"), "w") as file:
+            file.write('def added():\n    """Is in no shard."""\n')
+        merge = ("-p", self.root, "-o", join(self.out, "merged"), "-ot", "json")
+        self.assertEqual(run("merge", *shards, *merge), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests that `--since` parses the files edited, added, deleted or renamed since
+a git revision, reuses the rest, and finds a previous output that was
+compressed.
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from os import makedirs, remove
+from os.path import join
+
+from utils.api import previous_output, since_cache
+from utils.cli import Cli
+from utils.file_tools import COMPRESSION_CODECS
+
+
+def source(name, description):
+    return f'def {name}():\n    """{description}"""\n'
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class SinceTest(unittest.TestCase):
+    """
+    Documents a git repository, changes it and documents it again.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = join(self.directory.name, "src")
+        makedirs(join(self.root, "pkg"))
+        for name in ("edited", "deleted", "renamed", "unchanged"):
+            self.write(f"pkg/{name}.py", source(name, "Before."))
+        self.git("init", "-q")
+        self.git("add", ".")
+        self.git("commit", "-qm", "Initial")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def git(self, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+            + ["-C", self.root, *args],
+            check=True,
+            capture_output=True,
+        )
+
+    def write(self, name, text):
+        with open(join(self.root, name), "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def change(self):
+        # A committed deletion and rename, an uncommitted edit and a new file
+        self.git("rm", "-q", "pkg/deleted.py")
+        self.git("mv", "pkg/renamed.py", "pkg/moved.py")
+        self.git("commit", "-qm", "Change")
+        self.write("pkg/edited.py", source("edited", "After."))
+        self.write("pkg/added.py", source("added", "Added."))
+
+    def run_cli(self, out, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            Cli(["-p", self.root, "-o", out, "-ot", "json", *args]).run()
+        return output.getvalue()
+
+    def read_json(self, path):
+        with open(join(path, "doc.json"), encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_changed_files(self):
+        out = join(self.directory.name, "out")
+        self.run_cli(out)
+        previous = join(out, "doc.json")
+        self.change()
+        cache, error = since_cache(self.root, "HEAD~1", previous)
+        self.assertIsNone(error)
+        self.assertEqual(
+            cache.parse_only,
+            {
+                join(self.root, "pkg", f"{name}.py")
+                for name in ("edited", "added", "deleted", "renamed", "moved")
+            },
+        )
+
+        output = self.run_cli(out, "--since", "HEAD~1")
+        self.assertIn("5 Python files changed since HEAD~1", output)
+        expected = join(self.directory.name, "full")
+        self.run_cli(expected)
+        tree = self.read_json(out)
+        self.assertEqual(tree, self.read_json(expected))
+        names = {file["name"] for file in tree["directories"][0]["files"]}
+        self.assertEqual(names, {"added", "edited", "moved", "unchanged"})
+        self.assertIn("After.", json.dumps(tree))
+
+    def test_compressed_previous(self):
+        for codec, (extension, _) in COMPRESSION_CODECS.items():
+            with self.subTest(codec=codec):
+                out = join(self.directory.name, codec)
+                self.run_cli(out, "--compress", codec)
+                compressed = join(out, f"doc.json{extension}")
+                self.assertEqual(previous_output(out, codec), compressed)
+                # A plain run finds the compressed output too
+                self.assertEqual(previous_output(out), compressed)
+                output = self.run_cli(out, "--compress", codec, "--since", "HEAD")
+                self.assertIn("0 Python files changed since HEAD", output)
+                self.assertNotIn("parsing every file", output)
+
+        remove(join(self.directory.name, "gzip", "doc.json.gz"))
+        output = self.run_cli(
+            join(self.directory.name, "gzip"), "--compress", "gzip", "--since", "HEAD"
+        )
+        self.assertIn("No previous output", output)
+        self.assertIn("doc.json.gz, parsing every file", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests that the template renderer matches the reference `Html` renderer, and
+that templates which could inject code are rejected before compiling.
+"""
+
+import tempfile
+import unittest
+from os.path import join
+from unittest import mock
+
+from utils import templates
+from utils.api import build_tree
+from utils.output import Html, TemplateHtml
+from utils.templates import Template
+
+
+SOURCES = {
+    "models.py": (
+        "class Model:\n"
+        '    """\n'
+        "    A model <with> & markup.\n"
+        "\n"
+        "    The long description.\n"
+        "\n"
+        "    Attributes:\n"
+        "        value (int): The value.\n"
+        '    """\n'
+        "\n"
+        "    def save(self, path, mode='w'):\n"
+        '        """\n'
+        "        Saves the model.\n"
+        "\n"
+        "        Args:\n"
+        "            path (str): The path.\n"
+        "            mode (str, optional): The mode. Defaults to 'w'.\n"
+        "\n"
+        "        Returns:\n"
+        "            bool: True on success.\n"
+        '        """\n'
+        "\n"
+        "\n"
+        "def load(path):\n"
+        '    """Loads a model.\n'
+        "\n"
+        "    :param path: The path.\n"
+        "    :returns: The model.\n"
+        '    """\n'
+    ),
+    "broken.py": "def broken(:\n",
+}
+
+
+class TemplateHtmlTest(unittest.TestCase):
+    """
+    Renders a small project with both renderers.
+    """
+
+    def test_identical_to_html(self):
+        with tempfile.TemporaryDirectory() as root:
+            for name, source in SOURCES.items():
+                with open(join(root, name), "w", encoding="utf-8") as file:
+                    file.write(source)
+            tree = build_tree(root)
+        expected = Html().build_html(tree)
+        self.assertIn("broken", expected)
+        self.assertEqual(TemplateHtml().build_html(tree), expected)
+
+    def test_override(self):
+        renderer = TemplateHtml({"item_start": "<h2>{name!r:>10}</h2>"})
+        render = renderer.compiled["item_start"]
+        self.assertEqual(render(name="x"), "<h2>       'x'</h2>")
+        with self.assertRaises(ValueError):
+            TemplateHtml({"unknown": ""})
+
+
+class TemplateTest(unittest.TestCase):
+    """
+    Compiles valid and malicious templates.
+    """
+
+    def test_render(self):
+        template = Template("<p>{name}: {count:>4}</p>", ("name", "count"))
+        self.assertEqual(template(name="a", count=7), "<p>a:    7</p>")
+        self.assertEqual(template(name="{count}"), "<p>{count}:     </p>")
+
+    def test_rejected_before_eval(self):
+        rejected = [
+            "{unknown}",
+            "{name.__class__}",
+            "{name[0]}",
+            "{name!x}",
+            "{name!r}{name!}",
+            "{name:{name}}",
+            "{name:'}",
+            "{name:\\}",
+            "{name:>10' + __import__('os').getcwd() + '}",
+            "{name:}}",
+        ]
+        with mock.patch.object(templates, "eval", create=True) as evaluate:
+            for text in rejected:
+                with self.subTest(text=text), self.assertRaises(ValueError):
+                    Template(text, ("name",))
+        evaluate.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests that the binary tree format loads back the saved tree, and rejects
+files that are not trees or were written by another format or Python version.
+"""
+
+import tempfile
+import unittest
+from os.path import join
+
+from utils.api import build_tree
+from utils.output import Builder
+from utils.tree_format import (
+    TREE_FORMAT_VERSION,
+    TREE_MAGIC,
+    TREE_PYTHON_VERSION,
+    TreeFormat,
+)
+
+
+SOURCE = (
+    "class Model:\n"
+    '    """\n'
+    "    A model with a café.\n"
+    "\n"
+    "    Args:\n"
+    "        value (int, optional): The value. Defaults to 1.\n"
+    '    """\n'
+    "\n"
+    "    def save(self):\n"
+    '        """Saves the model."""\n'
+)
+
+
+class TreeFormatTest(unittest.TestCase):
+    """
+    Saves the tree of a small project and loads it back.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as root:
+            for name in ("first", "second"):
+                with open(join(root, f"{name}.py"), "w", encoding="utf-8") as file:
+                    file.write(SOURCE)
+            with open(join(root, "broken.py"), "w", encoding="utf-8") as file:
+                file.write("def broken(:\n")
+            cls.tree = build_tree(root)
+        cls.data = TreeFormat.dumps(cls.tree)
+
+    def test_round_trip(self):
+        tree, error = TreeFormat.loads(self.data)
+        self.assertIsNone(error)
+        self.assertEqual(tree, self.tree)
+        for output_type in ("html", "markdown", "json"):
+            with self.subTest(output_type=output_type):
+                self.assertEqual(
+                    Builder().build(tree, output_type),
+                    Builder().build(self.tree, output_type),
+                )
+
+    def test_strings_shared(self):
+        tree, _ = TreeFormat.loads(self.data)
+        first, second = (
+            file["content"] for file in tree["files"] if file["name"] != "broken"
+        )
+        self.assertIs(
+            first["classes"][0]["doc_string"]["short_description"],
+            second["classes"][0]["doc_string"]["short_description"],
+        )
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = join(directory, "doc.tree")
+            with open(path, "wb") as file:
+                file.write(self.data)
+            self.assertEqual(TreeFormat.load(path), (self.tree, None))
+            tree, error = TreeFormat.load(join(directory, "missing.tree"))
+            self.assertIsNone(tree)
+            self.assertIn("Unable to read tree file", error)
+
+    def test_rejected(self):
+        header = len(TREE_MAGIC) + 1 + len(TREE_PYTHON_VERSION)
+        body = self.data[header:]
+        version = bytes([TREE_FORMAT_VERSION])
+        other_version = bytes([TREE_FORMAT_VERSION + 1])
+        other_python = bytes([TREE_PYTHON_VERSION[0], TREE_PYTHON_VERSION[1] + 1])
+        cases = {
+            "Not a tree file": [b"", TREE_MAGIC, b'{"files": []}', b"PDGX" + body],
+            "Unsupported tree format version": [
+                TREE_MAGIC + other_version + TREE_PYTHON_VERSION + body
+            ],
+            "it can only be loaded by Python": [
+                TREE_MAGIC + version + other_python + body
+            ],
+            "Corrupt tree file": [self.data[: header + 10], self.data[:header] + b"\0"],
+        }
+        for message, datas in cases.items():
+            for data in datas:
+                with self.subTest(data=data[:12]):
+                    tree, error = TreeFormat.loads(data)
+                    self.assertIsNone(tree)
+                    self.assertIn(message, error)
+
+
+if __name__ == "__main__":
+    unittest.main()
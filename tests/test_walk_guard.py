@@ -0,0 +1,99 @@
+"""
+Tests that the walk stops at symbolic link loops, and documents a directory
+or file reached through several links, or hard links, only once.
+"""
+
+import tempfile
+import unittest
+from os import link, makedirs, symlink
+from os.path import join
+
+from utils.api import build_tree
+from utils.file_tools import FileTools, WalkGuard
+
+
+SOURCE = 'def function():\n    """Is documented."""\n'
+
+# "hard.py" is a hard link to "module.py", whichever is listed first is kept
+PHYSICAL_NAMES = {"hard": "module"}
+
+
+def file_names(branch):
+    names = [file["name"] for file in branch.get("files", [])]
+    for directory in branch.get("directories", []):
+        names.extend(file_names(directory))
+    return names
+
+
+class WalkGuardTest(unittest.TestCase):
+    """
+    Walks a project with a loop, a package linked twice, a hard link and a
+    broken link.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        base = self.directory.name
+        self.root = join(base, "root")
+        makedirs(join(self.root, "pkg"))
+        makedirs(join(base, "shared"))
+        module = join(self.root, "pkg", "module.py")
+        for path in (module, join(base, "shared", "lib.py")):
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(SOURCE)
+        symlink(self.root, join(self.root, "pkg", "loop"))
+        symlink(join(base, "shared"), join(self.root, "first"))
+        symlink(join(base, "shared"), join(self.root, "second"))
+        link(module, join(self.root, "pkg", "hard.py"))
+        symlink(join(base, "missing.py"), join(self.root, "broken.py"))
+        self.link_to_root = join(base, "link_to_root")
+        symlink(self.root, self.link_to_root)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def walk(self, io_mode, follow_symlinks="once", root=None):
+        guard = WalkGuard(follow_symlinks)
+        tree = build_tree(root or self.root, io_mode=io_mode, guard=guard)
+        names = file_names(tree)
+        return sorted(PHYSICAL_NAMES.get(name, name) for name in names), guard
+
+    def reasons(self, guard):
+        return sorted(reason.split(" ")[0] for _, reason in guard.skipped)
+
+    def test_once(self):
+        for io_mode in ("serial", "async"):
+            with self.subTest(io_mode=io_mode):
+                names, guard = self.walk(io_mode)
+                # One of the shared links, and the hard link or its original
+                self.assertEqual(names, ["lib", "module"])
+                reasons = ["broken", "loop", "same", "same"]
+                self.assertEqual(self.reasons(guard), reasons)
+                reasons = [reason for _, reason in guard.skipped]
+                self.assertIn(f"loop back to {self.root}", reasons)
+
+    def test_never(self):
+        for io_mode in ("serial", "async"):
+            with self.subTest(io_mode=io_mode):
+                names, guard = self.walk(io_mode, "never")
+                self.assertEqual(names, ["module"])
+                self.assertEqual(self.reasons(guard), ["same"] + ["symbolic"] * 4)
+
+    def test_symlinked_root(self):
+        for follow_symlinks in ("once", "never"):
+            with self.subTest(follow_symlinks=follow_symlinks):
+                names, _ = self.walk("serial", follow_symlinks, self.link_to_root)
+                self.assertIn("module", names)
+
+    def test_list_python_files(self):
+        names = [
+            path.rsplit("/", 1)[-1][:-3]
+            for path, _ in FileTools.list_python_files(self.root)
+        ]
+        self.assertEqual(
+            sorted(PHYSICAL_NAMES.get(name, name) for name in names), ["lib", "module"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests that `FileTools.write_files` replaces no target, and leaves no temporary
+file behind, when staging any of the files fails.
+"""
+
+import tempfile
+import threading
+import unittest
+from os import fsync, listdir
+from os.path import exists, join
+from unittest import mock
+
+from utils.file_tools import FileTools
+
+
+class FailingFsync:
+    """
+    Fsyncs the first `successes` files, and fails for every later one.
+    """
+
+    def __init__(self, successes):
+        self.successes = successes
+        self.lock = threading.Lock()
+
+    def __call__(self, descriptor):
+        with self.lock:
+            self.successes -= 1
+            if self.successes < 0:
+                raise OSError(28, "No space left on device")
+        fsync(descriptor)
+
+
+class WriteFilesTest(unittest.TestCase):
+    """
+    Writes an existing and a new file while the disk fills up.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.existing = join(self.root, "doc.html")
+        with open(self.existing, "w", encoding="utf-8") as file:
+            file.write("old")
+        self.new = join(self.root, "fragments", "index.html")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_untouched(self):
+        with open(self.existing, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "old")
+        self.assertFalse(exists(self.new))
+        self.assertEqual(sorted(listdir(self.root)), ["doc.html", "fragments"])
+        self.assertEqual(listdir(join(self.root, "fragments")), [])
+
+    def test_staging_fails(self):
+        files = [(self.existing, "new" * 1000, None), (self.new, "new", None)]
+        for workers in (1, 2):
+            for compress in (None, "gzip"):
+                with self.subTest(workers=workers, compress=compress), mock.patch(
+                    "utils.file_tools.fsync", FailingFsync(1)
+                ):
+                    error = FileTools.write_files(
+                        [(path, text, compress) for path, text, _ in files],
+                        workers=workers,
+                    )
+                    self.assertIn("No space left on device", error)
+                    self.assertIn("IOError", error)
+                    self.assert_untouched()
+
+    def test_unknown_codec(self):
+        error = FileTools.write_files(
+            [(self.existing, "new", None), (self.new, "new", "zip")]
+        )
+        self.assertIn("Unknown compression codec: zip", error)
+        with open(self.existing, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "old")
+        self.assertFalse(exists(self.new))
+
+    def test_written(self):
+        self.assertIsNone(
+            FileTools.write_files(
+                [(self.existing, "new", None), (self.new, b"new", None)], workers=2
+            )
+        )
+        for path in (self.existing, self.new):
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "new")
+        self.assertEqual(sorted(listdir(self.root)), ["doc.html", "fragments"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,8 @@
+"""
+Python documentation generator.
+
+The programmatic interface is `generate` and `build_tree`, the command-line
+interface is `utils.cli.Cli`.
+"""
+
+from .api import generate, build_tree
@@ -0,0 +1,323 @@
+"""
+This module provides the programmatic interface of the documentation generator,
+for embedding it in other tools without argparse or terminal output.
+
+Functions:
+
+    build_tree:
+        Walks a directory and parses its Python files into the file tree.
+
+    previous_output:
+        Finds the JSON output a previous run wrote, plain or compressed.
+
+    since_cache:
+        Builds a parse cache reusing a previous JSON output for every file
+        unchanged since a git revision.
+
+    generate:
+        Builds the file tree and renders it, optionally writing the output.
+"""
+
+import json
+from importlib import import_module
+from os import makedirs
+from os.path import isdir, isfile, join, abspath
+from .file_tools import COMPRESSION_CODECS, FileTools, ParseCache, WalkGuard
+from .git_tools import GitTools
+from .output import Builder, OUTPUT_FILE_NAMES
+from .trace import TRACER
+
+
+def build_tree(
+    root,
+    style="auto",
+    io_mode="serial",
+    max_in_flight=16,
+    cache=None,
+    parse_workers=1,
+    max_file_size=None,
+    parse_timeout=None,
+    parse_executor="auto",
+    follow_symlinks="once",
+    guard=None,
+    inherited=False,
+):
+    """
+    Walks a directory and parses its Python files into the file tree.
+
+    Args:
+        root (str): The directory to document.
+        style (str, optional): The docstring style, a key of `DOC_STRING_STYLES`,
+                               "detect" or "detect-file". Defaults to "auto".
+        io_mode (str, optional): "serial" or "async". Defaults to "serial".
+        max_in_flight (int, optional): The maximum concurrent I/O calls in
+                                       "async" mode. Defaults to 16.
+        cache (ParseCache, optional): A cache of file contents, only files
+                                      changed since they were cached are parsed.
+                                      Defaults to None.
+        parse_workers (int, optional): Processes parsing files, largest first,
+                                       ahead of the walk. Defaults to 1.
+        max_file_size (int, optional): Files larger than this many bytes are
+                                       documented as empty. Defaults to None.
+        parse_timeout (float, optional): Seconds a worker may spend parsing one
+                                         file before it is killed and the file
+                                         is documented as empty. Defaults to None.
+        parse_executor (str, optional): "process", "thread", or "auto" using
+                                        threads on free-threaded builds, see
+                                        `ParseScheduler.choose_executor`.
+                                        Defaults to "auto".
+        follow_symlinks (str, optional): "once" follows symbolic links to
+                                         directories and files not visited
+                                         yet, "never" skips them.
+                                         Defaults to "once".
+        guard (WalkGuard, optional): The guard tracking visited directories and
+                                     files, to read the skipped links from
+                                     after the walk. Defaults to None, using
+                                     a new one with `follow_symlinks`.
+        inherited (bool, optional): Attach the documented methods each class
+                                    inherits from project classes, see
+                                    `ClassIndex.attach_inherited`.
+                                    Defaults to False.
+
+    Returns:
+        dict: The file tree.
+
+    Raises:
+        NotADirectoryError: If `root` is not a directory.
+    """
+
+    if not isdir(root):
+        raise NotADirectoryError(f"Not a directory: {root}")
+
+    if style == "detect":
+        style = FileTools.detect_project_style(root)
+
+    if guard is None:
+        guard = WalkGuard(follow_symlinks)
+
+    if parse_workers > 1 or max_file_size is not None or parse_timeout is not None:
+        from .scheduler import ParseScheduler
+
+        with TRACER.span("prefetch", "stage", path=root, workers=parse_workers):
+            cache = ParseScheduler(
+                parse_workers,
+                style,
+                max_file_size=max_file_size,
+                timeout=parse_timeout,
+                follow_symlinks=guard.follow_symlinks,
+                executor=parse_executor,
+            ).prefetch(root, cache)
+
+    with TRACER.span("walk", "stage", path=root, io_mode=io_mode):
+        if io_mode == "async":
+            from .async_io import AsyncFileTools
+
+            tree = AsyncFileTools(
+                max_in_flight=max_in_flight, style=style, cache=cache, guard=guard
+            ).build_directories(root)
+        else:
+            tree = FileTools.build_directories(
+                root, style=style, cache=cache, guard=guard
+            )
+
+    if inherited:
+        from .hierarchy import ClassIndex
+
+        with TRACER.span("hierarchy", "stage", path=root):
+            ClassIndex.attach_inherited(tree)
+    return tree
+
+
+def previous_output(output_path, compress=None):
+    """
+    Finds the JSON output a previous run wrote to an output directory.
+
+    Runs with `compress` never write the plain `doc.json`, so the name with
+    the codec's extension is looked up first, then the plain name and the
+    names of the other codecs.
+
+    Args:
+        output_path (str): The output directory of the previous run.
+        compress (str, optional): The codec of this run, from
+                                  `COMPRESSION_CODECS`. Defaults to None.
+
+    Returns:
+        str: The first of the names that exists, or the name this run writes
+             if none does.
+    """
+
+    path = join(output_path, OUTPUT_FILE_NAMES["json"])
+    extensions = [COMPRESSION_CODECS[compress][0]] if compress is not None else []
+    extensions += [""] + [extension for extension, _ in COMPRESSION_CODECS.values()]
+    for extension in extensions:
+        if isfile(f"{path}{extension}"):
+            return f"{path}{extension}"
+    return f"{path}{extensions[0]}"
+
+
+def since_cache(root, revision, previous_path):
+    """
+    Builds a parse cache reusing a previous JSON output for every file
+    unchanged since a git revision, so only changed files are parsed.
+
+    Args:
+        root (str): The directory to document, inside a git work tree.
+        revision (str): The git revision the previous output was built from.
+        previous_path (str): The path to the previous `doc.json`, compressed
+                             if it ends with the extension of a codec from
+                             `COMPRESSION_CODECS`.
+
+    Returns:
+        ParseCache: The seeded cache, or None on errors.
+        str: An error message, or None on success.
+    """
+
+    if not isfile(previous_path):
+        return None, f"No previous output at {previous_path}"
+    opener = open
+    for extension, module in COMPRESSION_CODECS.values():
+        if previous_path.endswith(extension):
+            opener = import_module(module).open
+    try:
+        with opener(previous_path, "rt", encoding="utf-8") as file:
+            previous = json.load(file)
+    # The codecs raise their own errors for corrupt data, e.g. `LZMAError`
+    except Exception as error:
+        return None, f"Unable to read previous output {previous_path}: {error}"
+    if not isinstance(previous, dict) or previous.get("path") != abspath(root):
+        return None, f"Previous output {previous_path} was built from another path"
+
+    changed, error = GitTools.changed_python_files(root, revision)
+    if error is not None:
+        return None, error
+    return ParseCache.from_tree(previous, changed), None
+
+
+def generate(
+    root,
+    output_type="html",
+    output_path=None,
+    style="auto",
+    io_mode="serial",
+    max_in_flight=16,
+    render_workers=1,
+    parse_workers=1,
+    max_file_size=None,
+    parse_timeout=None,
+    parse_executor="auto",
+    follow_symlinks="once",
+    inherited=False,
+    compress=None,
+    external_css=False,
+    minify=False,
+    since=None,
+    previous_path=None,
+):
+    """
+    Builds the file tree for a directory and renders it.
+
+    Args:
+        root (str): The directory to document.
+        output_type (str or list, optional): "html", "lazy-html", "markdown",
+                                             "json", "sqlite", "tree", a list of
+                                             them rendered from one tree, or
+                                             None to return the file tree
+                                             without rendering.
+                                             Defaults to "html".
+        output_path (str, optional): A directory to write the rendered output to.
+                                     Defaults to None, writing nothing.
+        style (str, optional): The docstring style, see `build_tree`.
+                               Defaults to "auto".
+        io_mode (str, optional): "serial" or "async". Defaults to "serial".
+        max_in_flight (int, optional): The maximum concurrent I/O calls in
+                                       "async" mode. Defaults to 16.
+        render_workers (int, optional): Processes rendering the output.
+                                        Defaults to 1.
+        parse_workers (int, optional): Processes parsing files, see
+                                       `build_tree`. Defaults to 1.
+        max_file_size (int, optional): See `build_tree`. Defaults to None.
+        parse_timeout (float, optional): See `build_tree`. Defaults to None.
+        parse_executor (str, optional): See `build_tree`. Defaults to "auto".
+        follow_symlinks (str, optional): See `build_tree`. Defaults to "once".
+        inherited (bool, optional): See `build_tree`. Defaults to False.
+        compress (str, optional): A codec from `COMPRESSION_CODECS` used when
+                                  writing. Defaults to None.
+        external_css (bool, optional): Link the HTML outputs to a shared,
+                                       content hashed stylesheet, see `Builder`.
+                                       Defaults to False.
+        minify (bool, optional): Minify the HTML outputs. Defaults to False.
+        since (str, optional): A git revision; only files changed since it are
+                               parsed, the rest is reused from the previous
+                               JSON output. Defaults to None.
+        previous_path (str, optional): The previous `doc.json`. Defaults to
+                                       `doc.json` in `output_path`, or its
+                                       compressed name, see `previous_output`.
+
+    Returns:
+        dict: The file tree, if `output_type` is None.
+        dict: Maps each output type to its content, if `output_type` is a list.
+        str: The rendered content otherwise.
+
+    Raises:
+        NotADirectoryError: If `root` is not a directory.
+        ValueError: If the output type is unknown, the content cannot be built,
+                    or the previous output cannot be reused with `since`.
+        OSError: If the output cannot be written.
+    """
+
+    output_types = [output_type] if isinstance(output_type, str) else output_type
+    for name in output_types or []:
+        if name not in OUTPUT_FILE_NAMES:
+            raise ValueError(f"Unknown output type: {name}")
+
+    cache = None
+    if since is not None:
+        if previous_path is None and output_path is not None:
+            previous_path = previous_output(output_path, compress)
+        if previous_path is None:
+            raise ValueError("'since' needs a previous_path or output_path")
+        cache, error = since_cache(root, since, previous_path)
+        if error is not None:
+            raise ValueError(error)
+
+    tree = build_tree(
+        root,
+        style=style,
+        io_mode=io_mode,
+        max_in_flight=max_in_flight,
+        cache=cache,
+        parse_workers=parse_workers,
+        max_file_size=max_file_size,
+        parse_timeout=parse_timeout,
+        parse_executor=parse_executor,
+        follow_symlinks=follow_symlinks,
+        inherited=inherited,
+    )
+    if output_type is None:
+        return tree
+
+    builder = Builder(external_css=external_css, minify=minify)
+    contents = {}
+    files = []
+    for name in output_types:
+        content = builder.build(tree, name, workers=render_workers)
+        if content is None:
+            raise ValueError(f"Unable to build {name} content")
+        contents[name] = content
+        if output_path is not None:
+            files.extend(
+                builder.output_files(
+                    join(output_path, OUTPUT_FILE_NAMES[name]),
+                    compress=compress,
+                    keep_uncompressed=name in ("html", "lazy-html"),
+                )
+            )
+
+    if output_path is not None:
+        makedirs(output_path, exist_ok=True)
+        error = FileTools.write_files(files, workers=len(files))
+        if error is not None:
+            raise OSError(error)
+    if isinstance(output_type, str):
+        return contents[output_type]
+    return contents
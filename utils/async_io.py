@@ -0,0 +1,287 @@
+"""
+Classes:
+
+    AsyncFileTools:
+        Builds the same file tree as `FileTools.build_directories`, but issues
+        directory listings and file reads concurrently. Intended for network
+        filesystems where every I/O call costs a round trip.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count, scandir, stat
+from os.path import abspath, basename
+from .file_tools import FileTools, WalkGuard
+from .metrics import METRICS
+from .trace import TRACER
+
+
+class AsyncFileTools:
+    """
+    This class walks a directory tree with asyncio, running the blocking
+    filesystem calls in a thread pool and limiting how many are in flight.
+    Files are parsed in a separate pool of at most one thread per CPU, so
+    parsing never holds up the I/O threads.
+
+    Attributes:
+        max_in_flight (int): The maximum number of concurrent I/O calls.
+        latency (float): Seconds of artificial delay added to every I/O call,
+                         used to simulate a network filesystem locally.
+        style (str): The docstring style passed to `FileTools.build_file`.
+        cache (ParseCache): A cache of file contents, or None.
+        guard (WalkGuard): Tracks the directories and files already visited.
+    """
+
+    def __init__(
+        self, max_in_flight=16, latency=0, style="auto", cache=None, guard=None
+    ):
+        """
+        Initializes the AsyncFileTools instance.
+
+        Args:
+            max_in_flight (int, optional): The maximum number of concurrent
+                                           I/O calls. Defaults to 16.
+            latency (float, optional): Seconds of artificial delay per I/O call.
+                                       Defaults to 0.
+            style (str, optional): The docstring style, a key of
+                                   `DOC_STRING_STYLES` or "detect-file".
+                                   Defaults to "auto".
+            cache (ParseCache, optional): A cache of file contents, unchanged
+                                          files are not read again.
+                                          Defaults to None.
+            guard (WalkGuard, optional): Tracks the directories and files already
+                                         visited. Defaults to None, following
+                                         symbolic links once. Which of several
+                                         links to the same target is documented
+                                         depends on the order listings complete.
+        """
+
+        self.max_in_flight = max(1, max_in_flight)
+        self.latency = latency
+        self.style = style
+        self.cache = cache
+        self.guard = guard if guard is not None else WalkGuard()
+        self.executor = None
+        self.parse_executor = None
+        self.semaphore = None
+
+    def build_directories(self, base_path):
+        """
+        Builds the directory tree for the given base path.
+
+        Args:
+            base_path (str): The absolute or relative path to the base directory.
+
+        Returns:
+            dict: The directory tree, identical to the one produced by
+                  `FileTools.build_directories`.
+        """
+
+        return asyncio.run(self.build_tree(base_path))
+
+    async def build_tree(self, base_path):
+        """
+        Sets up the executors and semaphore and walks the tree.
+
+        Args:
+            base_path (str): The absolute or relative path to the base directory.
+
+        Returns:
+            dict: The directory tree.
+        """
+
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        parse_workers = min(self.max_in_flight, cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            with ThreadPoolExecutor(max_workers=parse_workers) as parse_executor:
+                self.executor = executor
+                self.parse_executor = parse_executor
+                absolute_path = abspath(base_path)
+                if self.guard.root is None:
+                    self.guard.admit_root(absolute_path)
+                try:
+                    return await self.build_directory(absolute_path)
+                finally:
+                    self.executor = self.parse_executor = None
+
+    async def run_io(self, func, *args):
+        """
+        Runs a blocking I/O function in the executor, respecting the in-flight limit.
+
+        Args:
+            func (callable): The blocking function to run.
+            *args: Arguments passed to the function.
+
+        Returns:
+            The return value of the function.
+        """
+
+        async with self.semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.call_io, func, args
+            )
+
+    def call_io(self, func, args):
+        """
+        Calls the function after the configured artificial latency.
+
+        Args:
+            func (callable): The blocking function to call.
+            args (tuple): Arguments passed to the function.
+
+        Returns:
+            The return value of the function.
+        """
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return func(*args)
+
+    @staticmethod
+    def list_directory(directory_path):
+        """
+        Lists a directory in a single call, including the type and stat of each item.
+
+        Args:
+            directory_path (str): The path to the directory.
+
+        Returns:
+            list: A list of (name, is_directory, is_link, stat) tuples in listing
+                  order. The stat follows links, and is None for broken links
+                  and for items that are neither directories nor Python files.
+        """
+
+        items = []
+        with TRACER.span("list", "io", path=directory_path) as span, scandir(
+            directory_path
+        ) as entries:
+            for entry in entries:
+                is_directory = entry.is_dir()
+                entry_stat = None
+                if is_directory or entry.name.endswith(".py"):
+                    try:
+                        entry_stat = entry.stat()
+                    except OSError:
+                        pass
+                items.append((entry.name, is_directory, entry.is_symlink(), entry_stat))
+            span.args["size"] = len(items)
+        return items
+
+    @staticmethod
+    def read_file(file_path):
+        """
+        Reads the raw bytes of a file.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            bytes: The file bytes, or None on errors.
+            dict: A diagnostic describing the error (see
+                  `FileTools.build_diagnostic`), or None on success.
+        """
+
+        try:
+            with TRACER.span("read", "io", path=file_path) as span, open(
+                file_path, "rb"
+            ) as file:
+                source = file.read()
+                span.args["size"] = len(source)
+                if METRICS.enabled:
+                    METRICS.add("read_bytes", len(source))
+                return source, None
+        except OSError as error:
+            return None, FileTools.build_diagnostic(error)
+
+    async def build_file(self, file_path):
+        """
+        Reads a Python file concurrently and parses it in the parse executor,
+        so parsing never blocks the event loop issuing the other reads.
+
+        Args:
+            file_path (str): The absolute path to the Python file.
+
+        Returns:
+            dict: The file dictionary, as built by `FileTools.build_file`.
+        """
+
+        file_stat = None
+        if self.cache is not None:
+            if not self.cache.is_fresh(file_path):
+                file_stat = await self.run_io(stat, file_path)
+            if (
+                self.cache.is_fresh(file_path, file_stat)
+                or file_path in self.cache.prefetched
+            ):
+                return FileTools.build_file(
+                    file_path, cache=self.cache, file_stat=file_stat
+                )
+
+        source, error = await self.run_io(self.read_file, file_path)
+        # Parsing is not I/O, it runs outside the in-flight limit
+        return await asyncio.get_running_loop().run_in_executor(
+            self.parse_executor,
+            functools.partial(
+                FileTools.build_file,
+                file_path,
+                source=source,
+                style=self.style,
+                cache=self.cache,
+                file_stat=file_stat,
+                error=error,
+            ),
+        )
+
+    async def build_directory(self, absolute_path):
+        """
+        Recursively builds the directory dictionary, fetching children concurrently.
+
+        Args:
+            absolute_path (str): The absolute path to the directory.
+
+        Returns:
+            dict: The directory dictionary.
+        """
+
+        directory = {
+            "name": basename(absolute_path),
+            "type": "directory",
+            "path": absolute_path,
+        }
+        items = await self.run_io(self.list_directory, absolute_path)
+
+        # Keep the key order of the serial walk, then fill the lists in listing order
+        directory_tasks = []
+        file_tasks = []
+        for item, is_directory, is_link, item_stat in items:
+            item_path = f"{absolute_path}/{item}"
+            if (
+                is_directory
+                and not item.startswith("__")
+                and not item.startswith(".")
+            ):
+                if "directories" not in directory:
+                    directory["directories"] = []
+                if self.guard.admit(item_path, item_stat, is_link) is not None:
+                    directory_tasks.append(self.build_directory(item_path))
+            elif item.endswith(".py"):
+                if "files" not in directory:
+                    directory["files"] = []
+                if self.guard.admit(item_path, item_stat, is_link) is not None:
+                    file_tasks.append(self.build_file(item_path))
+
+        results = await asyncio.gather(*directory_tasks, *file_tasks)
+        new_directories = results[: len(directory_tasks)]
+        new_files = results[len(directory_tasks) :]
+
+        for new_directory in new_directories:
+            if new_directory.get("directories") or new_directory.get("files"):
+                directory["directories"].append(new_directory)
+
+        for new_file in new_files:
+            if FileTools.has_content(new_file["content"]):
+                directory["files"].append(new_file)
+
+        return directory
@@ -3,11 +3,23 @@ CLI Class
 """
 
 import argparse
-from os.path import isdir, abspath
+from os.path import isdir, isfile, abspath, join, basename, dirname
 from os import mkdir
-from utils.output import Builder
+from utils.api import build_tree, previous_output, since_cache
+from utils.shards import Shards, SHARD_STRATEGIES
+from utils.output import Builder, OUTPUT_FILE_NAMES
 from utils.terminal import PrintInfoToTerminal
-from utils.file_tools import FileTools
+from utils.metrics import METRICS
+from utils.progress import PROGRESS
+from utils.trace import TRACER
+from utils.file_tools import (
+    FileTools,
+    WalkGuard,
+    FOLLOW_SYMLINKS,
+    COMPRESSION_CODECS,
+    DOC_STRING_STYLES,
+    DOC_STRING_STYLE_MODES,
+)
 
 
 class Cli(PrintInfoToTerminal):
@@ -21,8 +33,9 @@ class Cli(PrintInfoToTerminal):
         output_path (str): The directory where the generated HTML will be saved.
 
     Methods:
-        __init__(self): Initializes the CLI, parses command-line arguments,
+        __init__(self, argv): Initializes the CLI, parses command-line arguments,
                        and creates instances of TerminalPrint and Html classes.
+        build_parser(): Creates the argument parser.
         run_interactive_mode(self): Prompts the user for input in interactive mode.
         config_stage(self): Configures the program based on command-line
                            arguments or user input.
@@ -36,9 +49,21 @@ class Cli(PrintInfoToTerminal):
     root_path = "./"
     output_path = "output"
     output_type = "html"
+    io_mode = "serial"
+    max_in_flight = 16
+    render_workers = 1
+    parse_workers = 1
+    max_file_size = None
+    parse_timeout = None
+    parse_executor = "auto"
+    follow_symlinks = "once"
+    compress = None
+    doc_string_style = "auto"
+    shard = None
+    shard_files = []
     file_tree = {}
 
-    def __init__(self):
+    def __init__(self, argv=None):
         """
         Initializes the CLI object.
 
@@ -47,13 +72,28 @@ class Cli(PrintInfoToTerminal):
         terminal output and HTML generation respectively.
 
         Args:
-            None
+            argv (list, optional): The arguments to parse.
+                                   Defaults to None, using `sys.argv`.
 
         Returns:
             None
         """
 
         # Parse args given in initial command
+        self.args = self.build_parser().parse_args(argv)
+
+        # Builder
+        self.builder = Builder()
+
+    @staticmethod
+    def build_parser():
+        """
+        Creates the parser for the command-line arguments.
+
+        Returns:
+            argparse.ArgumentParser: The argument parser.
+        """
+
         parser = argparse.ArgumentParser()
         parser.add_argument(
             "-i",
@@ -62,13 +102,218 @@ class Cli(PrintInfoToTerminal):
             help="Interactive Mode",
             default=False,
         )
-        parser.add_argument("-p", "--path", help="Path")
         parser.add_argument("-o", "--out", help="Output path", default="output")
-        parser.add_argument("-ot", "--outputtype", help="Output type", default="html")
-        self.args = parser.parse_args()
+        parser.add_argument(
+            "-ot",
+            "--outputtype",
+            help="Output type, or several separated by commas (e.g. html,markdown,json)",
+            default="html",
+        )
+        Cli.add_tree_arguments(parser)
+        parser.add_argument(
+            "--since",
+            help="Only parse files changed since this git revision, reusing the previous JSON output",
+        )
+        parser.add_argument(
+            "--previous",
+            help="Previous JSON output for --since, compressed outputs are read by their extension (defaults to doc.json in the output path, or its compressed name)",
+        )
+        parser.add_argument(
+            "--from-tree",
+            help="Render a tree saved with '-ot tree' instead of walking and parsing the path",
+        )
+        parser.add_argument(
+            "--render-workers",
+            type=int,
+            help="Processes rendering top level files and directories",
+            default=1,
+        )
+        parser.add_argument(
+            "--compress",
+            choices=sorted(COMPRESSION_CODECS),
+            help="Compress the output while writing it (html keeps the plain page)",
+            default=None,
+        )
+        parser.add_argument(
+            "--external-css",
+            action="store_true",
+            help="Link html pages to one minified, content hashed stylesheet instead of inlining it",
+            default=False,
+        )
+        parser.add_argument(
+            "--minify",
+            action="store_true",
+            help="Minify the html output",
+            default=False,
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit with status 1 if any file could not be parsed",
+            default=False,
+        )
+        parser.add_argument(
+            "--shard",
+            help="Only parse shard i of N (e.g. 2/4) and write a shard artifact for 'merge'",
+        )
+        parser.add_argument(
+            "--shard-strategy",
+            choices=SHARD_STRATEGIES,
+            help="Partition files by a hash of their path, or balance them by size",
+            default="hash",
+        )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            help="Report parsed files, throughput and time remaining while parsing",
+            default=False,
+        )
+        parser.add_argument(
+            "--metrics",
+            action="append",
+            help="Write run metrics, as JSON for a .json path and OpenMetrics text otherwise (repeatable)",
+        )
+        parser.add_argument(
+            "--trace",
+            help="Write a timeline of the run in Chrome Trace Event format (e.g. trace.json)",
+        )
 
-        # Builder
-        self.builder = Builder()
+        commands = parser.add_subparsers(dest="command", metavar="command")
+
+        serve = commands.add_parser(
+            "serve", help="Serve the documentation from a warm in-memory tree"
+        )
+        Cli.add_tree_arguments(serve, suppress=True)
+        serve.add_argument("--host", help="Host to listen on", default="127.0.0.1")
+        serve.add_argument("--port", type=int, help="Port to listen on", default=8000)
+        serve.add_argument("--socket", help="Unix socket path to listen on instead")
+
+        merge = commands.add_parser(
+            "merge", help="Merge the artifacts written with '--shard' into one output"
+        )
+        merge.add_argument("shards", nargs="+", help="Paths to the shard artifacts")
+        Cli.add_tree_arguments(merge, suppress=True)
+        merge.add_argument("-o", "--out", help="Output path", default=argparse.SUPPRESS)
+        merge.add_argument(
+            "-ot", "--outputtype", help="Output type", default=argparse.SUPPRESS
+        )
+
+        coverage = commands.add_parser(
+            "coverage", help="Check docstring coverage without building the output"
+        )
+        coverage.add_argument("-p", "--path", help="Path", default=argparse.SUPPRESS)
+        coverage.add_argument(
+            "--follow-symlinks",
+            choices=list(FOLLOW_SYMLINKS),
+            help="Symbolic link policy",
+            default=argparse.SUPPRESS,
+        )
+        coverage.add_argument(
+            "--fail-under",
+            type=float,
+            help="Exit with status 1 if the total coverage is below this percentage",
+        )
+        coverage.add_argument(
+            "--fail-under-file",
+            type=float,
+            help="Exit with status 1 if any file's coverage is below this percentage",
+        )
+        coverage.add_argument(
+            "--missing",
+            action="store_true",
+            help="List the undocumented symbols of every file",
+            default=False,
+        )
+
+        query = commands.add_parser(
+            "query", help="Query symbols in a database built with '-ot sqlite'"
+        )
+        query.add_argument("database", help="Path to the doc.sqlite database")
+        query.add_argument(
+            "--kind", choices=["function", "class", "method"], help="Symbol kind"
+        )
+        query.add_argument("--returns", help="Return type name, e.g. dict")
+        query.add_argument("--under", help="Directory relative to the root, e.g. utils/")
+        query.add_argument("--name", help="Symbol name, '*' matches anything")
+        query.add_argument(
+            "--search", help="Words to find in names and descriptions, as plain text"
+        )
+        query.add_argument("--sql", help="Run a raw SQL query instead")
+        query.add_argument("--limit", type=int, help="Maximum rows", default=100)
+        return parser
+
+    @staticmethod
+    def add_tree_arguments(parser, suppress=False):
+        """
+        Adds the arguments controlling how the file tree is built.
+
+        Args:
+            parser (argparse.ArgumentParser): The parser to add the arguments to.
+            suppress (bool, optional): Leave omitted arguments unset, so a
+                                       sub-command does not override values
+                                       given before it. Defaults to False.
+        """
+
+        def default(value):
+            return argparse.SUPPRESS if suppress else value
+
+        parser.add_argument("-p", "--path", help="Path", default=default(None))
+        parser.add_argument(
+            "--io",
+            choices=["serial", "async"],
+            help="I/O mode, 'async' overlaps listings and reads (network filesystems)",
+            default=default("serial"),
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            help="Maximum concurrent I/O calls in async mode",
+            default=default(16),
+        )
+        parser.add_argument(
+            "--parse-workers",
+            type=int,
+            help="Workers parsing files, largest first",
+            default=default(1),
+        )
+        parser.add_argument(
+            "--parse-executor",
+            choices=["auto", "process", "thread"],
+            help="Parse in processes or threads, 'auto' uses threads on free-threaded builds",
+            default=default("auto"),
+        )
+        parser.add_argument(
+            "--max-file-size",
+            type=int,
+            help="Skip Python files larger than this many bytes",
+            default=default(None),
+        )
+        parser.add_argument(
+            "--parse-timeout",
+            type=float,
+            help="Seconds a parse worker may spend on one file before it is killed; "
+            "thread workers cannot be killed and keep running in the background",
+            default=default(None),
+        )
+        parser.add_argument(
+            "--follow-symlinks",
+            choices=list(FOLLOW_SYMLINKS),
+            help="'once' follows links to directories and files not documented yet, "
+            "'never' skips every link",
+            default=default("once"),
+        )
+        parser.add_argument(
+            "--inherited",
+            action="store_true",
+            help="Document the methods classes inherit from other project classes",
+            default=default(False),
+        )
+        parser.add_argument(
+            "--docstring-style",
+            choices=[*DOC_STRING_STYLES, *DOC_STRING_STYLE_MODES],
+            help="Docstring style, 'detect' samples the project, 'detect-file' each file",
+            default=default("auto"),
+        )
 
     def run_interactive_mode(self):
         """
@@ -105,9 +350,15 @@ class Cli(PrintInfoToTerminal):
                 "1": "html",
                 "2": "markdown",
                 "3": "json",
+                "4": "sqlite",
+                "5": "tree",
+                "6": "lazy-html",
                 "html": "html",
                 "markdown": "markdown",
                 "json": "json",
+                "sqlite": "sqlite",
+                "tree": "tree",
+                "lazy-html": "lazy-html",
             }
             get_output_type = input("Please select output type: ")
             if get_output_type in out_types:
@@ -131,7 +382,8 @@ class Cli(PrintInfoToTerminal):
             None
 
         Returns:
-            None
+            bool: False if the configuration is invalid, e.g. a malformed
+                  `--shard` spec, else True.
         """
 
         #  STAGE 1:
@@ -147,6 +399,24 @@ class Cli(PrintInfoToTerminal):
                 self.output_path = self.args.out
             if self.args.outputtype is not None:
                 self.output_type = self.args.outputtype
+        self.io_mode = self.args.io
+        self.max_in_flight = self.args.max_in_flight
+        self.render_workers = self.args.render_workers
+        self.parse_workers = self.args.parse_workers
+        self.max_file_size = self.args.max_file_size
+        self.parse_timeout = self.args.parse_timeout
+        self.parse_executor = self.args.parse_executor
+        self.follow_symlinks = self.args.follow_symlinks
+        self.compress = self.args.compress
+        self.builder = Builder(
+            external_css=self.args.external_css, minify=self.args.minify
+        )
+        self.doc_string_style = self.args.docstring_style
+        if self.args.shard is not None and self.args.command is None:
+            self.shard, error = Shards.parse_spec(self.args.shard)
+            if error is not None:
+                self.print(error, color="red")
+                return False
 
         # Display Introduction Message
         self.print_introduction()
@@ -157,8 +427,12 @@ class Cli(PrintInfoToTerminal):
                 "Input Path": self.root_path,
                 "Output Path": self.output_path,
                 "Output Type": self.output_type,
+                "I/O Mode": self.io_mode,
+                "Compression": self.compress or "none",
+                "Docstring Style": self.doc_string_style,
             }
         )
+        return True
 
     def files_and_doc_strings_stage(self):
         """
@@ -174,7 +448,236 @@ class Cli(PrintInfoToTerminal):
         """
 
         # STAGE 2:
-        self.file_tree = FileTools.build_directories(self.root_path)
+        cache = None
+        if self.shard is not None:
+            cache, self.shard_files = Shards.shard_cache(
+                abspath(self.root_path),
+                *self.shard,
+                self.args.shard_strategy,
+                self.follow_symlinks,
+            )
+            self.print(
+                f"Shard {self.shard[0]}/{self.shard[1]}: "
+                f"{len(cache.parse_only)} Python files",
+                color="blue",
+            )
+        elif self.args.since is not None:
+            cache = self.load_since_cache(self.args.since)
+        reuse = cache is not None and self.shard is None
+
+        style = self.resolve_doc_string_style()
+        use_scheduler = (
+            self.parse_workers > 1
+            or self.max_file_size is not None
+            or self.parse_timeout is not None
+        )
+        if self.args.progress:
+            # The parse scheduler lists the files, discovery would list them again
+            PROGRESS.start(
+                self.root_path, self.follow_symlinks, discover=not use_scheduler
+            )
+        scheduler = None
+        guard = WalkGuard(self.follow_symlinks)
+        try:
+            if use_scheduler:
+                from utils.scheduler import ParseScheduler
+
+                scheduler = ParseScheduler(
+                    self.parse_workers,
+                    style,
+                    max_file_size=self.max_file_size,
+                    timeout=self.parse_timeout,
+                    follow_symlinks=self.follow_symlinks,
+                    executor=self.parse_executor,
+                )
+                with TRACER.span(
+                    "prefetch", "stage", path=self.root_path, workers=self.parse_workers
+                ), METRICS.stage("prefetch"):
+                    cache = scheduler.prefetch(self.root_path, cache)
+
+            with METRICS.stage("walk"):
+                self.file_tree = build_tree(
+                    self.root_path,
+                    style=style,
+                    io_mode=self.io_mode,
+                    max_in_flight=self.max_in_flight,
+                    cache=cache,
+                    guard=guard,
+                )
+        finally:
+            PROGRESS.stop()
+        METRICS.add_cache(cache)
+
+        for path, reason in guard.skipped:
+            self.print(f"Skipped link {path}: {reason}", color="yellow")
+
+        if scheduler is not None:
+            for line in scheduler.summary():
+                color = "yellow" if line.startswith("Skipped") else "blue"
+                self.print(line, color=color)
+        if reuse:
+            self.print(
+                f"Reused {cache.hits} files, parsed {cache.misses} files", color="blue"
+            )
+
+    def hierarchy_stage(self):
+        """
+        Attaches the documented methods each class inherits to the file tree.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+
+        import time
+        from utils.hierarchy import ClassIndex
+
+        start = time.perf_counter()
+        with TRACER.span("hierarchy", "stage"), METRICS.stage("hierarchy"):
+            count = ClassIndex.attach_inherited(self.file_tree)
+        self.print(
+            f"{count} classes inherit documented methods "
+            f"({time.perf_counter() - start:.2f}s)",
+            color="blue",
+        )
+
+    def load_tree_stage(self, tree_path):
+        """
+        Loads a file tree saved with the "tree" output type.
+
+        Args:
+            tree_path (str): The path of the tree file.
+
+        Returns:
+            bool: True if the tree was loaded.
+        """
+
+        from utils.tree_format import TreeFormat
+
+        with METRICS.stage("load"):
+            tree, error = TreeFormat.load(tree_path)
+        if error is not None:
+            self.print(error, color="red")
+            return False
+        self.file_tree = tree
+        self.print(f"Loaded tree from '{tree_path}'", color="blue")
+        return True
+
+    def merge_stage(self):
+        """
+        Builds the file tree from shard artifacts, without parsing any file.
+
+        Args:
+            None
+
+        Returns:
+            bool: True if the shards were merged.
+        """
+
+        artifacts, error = Shards.load_artifacts(self.args.shards)
+        if error is not None:
+            self.print(error, color="red")
+            return False
+
+        # The checkout is walked again so the tree matches a single build,
+        # every file is served from the shards and none is parsed
+        root_path = abspath(self.root_path)
+        cache = Shards.merge_cache(artifacts, root_path)
+        with METRICS.stage("walk"):
+            self.file_tree = build_tree(
+                self.root_path,
+                style="auto",
+                io_mode=self.io_mode,
+                max_in_flight=self.max_in_flight,
+                cache=cache,
+                follow_symlinks=self.follow_symlinks,
+            )
+        METRICS.add_cache(cache)
+
+        # Files no shard was assigned would silently be documented as empty
+        missing = sorted(cache.seen - Shards.covered_paths(artifacts, root_path))
+        if missing:
+            self.print(
+                f"{len(missing)} Python files are in no shard, "
+                "run every shard on the same checkout as the merge:",
+                color="red",
+            )
+            for path in missing:
+                self.print(f"  {path}", color="red")
+            return False
+        self.print(
+            f"Merged {len(artifacts)} shards, {cache.hits} files", color="blue"
+        )
+        return True
+
+    def load_since_cache(self, revision):
+        """
+        Loads the previous JSON output to reuse for files unchanged since a revision.
+
+        Args:
+            revision (str): The git revision the previous output was built from.
+
+        Returns:
+            ParseCache: The seeded cache, or None to build everything.
+        """
+
+        previous_path = self.args.previous or previous_output(
+            abspath(self.output_path), self.compress
+        )
+        cache, error = since_cache(self.root_path, revision, previous_path)
+        if error is not None:
+            self.print(f"{error}, parsing every file", color="yellow")
+            return None
+        self.print(
+            f"{len(cache.parse_only)} Python files changed since {revision}",
+            color="blue",
+        )
+        return cache
+
+    def resolve_doc_string_style(self):
+        """
+        Resolves the "detect" docstring style to the project's dominant style.
+
+        Returns:
+            str: The docstring style to build the tree with.
+        """
+
+        style = self.doc_string_style
+        if style == "detect":
+            style = FileTools.detect_project_style(self.root_path)
+            self.print(f"Detected docstring style: {style}", color="blue")
+        return style
+
+    def serve_stage(self):
+        """
+        Serves the documentation from a warm in-memory tree until interrupted.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+
+        from utils.server import DocServer
+
+        doc_server = DocServer(
+            self.root_path,
+            style=self.resolve_doc_string_style(),
+            io_mode=self.io_mode,
+            max_in_flight=self.max_in_flight,
+            parse_workers=self.parse_workers,
+            max_file_size=self.max_file_size,
+            parse_timeout=self.parse_timeout,
+            parse_executor=self.parse_executor,
+            follow_symlinks=self.follow_symlinks,
+            inherited=self.args.inherited,
+        )
+        doc_server.serve(
+            host=self.args.host, port=self.args.port, socket_path=self.args.socket
+        )
 
     def check_output_directory(self, path):
         """Check if the output directory is valid and if not create it
@@ -189,6 +692,11 @@ class Cli(PrintInfoToTerminal):
         try:
             if not isdir(path):
                 mkdir(path)
+        except FileExistsError:
+            # Another process, e.g. a shard sharing the output path, created it
+            if not isdir(path):
+                self.print(f"FileExistsError: '{path}' is not a directory.")
+                return False
         except FileNotFoundError:
             self.print(
                 f"FileNotFoundError: The parent directory for '{path}' does not exist."
@@ -227,7 +735,6 @@ class Cli(PrintInfoToTerminal):
 
         # STAGE 3:
         file_path = abspath(f"{self.output_path}")
-        file_name = ""
 
         # Check output folder
         check_out_dir = self.check_output_directory(file_path)
@@ -235,40 +742,318 @@ class Cli(PrintInfoToTerminal):
             self.print("Error with output directory!", color="red")
             return
 
-        self.print(f"Output: {self.output_type} to '{file_path}'", color="green")
-
-        # Build the content
-        content = self.builder.build(self.file_tree, self.output_type)
-        if content is None:
-            self.print("Unable to Build Content", color="red")
+        if self.shard is not None:
+            self.build_shard_stage(file_path)
             return
 
-        if self.output_type == "html":
-            file_name = "index.html"
-        if self.output_type == "markdown":
-            file_name = "doc.md"
-        if self.output_type == "json":
-            file_name = "doc.json"
+        # Several comma separated types are all rendered from the same tree
+        output_types = [
+            output_type.strip() for output_type in self.output_type.split(",")
+        ]
+        for output_type in output_types:
+            if output_type not in OUTPUT_FILE_NAMES:
+                self.print(f"Unknown output type: {output_type}", color="red")
+                return
+
+        files = []
+        for output_type in output_types:
+            self.print(f"Output: {output_type} to '{file_path}'", color="green")
+
+            # Build the content
+            with METRICS.stage("render", output_type=output_type):
+                content = self.builder.build(
+                    self.file_tree, output_type, workers=self.render_workers
+                )
+            if content is None:
+                self.print("Unable to Build Content", color="red")
+                return
+
+            files.extend(
+                self.builder.output_files(
+                    f"{file_path}/{OUTPUT_FILE_NAMES[output_type]}",
+                    compress=self.compress,
+                    keep_uncompressed=output_type in ("html", "lazy-html"),
+                )
+            )
+
+        # Output the content, every file is written concurrently
+        with METRICS.stage("write"):
+            result = FileTools.write_files(files, workers=len(files))
+        if result is not None:
+            self.print(result, color="red")
+        else:
+            self.print("Output complete", color="green")
+
+    def build_shard_stage(self, file_path):
+        """
+        Writes the partial file tree of this shard as an artifact for `merge`.
+
+        Args:
+            file_path (str): The absolute output directory.
 
-        # Output the content
-        result = self.builder.output_content(f"{file_path}/{file_name}")
+        Returns:
+            None
+        """
+
+        number, count = self.shard
+        artifact_path = f"{file_path}/shard-{number}-of-{count}.json"
+        self.print(f"Output: shard artifact to '{artifact_path}'", color="green")
+        result = FileTools.write_file(
+            artifact_path,
+            Shards.build_artifact(
+                self.file_tree,
+                number,
+                count,
+                self.args.shard_strategy,
+                self.shard_files,
+            ),
+        )
         if result is not None:
             self.print(result, color="red")
         else:
             self.print("Output complete", color="green")
 
+    def metrics_stage(self, metrics_paths):
+        """
+        Writes the metrics of the run.
+
+        Args:
+            metrics_paths (list): The paths of the metrics files, JSON for paths
+                                  ending with ".json", OpenMetrics text otherwise.
+
+        Returns:
+            None
+        """
+
+        if self.file_tree:
+            METRICS.add_tree(self.file_tree)
+        METRICS.add_peak_memory()
+        # Writing the metrics is not part of them
+        METRICS.enabled = False
+        for metrics_path in metrics_paths:
+            result = METRICS.save(metrics_path)
+            if result is not None:
+                self.print(result, color="red")
+            else:
+                self.print(f"Metrics: '{abspath(metrics_path)}'", color="green")
+
+    def trace_stage(self, trace_path):
+        """
+        Writes the spans recorded during the run as a Chrome trace.
+
+        Args:
+            trace_path (str): The path of the trace file.
+
+        Returns:
+            None
+        """
+
+        # Writing the trace records spans too, they are not part of it
+        count = len(TRACER.events)
+        result = TRACER.save(trace_path)
+        if result is not None:
+            self.print(result, color="red")
+        else:
+            self.print(
+                f"Trace: {count} events to '{abspath(trace_path)}'", color="green"
+            )
+
+    def diagnostics_stage(self):
+        """
+        Lists the files that could not be parsed.
+
+        Args:
+            None
+
+        Returns:
+            int: The number of files that could not be parsed.
+        """
+
+        diagnostics = FileTools.collect_diagnostics(self.file_tree)
+        if diagnostics:
+            self.print(
+                f"{len(diagnostics)} files could not be parsed and are documented "
+                "with a diagnostic:",
+                color="yellow",
+            )
+            for path, diagnostic in diagnostics:
+                self.print(
+                    f"  {path}: {FileTools.describe_diagnostic(diagnostic)}",
+                    color="yellow",
+                )
+        return len(diagnostics)
+
+    def coverage_stage(self):
+        """
+        Prints the docstring coverage per directory and checks the thresholds.
+
+        Args:
+            None
+
+        Returns:
+            int: 1 if the coverage is below `--fail-under` or a file's coverage
+                 is below `--fail-under-file`, else None.
+        """
+
+        import time
+        from utils.coverage import Coverage
+
+        args = self.args
+        root_path = abspath(args.path if args.path is not None else self.root_path)
+        if not isdir(root_path):
+            self.print(f"Not a directory: {root_path}", color="red")
+            return 1
+
+        start = time.perf_counter()
+        report = Coverage.check(root_path, args.follow_symlinks)
+        elapsed = time.perf_counter() - start
+
+        for path, diagnostic in report["errors"]:
+            self.print(
+                f"{path}: {FileTools.describe_diagnostic(diagnostic)}", color="yellow"
+            )
+        for directory, (documented, total) in sorted(report["directories"].items()):
+            percent = Coverage.percent(documented, total)
+            name = directory[len(root_path) :].lstrip("/") or "."
+            self.print(f"{name}/: {documented}/{total} ({percent:.1f}%)", color="blue")
+            if not args.missing:
+                continue
+            for path, (documented, total, undocumented) in sorted(
+                report["files"].items()
+            ):
+                if dirname(path) != directory or not undocumented:
+                    continue
+                self.print(
+                    f"  {basename(path)}: {documented}/{total}, missing "
+                    f"{', '.join(undocumented)}",
+                    color="yellow",
+                )
+
+        documented, total = report["directories"][root_path]
+        percent = Coverage.percent(documented, total)
+        self.print(
+            f"Coverage {percent:.1f}% ({documented}/{total} public symbols "
+            f"documented) in {len(report['files'])} files, {elapsed:.2f}s",
+            color="green",
+        )
+
+        failed = False
+        if args.fail_under is not None and percent < args.fail_under:
+            self.print(f"Coverage is below {args.fail_under:g}%", color="red")
+            failed = True
+        if args.fail_under_file is not None:
+            for path, (documented, total, _) in sorted(report["files"].items()):
+                file_percent = Coverage.percent(documented, total)
+                if file_percent < args.fail_under_file:
+                    self.print(
+                        f"{path}: {file_percent:.1f}% is below "
+                        f"{args.fail_under_file:g}%",
+                        color="red",
+                    )
+                    failed = True
+        return 1 if failed else None
+
+    def query_stage(self):
+        """
+        Runs a query against a SQLite database and prints the matching rows.
+
+        Args:
+            None
+
+        Returns:
+            int: 1 if the database is missing or the query failed, else None.
+        """
+
+        import sqlite3
+        import time
+        from utils.database import Sqlite
+
+        args = self.args
+        if not isfile(args.database):
+            self.print(f"Database not found: {args.database}", color="red")
+            return 1
+
+        if args.sql is not None:
+            sql, parameters = args.sql, []
+        else:
+            sql, parameters = Sqlite.build_query(
+                kind=args.kind,
+                returns=args.returns,
+                under=args.under,
+                name=args.name,
+                search=args.search,
+                limit=args.limit,
+            )
+
+        start = time.perf_counter()
+        try:
+            columns, rows = Sqlite.execute(args.database, sql, parameters)
+        except sqlite3.Error as error:
+            self.print(f"Query failed: {error}", color="red")
+            return 1
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.print(" | ".join(columns), color="blue")
+        for row in rows:
+            self.print(" | ".join("" if value is None else str(value) for value in row))
+        self.print(f"{len(rows)} rows in {elapsed:.1f} ms", color="green")
+        return None
+
     def run(self):
         """Run The main CLI program
         Stage 1 - Get parameters from flags or through interactive mode
         Stage 2 - Get Files and doc strings
         stage 3 - Output HTML & CSS files
+
+        Returns:
+            int: 1 if a query fails, the configuration is invalid, a merge or
+                 loading the tree fails, or `--strict` is set and a file could
+                 not be parsed, else None.
         """
+        if self.args.command == "query":
+            return self.query_stage()
+        if self.args.command == "coverage":
+            return self.coverage_stage()
+
         #  STAGE 1:
-        self.config_stage()
+        if not self.config_stage():
+            return 1
 
-        # STAGE 2:
-        self.files_and_doc_strings_stage()
-        self.print_directory_branch(self.file_tree, level=0)
+        if self.args.command == "serve":
+            self.serve_stage()
+            return
 
-        # STAGE 3:
-        self.build_output_stage()
+        if self.args.trace is not None:
+            TRACER.enable()
+        if self.args.metrics:
+            METRICS.enable()
+            METRICS.set("workers", self.parse_workers, kind="parse")
+            METRICS.set("workers", self.render_workers, kind="render")
+            in_flight = self.max_in_flight if self.io_mode == "async" else 1
+            METRICS.set("workers", in_flight, kind="io")
+        try:
+            with METRICS.stage("total"):
+                # STAGE 2:
+                if self.args.command == "merge":
+                    if not self.merge_stage():
+                        return 1
+                elif self.args.from_tree is not None:
+                    if not self.load_tree_stage(self.args.from_tree):
+                        return 1
+                else:
+                    self.files_and_doc_strings_stage()
+                if self.args.inherited:
+                    self.hierarchy_stage()
+                self.print_directory_branch(self.file_tree, level=0)
+
+                # STAGE 3:
+                self.build_output_stage()
+        finally:
+            if self.args.metrics:
+                self.metrics_stage(self.args.metrics)
+            if self.args.trace is not None:
+                self.trace_stage(self.args.trace)
+
+        if self.diagnostics_stage() > 0 and self.args.strict:
+            return 1
+        return None
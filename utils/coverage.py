@@ -0,0 +1,157 @@
+"""
+This module measures the docstring coverage of a project without building the
+documentation, for CI gates.
+
+Classes:
+
+    Coverage:
+        Provides static methods for counting the documented and undocumented
+        public functions, classes and methods per file and per directory.
+"""
+
+import ast
+from os.path import abspath, dirname
+from .file_tools import FileTools, WalkGuard
+
+
+class Coverage:
+    """
+    This class provides static methods for measuring docstring coverage.
+
+    Files are only parsed with `ast`, docstrings are checked for presence and
+    never parsed with `docstring_parser`, and nothing is rendered.
+
+    A symbol is public if its name does not start with "_". The public symbols
+    are the module level functions and classes, and the methods and nested
+    classes of public classes. Functions defined inside functions are not
+    counted.
+    """
+
+    @staticmethod
+    def is_documented(node):
+        """
+        Checks whether a function or class has a non-empty docstring.
+
+        Args:
+            node (ast.AST): A function or class definition.
+
+        Returns:
+            bool: True if the docstring is present and not blank.
+        """
+
+        doc_string = ast.get_docstring(node, clean=False)
+        return bool(doc_string and doc_string.strip())
+
+    @staticmethod
+    def file_symbols(tree):
+        """
+        Lists the public symbols of a module.
+
+        Args:
+            tree (ast.Module): The AST of the module.
+
+        Returns:
+            list: (qualified name, kind, documented) tuples in source order, kind
+                  is "function", "class" or "method".
+        """
+
+        symbols = []
+        definitions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        # (node, qualified name prefix, inside a class)
+        stack = [(node, "", False) for node in reversed(tree.body)]
+        while stack:
+            node, prefix, in_class = stack.pop()
+            if not isinstance(node, definitions) or node.name.startswith("_"):
+                continue
+            name = f"{prefix}{node.name}"
+            if isinstance(node, ast.ClassDef):
+                symbols.append((name, "class", Coverage.is_documented(node)))
+                stack.extend((child, f"{name}.", True) for child in reversed(node.body))
+            else:
+                kind = "method" if in_class else "function"
+                symbols.append((name, kind, Coverage.is_documented(node)))
+        return symbols
+
+    @staticmethod
+    def check_file(file_path):
+        """
+        Lists the public symbols of a Python file.
+
+        The file is read and parsed with `FileTools.ast_parse`, so the files
+        the build documents with a diagnostic are the ones reported here.
+
+        Args:
+            file_path (str): The path to the Python file.
+
+        Returns:
+            list: The symbols, see `file_symbols`, or None on errors.
+            dict: A diagnostic describing why the file could not be parsed (see
+                  `FileTools.build_diagnostic`), or None on success.
+        """
+
+        tree, error = FileTools.ast_parse(file_path)
+        if error is not None:
+            return None, error
+        return Coverage.file_symbols(tree), None
+
+    @staticmethod
+    def check(base_path, follow_symlinks="once"):
+        """
+        Measures the docstring coverage of every Python file under a directory.
+
+        Args:
+            base_path (str): The directory to check.
+            follow_symlinks (str, optional): The symbolic link policy, a key of
+                                             `FOLLOW_SYMLINKS`. Defaults to "once".
+
+        Returns:
+            dict: The coverage report:
+                - files (dict): Maps each file path to its (documented,
+                                total, undocumented names).
+                - directories (dict): Maps each directory path, including
+                                      `base_path`, to its (documented, total),
+                                      summed over every file below it.
+                - errors (list): (path, diagnostic) of the files that could not
+                                 be parsed.
+        """
+
+        root = abspath(base_path)
+        files = {}
+        directories = {root: (0, 0)}
+        errors = []
+        for path, _ in FileTools.list_python_files(root, WalkGuard(follow_symlinks)):
+            symbols, error = Coverage.check_file(path)
+            if error is not None:
+                errors.append((path, error))
+                continue
+            undocumented = [name for name, _, documented in symbols if not documented]
+            documented = len(symbols) - len(undocumented)
+            files[path] = (documented, len(symbols), undocumented)
+
+            # Add the counts to every directory up to the root
+            directory = dirname(path)
+            while True:
+                counts = directories.get(directory, (0, 0))
+                directories[directory] = (
+                    counts[0] + documented,
+                    counts[1] + len(symbols),
+                )
+                if directory == root or len(directory) <= len(root):
+                    break
+                directory = dirname(directory)
+        return {"files": files, "directories": directories, "errors": errors}
+
+    @staticmethod
+    def percent(documented, total):
+        """
+        Gets a coverage percentage.
+
+        Args:
+            documented (int): The number of documented symbols.
+            total (int): The number of symbols.
+
+        Returns:
+            float: The percentage, 100 if there are no symbols.
+        """
+
+        return 100.0 if total == 0 else 100.0 * documented / total
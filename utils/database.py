@@ -0,0 +1,420 @@
+"""
+This module provides the SQLite output format and queries against it.
+
+Classes:
+
+    Sqlite:
+        Builds an indexed SQLite database of the file tree, with a full-text
+        search table over symbol descriptions, and runs queries against it.
+"""
+
+import posixpath
+import sqlite3
+from pathlib import Path
+from .terminal import Print
+
+
+SCHEMA = """
+CREATE TABLE directories (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER REFERENCES directories(id),
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    relative_path TEXT NOT NULL
+);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    directory_id INTEGER NOT NULL REFERENCES directories(id),
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    relative_path TEXT NOT NULL
+);
+CREATE TABLE symbols (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    parent_id INTEGER REFERENCES symbols(id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    short_description TEXT,
+    long_description TEXT,
+    style TEXT
+);
+CREATE TABLE params (
+    id INTEGER PRIMARY KEY,
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id),
+    position INTEGER NOT NULL,
+    name TEXT,
+    type_name TEXT,
+    is_optional INTEGER,
+    default_value TEXT,
+    description TEXT
+);
+CREATE TABLE returns (
+    id INTEGER PRIMARY KEY,
+    symbol_id INTEGER NOT NULL REFERENCES symbols(id),
+    position INTEGER NOT NULL,
+    type_name TEXT,
+    return_name TEXT,
+    is_generator INTEGER,
+    description TEXT
+);
+CREATE TABLE diagnostics (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    type TEXT NOT NULL,
+    message TEXT,
+    line INTEGER
+);
+CREATE INDEX directories_parent ON directories(parent_id);
+CREATE UNIQUE INDEX directories_relative_path ON directories(relative_path);
+CREATE INDEX files_directory ON files(directory_id);
+CREATE UNIQUE INDEX files_relative_path ON files(relative_path);
+CREATE INDEX symbols_file ON symbols(file_id);
+CREATE INDEX symbols_parent ON symbols(parent_id);
+CREATE INDEX symbols_name ON symbols(name);
+CREATE INDEX symbols_kind_name ON symbols(kind, name);
+CREATE INDEX params_symbol ON params(symbol_id);
+CREATE INDEX params_type ON params(type_name);
+CREATE INDEX returns_symbol ON returns(symbol_id);
+CREATE INDEX returns_type ON returns(type_name);
+CREATE INDEX diagnostics_file ON diagnostics(file_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE symbols_fts USING fts5(
+    name, short_description, long_description,
+    content='symbols', content_rowid='id'
+);
+INSERT INTO symbols_fts(rowid, name, short_description, long_description)
+    SELECT id, name, short_description, long_description FROM symbols;
+"""
+
+
+class Sqlite(Print):
+    """
+    A class responsible for building and querying the SQLite output format.
+
+    The database has one table each for directories, files, symbols (functions,
+    classes and methods), params, returns and the diagnostics of files that
+    could not be parsed, indexed for lookups by name, kind, type and path.
+    When SQLite is built with FTS5, `symbols_fts` indexes the names and
+    descriptions of all symbols.
+    """
+
+    def build_database(self, tree):
+        """
+        Builds the SQLite database for the file tree.
+
+        Args:
+            tree (dict): The parsed file tree structure representing the codebase.
+
+        Returns:
+            bytes: The serialized database if successful, otherwise None.
+        """
+
+        rows = {
+            "directories": [],
+            "files": [],
+            "symbols": [],
+            "params": [],
+            "returns": [],
+            "diagnostics": [],
+        }
+        self.add_directory(rows, tree, None, tree["path"])
+
+        try:
+            connection = sqlite3.connect(":memory:")
+            try:
+                with connection:
+                    connection.executescript(SCHEMA)
+                    connection.executemany(
+                        "INSERT INTO directories VALUES (?, ?, ?, ?, ?)",
+                        rows["directories"],
+                    )
+                    connection.executemany(
+                        "INSERT INTO files VALUES (?, ?, ?, ?, ?)", rows["files"]
+                    )
+                    connection.executemany(
+                        "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows["symbols"],
+                    )
+                    connection.executemany(
+                        "INSERT INTO params VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows["params"],
+                    )
+                    connection.executemany(
+                        "INSERT INTO returns VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows["returns"],
+                    )
+                    connection.executemany(
+                        "INSERT INTO diagnostics VALUES (?, ?, ?, ?, ?)",
+                        rows["diagnostics"],
+                    )
+                    try:
+                        connection.executescript(FTS_SCHEMA)
+                    except sqlite3.OperationalError as error:
+                        self.print(
+                            f"Full-text search unavailable ({error}), skipping symbols_fts",
+                            color="yellow",
+                        )
+                connection.execute("ANALYZE")
+                return connection.serialize()
+            finally:
+                connection.close()
+        except sqlite3.Error as error:
+            self.print(
+                f"SQLite error while building the database: {error}", color="red"
+            )
+            return None
+
+    def add_directory(self, rows, directory, parent_id, root_path):
+        """
+        Adds the rows for a directory and everything below it.
+
+        Args:
+            rows (dict): Maps a table name to its list of rows.
+            directory (dict): A dictionary representing a directory.
+            parent_id (int): The id of the parent directory, or None for the root.
+            root_path (str): The absolute path of the tree root.
+        """
+
+        directory_id = len(rows["directories"]) + 1
+        rows["directories"].append(
+            (
+                directory_id,
+                parent_id,
+                directory["name"],
+                directory["path"],
+                self.relative_path(directory["path"], root_path),
+            )
+        )
+        for file in directory.get("files", []):
+            file_id = len(rows["files"]) + 1
+            rows["files"].append(
+                (
+                    file_id,
+                    directory_id,
+                    file["name"],
+                    file["path"],
+                    self.relative_path(file["path"], root_path),
+                )
+            )
+            for diagnostic in file["content"].get("diagnostics", []):
+                rows["diagnostics"].append(
+                    (
+                        len(rows["diagnostics"]) + 1,
+                        file_id,
+                        diagnostic["type"],
+                        diagnostic["message"],
+                        diagnostic["line"],
+                    )
+                )
+            for item in file["content"]["classes"]:
+                class_id = self.add_symbol(rows, item, file_id, None, "class")
+                for method in item.get("methods", []):
+                    self.add_symbol(rows, method, file_id, class_id, "method")
+            for item in file["content"]["functions"]:
+                self.add_symbol(rows, item, file_id, None, "function")
+        for sub_directory in directory.get("directories", []):
+            self.add_directory(rows, sub_directory, directory_id, root_path)
+
+    def add_symbol(self, rows, item, file_id, parent_id, kind):
+        """
+        Adds the rows for a symbol and its params and returns.
+
+        Args:
+            rows (dict): Maps a table name to its list of rows.
+            item (dict): A dictionary representing a docstring item.
+            file_id (int): The id of the file defining the symbol.
+            parent_id (int): The id of the enclosing class, or None.
+            kind (str): "function", "class" or "method".
+
+        Returns:
+            int: The id of the symbol.
+        """
+
+        doc_string = item["doc_string"]
+        symbol_id = len(rows["symbols"]) + 1
+        rows["symbols"].append(
+            (
+                symbol_id,
+                file_id,
+                parent_id,
+                kind,
+                item["name"],
+                doc_string.get("short_description"),
+                doc_string.get("long_description"),
+                doc_string["style"]["name"] if "style" in doc_string else None,
+            )
+        )
+        for position, meta in enumerate(doc_string["meta"]):
+            if not meta["args"]:
+                continue
+            if meta["args"][0] == "param":
+                rows["params"].append(
+                    (
+                        len(rows["params"]) + 1,
+                        symbol_id,
+                        position,
+                        meta.get("arg_name"),
+                        meta.get("type_name"),
+                        meta.get("is_optional"),
+                        meta.get("default"),
+                        meta.get("description"),
+                    )
+                )
+            elif meta["args"][0] == "returns":
+                rows["returns"].append(
+                    (
+                        len(rows["returns"]) + 1,
+                        symbol_id,
+                        position,
+                        meta.get("type_name"),
+                        meta.get("return_name"),
+                        meta.get("is_generator"),
+                        meta.get("description"),
+                    )
+                )
+        return symbol_id
+
+    @staticmethod
+    def relative_path(path, root_path):
+        """
+        Gets a path relative to the tree root, using "/" separators.
+
+        Args:
+            path (str): An absolute path inside the tree.
+            root_path (str): The absolute path of the tree root.
+
+        Returns:
+            str: The relative path, "" for the root itself.
+        """
+
+        return path[len(root_path) :].lstrip("/\\").replace("\\", "/")
+
+    @staticmethod
+    def connect(database_path):
+        """
+        Opens a database read-only.
+
+        Args:
+            database_path (str): The path to the database file.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+
+        # A file URI, so paths with "?" or "#" are quoted
+        uri = Path(database_path).absolute().as_uri()
+        return sqlite3.connect(f"{uri}?mode=ro", uri=True)
+
+    @staticmethod
+    def fts_query(search):
+        """
+        Builds an FTS5 query matching every word of a search, as plain text.
+
+        Each word is quoted as an FTS5 string, so punctuation such as "parse("
+        is matched literally instead of being FTS5 syntax. Raw FTS5 queries
+        can be run with `--sql`.
+
+        Args:
+            search (str): The words to search for.
+
+        Returns:
+            str: The FTS5 query, or None if the search has no words.
+        """
+
+        terms = ['"' + term.replace('"', '""') + '"' for term in search.split()]
+        return " ".join(terms) or None
+
+    @staticmethod
+    def build_query(
+        kind=None, returns=None, under=None, name=None, search=None, limit=100
+    ):
+        """
+        Builds a query for symbols matching all the given filters.
+
+        Args:
+            kind (str, optional): "function", "class" or "method". Defaults to None.
+            returns (str, optional): A return type name. Defaults to None.
+            under (str, optional): A directory relative to the tree root, e.g.
+                                   "utils/", where "/" and "." are the root
+                                   itself and filter nothing. Defaults to None.
+            name (str, optional): A symbol name, with `*` wildcards. Defaults to None.
+            search (str, optional): Words that must all occur in the name or
+                                    the descriptions, see `fts_query`.
+                                    Defaults to None.
+            limit (int, optional): The maximum number of rows. Defaults to 100.
+
+        Returns:
+            tuple: The SQL string and its parameters.
+        """
+
+        conditions = []
+        parameters = []
+        joins = ["JOIN files ON files.id = symbols.file_id"]
+        if kind is not None:
+            conditions.append("symbols.kind = ?")
+            parameters.append(kind)
+        if returns is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM returns WHERE returns.symbol_id = symbols.id"
+                " AND returns.type_name = ?)"
+            )
+            parameters.append(returns)
+        under = None if under is None else posixpath.normpath(under).strip("/")
+        if under and under != ".":
+            # A range on the path prefix, so files_relative_path is used
+            prefix = under + "/"
+            conditions.append("files.relative_path >= ? AND files.relative_path < ?")
+            parameters.extend([prefix, prefix[:-1] + "0"])
+        if name is not None:
+            conditions.append("symbols.name GLOB ?")
+            parameters.append(name)
+        search = None if search is None else Sqlite.fts_query(search)
+        if search is not None:
+            joins.append("JOIN symbols_fts ON symbols_fts.rowid = symbols.id")
+            conditions.append("symbols_fts MATCH ?")
+            parameters.append(search)
+
+        sql = (
+            "SELECT symbols.kind, "
+            "coalesce(parent.name || '.', '') || symbols.name AS name, "
+            "files.relative_path AS file, "
+            "(SELECT group_concat(type_name, ', ') FROM returns"
+            " WHERE returns.symbol_id = symbols.id) AS returns, "
+            "symbols.short_description "
+            "FROM symbols "
+            + " ".join(joins)
+            + " LEFT JOIN symbols AS parent ON parent.id = symbols.parent_id"
+        )
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY files.relative_path, symbols.id LIMIT ?"
+        parameters.append(limit)
+        return sql, parameters
+
+    @staticmethod
+    def execute(database_path, sql, parameters=()):
+        """
+        Runs a query against a database file.
+
+        Args:
+            database_path (str): The path to the database file.
+            sql (str): The SQL query.
+            parameters (list, optional): The query parameters. Defaults to ().
+
+        Returns:
+            tuple: The column names and the list of rows.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or the query fails.
+        """
+
+        connection = Sqlite.connect(database_path)
+        try:
+            cursor = connection.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description or []]
+            return columns, cursor.fetchall()
+        finally:
+            connection.close()
@@ -4,12 +4,78 @@ Classes:
     FileTools:
         Provides static methods for file and directory manipulation.
         Includes functionalities for building file/directory structures and parsing docstrings.
+
+    ParseCache:
+        Caches parsed file contents between walks, keyed by modification time.
+
+    WalkGuard:
+        Tracks the directories and files a walk visited, to break symbolic
+        link loops and document each physical file once.
+
+    DocStringStyleSampler:
+        Detects the dominant docstring style from the first docstrings parsed.
 """
 
 import ast
-from os import listdir
-from os.path import isdir, basename, abspath
-from docstring_parser import parse
+import threading
+from collections import Counter
+from importlib import import_module
+from importlib.util import find_spec
+from io import TextIOWrapper
+from itertools import islice
+from os import listdir, replace, remove, fsync, fstat, chmod, umask, close, walk, stat
+from os import makedirs
+from os import O_RDONLY
+from os import open as os_open
+from os.path import isdir, islink, basename, abspath, dirname, exists, realpath
+from .hierarchy import ClassIndex
+from .metrics import METRICS
+from .progress import PROGRESS
+from .trace import TRACER
+
+# Heavy modules (docstring_parser, the compression codecs, tempfile) are
+# imported where they are used, to keep `import utils` fast.
+
+# Symbolic link policies of `WalkGuard`
+FOLLOW_SYMLINKS = {
+    "once": "Follow links to directories and files not documented yet",
+    "never": "Skip every symbolic link",
+}
+
+# Stream compression codecs: name -> (file extension, module providing `open`)
+COMPRESSION_CODECS = {
+    "gzip": (".gz", "gzip"),
+    "bz2": (".bz2", "bz2"),
+    "lzma": (".xz", "lzma"),
+}
+try:
+    # Python 3.14+
+    if find_spec("compression.zstd") is not None:
+        COMPRESSION_CODECS["zstd"] = (".zst", "compression.zstd")
+except ImportError:
+    pass
+
+# Docstring styles accepted by `FileTools.parse_doc_string`,
+# mapped to their `docstring_parser.DocstringStyle` member names
+DOC_STRING_STYLES = {
+    "auto": "AUTO",
+    "google": "GOOGLE",
+    "numpy": "NUMPYDOC",
+    "rest": "REST",
+    "epydoc": "EPYDOC",
+}
+# Modes resolving to one of the styles above by sampling docstrings,
+# once for the whole project or once per file
+DOC_STRING_STYLE_MODES = ("detect", "detect-file")
+# Number of docstrings sampled to detect a style for a project or a file
+DETECT_SAMPLE_SIZE = 50
+DETECT_FILE_SAMPLE_SIZE = 10
+
+# Characters handed to a compressor per write call
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Most threads `write_files` stages files with, e.g. the fragments of lazy-html
+MAX_WRITE_WORKERS = 32
 
 
 class FileTools:
@@ -19,13 +85,19 @@ class FileTools:
     """
 
     @staticmethod
-    def write_file(path, text):
+    def write_file(path, text, compress=None):
         """
         Writes the given text to the specified file path.
 
+        The file is written atomically, see `write_files`.
+
         Args:
             path (str): The path to the file where the text will be written.
-            text (str): The text content to be written to the file.
+            text (str or bytes): The content to be written to the file.
+            compress (str, optional): A codec from `COMPRESSION_CODECS`. The text
+                                      is compressed in chunks as it is written and
+                                      the codec's extension is appended to `path`.
+                                      Defaults to None, writing plain text.
 
         Returns:
             None: If the file was written successfully.
@@ -38,9 +110,83 @@ class FileTools:
                     - Exception: For any other unexpected errors.
         """
 
+        return FileTools.write_files([(path, text, compress)])
+
+    @staticmethod
+    def write_files(files, workers=1):
+        """
+        Atomically writes one or more files.
+
+        Every file is first written to a temporary file in its target directory
+        and fsynced. Only once all of them are complete are they renamed into
+        place, so readers never see a truncated or half written output. Missing
+        parent directories of the targets, such as the fragment directory of
+        "lazy-html", are created first. A target listed several times, such as
+        the stylesheet shared by the HTML outputs, is written once.
+
+        Args:
+            files (list): A list of (path, text, compress) tuples, as accepted
+                          by `write_file`.
+            workers (int, optional): Threads writing and compressing the
+                                     temporary files concurrently, at most
+                                     `MAX_WRITE_WORKERS`. Defaults to 1.
+
+        Returns:
+            None: If all files were written successfully.
+            str: An error message string, as returned by `write_file`. No target
+                 file is replaced when staging fails.
+        """
+
+        staged = []
+        path = None
         try:
-            with open(f"{path}", "w", encoding="utf-8") as file:
-                file.write(text)
+            pending = []
+            targets = set()
+            for path, text, compress in files:
+                if compress is not None and compress not in COMPRESSION_CODECS:
+                    raise ValueError(f"Unknown compression codec: {compress}")
+                if compress is not None:
+                    path = f"{path}{COMPRESSION_CODECS[compress][0]}"
+                if path in targets:
+                    continue
+                targets.add(path)
+                pending.append((path, text, compress))
+            for directory in {dirname(abspath(path)) for path, _, _ in pending}:
+                makedirs(directory, exist_ok=True)
+            # Read once: the umask is process wide and is set to read it
+            mode = FileTools.default_file_mode()
+
+            workers = min(workers, MAX_WRITE_WORKERS)
+            if workers > 1 and len(pending) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+
+                # Writes, fsyncs and the compression codecs release the GIL
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        (executor.submit(FileTools.stage_file, *item, mode), item[0])
+                        for item in pending
+                    ]
+                staged = [
+                    (future.result(), path)
+                    for future, path in futures
+                    if future.exception() is None
+                ]
+                for future, path in futures:
+                    if future.exception() is not None:
+                        raise future.exception()
+            else:
+                for path, text, compress in pending:
+                    staged.append(
+                        (FileTools.stage_file(path, text, compress, mode), path)
+                    )
+
+            targets = [target for _, target in staged]
+            with TRACER.span("commit", "io", files=len(targets)):
+                for temp_path, path in staged:
+                    replace(temp_path, path)
+                staged = []
+                for directory in {dirname(abspath(target)) for target in targets}:
+                    FileTools.sync_directory(directory)
         except FileNotFoundError as error:
             return f"FileNotFoundError: Could not open file at {path}: {error}"
         except PermissionError as error:
@@ -51,15 +197,129 @@ class FileTools:
             return f"IOError: An I/O error occurred while writing to {path}: {error}"
         except Exception as error:
             return f"An unexpected error occurred while writing to {path}: {error}"
+        finally:
+            for temp_path, _ in staged:
+                if exists(temp_path):
+                    remove(temp_path)
         return None
 
     @staticmethod
-    def build_file(file_path):
+    def stage_file(path, text, compress=None, mode=None):
+        """
+        Writes text to a fsynced temporary file in the directory of `path`.
+
+        Args:
+            path (str): The final path of the file.
+            text (str or bytes): The content to be written, text is encoded as UTF-8.
+            compress (str, optional): A codec from `COMPRESSION_CODECS`.
+                                      Defaults to None.
+            mode (int, optional): The permission bits of the file. Defaults to
+                                  None, using `default_file_mode`, which must
+                                  not run while other threads create files.
+
+        Returns:
+            str: The path of the temporary file.
+        """
+
+        from tempfile import mkstemp
+
+        directory = dirname(abspath(path))
+        descriptor, temp_path = mkstemp(
+            dir=directory, prefix=f".{basename(path)}.", suffix=".tmp"
+        )
+        try:
+            with TRACER.span("write", "io", path=path, size=len(text)), open(
+                descriptor, "wb"
+            ) as raw:
+                if mode is None:
+                    mode = FileTools.default_file_mode()
+                chmod(temp_path, mode)
+                binary = isinstance(text, bytes)
+                if compress is not None:
+                    codec = import_module(COMPRESSION_CODECS[compress][1])
+                    if binary:
+                        file = codec.open(raw, "wb")
+                    else:
+                        file = codec.open(raw, "wt", encoding="utf-8")
+                elif binary:
+                    file = raw
+                else:
+                    file = TextIOWrapper(raw, encoding="utf-8", write_through=True)
+                for start in range(0, len(text), WRITE_CHUNK_SIZE):
+                    file.write(text[start : start + WRITE_CHUNK_SIZE])
+                if compress is not None:
+                    file.close()
+                elif not binary:
+                    file.flush()
+                    file.detach()
+                raw.flush()
+                fsync(raw.fileno())
+                if METRICS.enabled:
+                    METRICS.add("written_bytes", raw.tell())
+        except BaseException:
+            remove(temp_path)
+            raise
+        return temp_path
+
+    @staticmethod
+    def default_file_mode():
+        """
+        Gets the permission bits a newly created file would get from the umask.
+
+        The umask can only be read by setting it, briefly changing it for the
+        whole process, so this is called before any writer thread starts.
+
+        Returns:
+            int: The file mode.
+        """
+
+        mask = umask(0)
+        umask(mask)
+        return 0o666 & ~mask
+
+    @staticmethod
+    def sync_directory(directory):
+        """
+        Fsyncs a directory so renames inside it survive a crash.
+
+        Does nothing on platforms that cannot open directories.
+
+        Args:
+            directory (str): The path of the directory.
+        """
+
+        try:
+            descriptor = os_open(directory, O_RDONLY)
+        except OSError:
+            return
+        try:
+            fsync(descriptor)
+        except OSError:
+            pass
+        finally:
+            close(descriptor)
+
+    @staticmethod
+    def build_file(
+        file_path, source=None, style="auto", cache=None, file_stat=None, error=None
+    ):
         """
         Builds a dictionary representation of a Python file.
 
         Args:
             file_path (str): The path to the Python file.
+            source (bytes, optional): The already read contents of the file.
+                                      Defaults to None, reading from `file_path`.
+            style (str, optional): The docstring style, a key of `DOC_STRING_STYLES`
+                                   or "detect-file". Defaults to "auto".
+            cache (ParseCache, optional): A cache of file contents, reused while
+                                          the file is unchanged. Defaults to None.
+            file_stat (os.stat_result, optional): The stat of the file, if already
+                                                  known. Defaults to None.
+            error (dict, optional): The diagnostic of a failed read of `source`
+                                    (see `build_diagnostic`), the file is then
+                                    documented with it and not read again.
+                                    Defaults to None.
 
         Returns:
             dict: A dictionary containing information about the file, including:
@@ -70,27 +330,59 @@ class FileTools:
         """
 
         absolute_path = abspath(file_path)
+        content = None
+        # Prefetched files were counted by the parse scheduler
+        counted = False
+        if cache is not None:
+            counted = absolute_path in cache.prefetched
+            if file_stat is None and not cache.is_fresh(absolute_path):
+                file_stat = stat(absolute_path)
+            content = cache.get(absolute_path, file_stat)
+        if content is None:
+            if error is not None:
+                content = {"functions": [], "classes": [], "diagnostics": [error]}
+            else:
+                content = FileTools.build_file_content(
+                    absolute_path, source=source, style=style
+                )
+            if cache is not None:
+                cache.put(absolute_path, file_stat, content)
+        if PROGRESS.enabled and not counted:
+            PROGRESS.add_file(absolute_path, file_stat, content)
         return {
             "name": basename(absolute_path).strip(".py"),
             "type": "file",
             "path": absolute_path,
-            "content": FileTools.build_file_content(absolute_path),
+            "content": content,
         }
 
     @staticmethod
-    def parse_doc_string(doc_string):
+    def parse_doc_string(doc_string, style="auto"):
         """
         Parses a docstring using the `docstring_parser` library and converts it
         into a dictionary representation.
 
+        An explicit style parses the docstring once, instead of once per style
+        as "auto" does. Docstrings that fail to parse in the given style fall
+        back to "auto".
+
         Args:
             doc_string (str): The docstring to be parsed.
+            style (str, optional): A key of `DOC_STRING_STYLES`. Defaults to "auto".
 
         Returns:
             dict: A dictionary containing the parsed docstring information.
         """
 
-        doc = parse(doc_string)
+        from docstring_parser import parse, DocstringStyle, ParseError
+
+        doc_style = DocstringStyle[DOC_STRING_STYLES[style]]
+        try:
+            doc = parse(doc_string, style=doc_style)
+        except ParseError:
+            if doc_style == DocstringStyle.AUTO:
+                raise
+            doc = parse(doc_string)
         converted = {"meta": []}
         for name, obj in doc.__dict__.items():
             if name == "style" and obj is not None:
@@ -110,12 +402,15 @@ class FileTools:
         return converted
 
     @staticmethod
-    def build_doc_string(node):
+    def build_doc_string(node, style="auto"):
         """
         Extracts function or class name and docstring information from an AST node.
 
         Args:
             node (ast.AST): An AST node representing a function or class definition.
+            style (str or DocStringStyleSampler, optional): A key of
+                `DOC_STRING_STYLES`, or a sampler detecting the style.
+                Defaults to "auto".
 
         Returns:
             dict (or None): A dictionary containing information about the function/class
@@ -129,39 +424,174 @@ class FileTools:
             func_name = node.name
             docstring = ast.get_docstring(node)
             if docstring:
+                if isinstance(style, DocStringStyleSampler):
+                    doc_string = style.parse(docstring)
+                else:
+                    doc_string = FileTools.parse_doc_string(docstring, style=style)
                 return {
                     "name": func_name,
-                    "doc_string": FileTools.parse_doc_string(docstring),
+                    "doc_string": doc_string,
                 }
         return None
 
     @staticmethod
-    def ast_parse(file_path):
+    def base_names(node):
+        """
+        Gets the dotted names of the bases of a class definition.
+
+        Args:
+            node (ast.ClassDef): The class definition.
+
+        Returns:
+            list: The dotted names, e.g. ["Base", "abc.ABC"]. Generic bases such
+                  as `Base[T]` give the name of the generic class, bases that
+                  are not names (e.g. calls) are left out.
+        """
+
+        names = []
+        for base in node.bases:
+            if isinstance(base, ast.Subscript):
+                base = base.value
+            parts = []
+            while isinstance(base, ast.Attribute):
+                parts.append(base.attr)
+                base = base.value
+            if isinstance(base, ast.Name):
+                parts.append(base.id)
+                names.append(".".join(reversed(parts)))
+        return names
+
+    @staticmethod
+    def ast_parse(file_path, source=None):
         """Parses a Python file and returns the AST (Abstract Syntax Tree).
 
         Args:
             file_path (str): Path to the Python file.
+            source (bytes, optional): The already read contents of the file.
+                                      Defaults to None, reading from `file_path`.
+                                      Bytes are decoded as strict UTF-8 like
+                                      a file read here, ignoring coding cookies,
+                                      so every I/O mode gets the same result.
 
         Returns:
             ast.AST: The AST of the parsed Python file, or None on errors.
-            Exception: error object with error message
+            dict: A diagnostic describing the error (see `build_diagnostic`),
+                  or None on success. Sources nested too deeply for the parser,
+                  e.g. generated expressions, get a RecursionError or
+                  MemoryError diagnostic.
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return ast.parse(file.read()), None
-        except FileNotFoundError:
-            return None, f"File not found: {file_path}"
-        except IOError as error:
-            return None, f"Error reading file: {file_path} ({error})"
+            if source is None:
+                with TRACER.span("read", "io", path=file_path) as span, open(
+                    file_path, "r", encoding="utf-8"
+                ) as file:
+                    source = file.read()
+                    span.args["size"] = len(source)
+                    if METRICS.enabled:
+                        METRICS.add("read_bytes", fstat(file.fileno()).st_size)
+            elif isinstance(source, bytes):
+                source = source.decode("utf-8")
+            with TRACER.span("ast.parse", "parse", path=file_path, size=len(source)):
+                return ast.parse(source, filename=file_path), None
+        except (
+            SyntaxError,
+            UnicodeDecodeError,
+            ValueError,
+            OSError,
+            RecursionError,
+            MemoryError,
+        ) as error:
+            return None, FileTools.build_diagnostic(error)
+
+    @staticmethod
+    def build_diagnostic(error):
+        """
+        Builds the diagnostic recorded for a file that could not be parsed.
+
+        Args:
+            error (Exception): The error raised while reading or parsing the file.
+
+        Returns:
+            dict: A dictionary containing:
+                - type (str): The name of the exception class.
+                - message (str): The error message.
+                - line (int): The line of the error, or None if unknown.
+        """
+
+        if isinstance(error, SyntaxError):
+            return {
+                "type": type(error).__name__,
+                "message": error.msg,
+                "line": error.lineno,
+            }
+        return {"type": type(error).__name__, "message": str(error), "line": None}
+
+    @staticmethod
+    def describe_diagnostic(diagnostic):
+        """
+        Formats a diagnostic for display.
+
+        Args:
+            diagnostic (dict): A diagnostic, see `build_diagnostic`.
+
+        Returns:
+            str: e.g. "SyntaxError: invalid syntax (line 3)".
+        """
+
+        line = "" if diagnostic["line"] is None else f" (line {diagnostic['line']})"
+        return f"{diagnostic['type']}: {diagnostic['message']}{line}"
+
+    @staticmethod
+    def collect_diagnostics(tree):
+        """
+        Collects the diagnostics of every file in a tree.
+
+        Args:
+            tree (dict): The file tree.
+
+        Returns:
+            list: (file path, diagnostic) tuples in walk order.
+        """
+
+        diagnostics = []
+        for file in tree.get("files", []):
+            for diagnostic in file["content"].get("diagnostics", []):
+                diagnostics.append((file["path"], diagnostic))
+        for directory in tree.get("directories", []):
+            diagnostics.extend(FileTools.collect_diagnostics(directory))
+        return diagnostics
+
+    @staticmethod
+    def has_content(content):
+        """
+        Checks whether a file's content is worth documenting.
+
+        Args:
+            content (dict): The content of a file, as built by `build_file_content`.
+
+        Returns:
+            bool: True if the file has functions, classes or diagnostics.
+        """
+
+        return (
+            len(content["functions"]) > 0
+            or len(content["classes"]) > 0
+            or "diagnostics" in content
+        )
 
     @staticmethod
-    def build_file_content(file_path):
+    def build_file_content(file_path, source=None, style="auto"):
         """
         Analyzes a Python file and extracts information about its functions, classes,
         and their docstrings.
 
         Args:
             file_path (str): The path to the Python file.
+            source (bytes, optional): The already read contents of the file.
+                                      Defaults to None, reading from `file_path`.
+            style (str, optional): The docstring style, a key of `DOC_STRING_STYLES`
+                                   or "detect-file" to detect it from this file's
+                                   docstrings. Defaults to "auto".
 
         Returns:
             dict: A dictionary containing information about the file's content, including:
@@ -169,36 +599,151 @@ class FileTools:
                                     each containing name and parsed docstring (if available).
                 - classes (list): A list of dictionaries representing classes,
                                    each containing name, parsed docstring (if available),
-                                   and a list of methods with their docstrings.
+                                   a list of methods with their docstrings, and
+                                   the dotted names of their bases, if any
+                                   (see `base_names`).
+                - diagnostics (list): Only if the file could not be read or
+                                      parsed, a list with one diagnostic (see
+                                      `build_diagnostic`). The file then has no
+                                      functions or classes.
         """
 
         functions = []
         classes = []
 
+        if METRICS.enabled:
+            METRICS.add("parsed_files")
+
         # get AST (Abstract Syntax Tree) of file
-        tree, error = FileTools.ast_parse(file_path)
+        tree, error = FileTools.ast_parse(file_path, source=source)
 
         if error is not None:
-            raise Exception(error)
-
-        # Loop through AST for classes and functions
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_doc = FileTools.build_doc_string(node)
-                if class_doc:
-                    class_doc["methods"] = []
-                    for method in node.body:
-                        doc = FileTools.build_doc_string(method)
+            return {"functions": [], "classes": [], "diagnostics": [error]}
+
+        if style == "detect-file":
+            style = DocStringStyleSampler()
+
+        # Loop through AST for classes and functions, a docstring that cannot
+        # be parsed fails this file only
+        try:
+            with TRACER.span("parse_doc_string", "parse", path=file_path) as span:
+                for node in ast.walk(tree):
+                    if isinstance(node, ast.ClassDef):
+                        class_doc = FileTools.build_doc_string(node, style=style)
+                        if class_doc:
+                            class_doc["methods"] = []
+                            for method in node.body:
+                                doc = FileTools.build_doc_string(method, style=style)
+                                if doc:
+                                    class_doc["methods"].append(doc)
+                            bases = FileTools.base_names(node)
+                            if bases:
+                                class_doc["bases"] = bases
+                            classes.append(class_doc)
+                    else:
+                        doc = FileTools.build_doc_string(node, style=style)
                         if doc:
-                            class_doc["methods"].append(doc)
-                    classes.append(class_doc)
-            else:
-                doc = FileTools.build_doc_string(node)
-                if doc:
-                    functions.append(doc)
+                            functions.append(doc)
+                symbols = len(functions) + sum(
+                    1 + len(class_doc["methods"]) for class_doc in classes
+                )
+                span.args["symbols"] = symbols
+                if METRICS.enabled:
+                    METRICS.add("parsed_docstrings", symbols)
+        except Exception as error:  # pylint: disable=broad-except
+            return {
+                "functions": [],
+                "classes": [],
+                "diagnostics": [FileTools.build_diagnostic(error)],
+            }
 
         return {"functions": functions, "classes": classes}
 
+    @staticmethod
+    def collect_doc_strings(tree, limit=DETECT_SAMPLE_SIZE):
+        """
+        Collects the first docstrings of the functions and classes in an AST.
+
+        Args:
+            tree (ast.AST): The AST of a Python file.
+            limit (int, optional): The maximum number of docstrings collected.
+                                   Defaults to `DETECT_SAMPLE_SIZE`.
+
+        Returns:
+            list: A list of docstrings.
+        """
+
+        doc_strings = (
+            ast.get_docstring(node)
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.ClassDef))
+        )
+        return list(islice(filter(None, doc_strings), limit))
+
+    @staticmethod
+    def detect_doc_string_style(doc_strings):
+        """
+        Detects the dominant style of a sample of docstrings.
+
+        Each docstring is parsed with "auto"; docstrings without any params,
+        returns or raises sections are ignored as they fit every style.
+
+        Args:
+            doc_strings (list): A list of docstrings.
+
+        Returns:
+            str: The dominant style as a key of `DOC_STRING_STYLES`,
+                 or "auto" if no style could be detected.
+        """
+
+        from docstring_parser import ParseError
+
+        sampler = DocStringStyleSampler(sample_size=len(doc_strings))
+        for doc_string in doc_strings:
+            try:
+                sampler.parse(doc_string)
+            except ParseError:
+                continue
+        return sampler.dominant_style()
+
+    @staticmethod
+    def detect_project_style(base_path, limit=DETECT_SAMPLE_SIZE):
+        """
+        Detects the dominant docstring style of a project from a sample of its docstrings.
+
+        Walks the project the same way as `build_directories` and stops once
+        `limit` docstrings have been collected.
+
+        Args:
+            base_path (str): The absolute or relative path to the base directory.
+            limit (int, optional): The number of docstrings sampled.
+                                   Defaults to `DETECT_SAMPLE_SIZE`.
+
+        Returns:
+            str: The dominant style as a key of `DOC_STRING_STYLES`,
+                 or "auto" if no style could be detected.
+        """
+
+        doc_strings = []
+        for root, directories, files in walk(abspath(base_path)):
+            directories[:] = [
+                item
+                for item in directories
+                if not item.startswith("__") and not item.startswith(".")
+            ]
+            for item in files:
+                if not item.endswith(".py"):
+                    continue
+                tree, error = FileTools.ast_parse(f"{root}/{item}")
+                if error is not None:
+                    continue
+                doc_strings.extend(
+                    FileTools.collect_doc_strings(tree, limit - len(doc_strings))
+                )
+                if len(doc_strings) >= limit:
+                    return FileTools.detect_doc_string_style(doc_strings)
+        return FileTools.detect_doc_string_style(doc_strings)
+
     @staticmethod
     def build_directory(directory_path):
         """
@@ -217,22 +762,71 @@ class FileTools:
 
         absolute_path = abspath(directory_path)
 
+        with TRACER.span("list", "io", path=absolute_path) as span:
+            items = listdir(absolute_path)
+            span.args["size"] = len(items)
+
         # Create dict detailing directory
         return {
             "name": basename(absolute_path),
             "type": "directory",
             "path": absolute_path,
-            "items": listdir(absolute_path),
+            "items": items,
         }
 
     @staticmethod
-    def build_directories(base_path):
+    def list_python_files(base_path, guard=None):
+        """
+        Lists the Python files `build_directories` would parse, with their sizes.
+
+        Args:
+            base_path (str): The absolute or relative path to the base directory.
+            guard (WalkGuard, optional): Tracks the directories and files already
+                                         visited. Defaults to None, starting a
+                                         new walk that follows symbolic links once.
+
+        Returns:
+            list: A list of (absolute path, size in bytes) tuples in walk order.
+        """
+
+        absolute_path = abspath(base_path)
+        if guard is None:
+            guard = WalkGuard()
+        if guard.root is None:
+            guard.admit_root(absolute_path)
+        files = []
+        for item in listdir(absolute_path):
+            item_path = f"{absolute_path}/{item}"
+            if (
+                isdir(item_path)
+                and not item.startswith("__")
+                and not item.startswith(".")
+            ):
+                if guard.admit(item_path) is not None:
+                    files.extend(FileTools.list_python_files(item_path, guard))
+            elif item.endswith(".py"):
+                file_stat = guard.admit(item_path)
+                if file_stat is not None:
+                    files.append((item_path, file_stat.st_size))
+        return files
+
+    @staticmethod
+    def build_directories(base_path, style="auto", cache=None, guard=None):
         """
         Recursively builds a hierarchical representation of the directory structure
         starting from the given base path.
 
         Args:
             base_path (str): The absolute or relative path to the base directory.
+            style (str, optional): The docstring style, a key of `DOC_STRING_STYLES`
+                                   or "detect-file". Defaults to "auto".
+            cache (ParseCache, optional): A cache of file contents, only files
+                                          changed since they were cached are
+                                          parsed. Defaults to None.
+            guard (WalkGuard, optional): Tracks the directories and files already
+                                         visited, so each is documented once.
+                                         Defaults to None, starting a new walk
+                                         that follows symbolic links once.
 
         Returns:
             dict: A dictionary representing the directory structure, containing:
@@ -253,13 +847,17 @@ class FileTools:
             - If it's a Python file:
                 - Builds a file dictionary using `FileTools.build_file`.
                 - Adds the file dictionary to the "files" list if it contains
-                functions or classes.
+                functions, classes or diagnostics.
 
         Finally, removes the "items" key from the directory dictionary
         as it's no longer needed.
         """
 
         absolute_path = abspath(base_path)
+        if guard is None:
+            guard = WalkGuard()
+        if guard.root is None:
+            guard.admit_root(absolute_path)
 
         # Create dict with directory contents
         directory = FileTools.build_directory(absolute_path)
@@ -276,7 +874,11 @@ class FileTools:
             ):
                 if "directories" not in directory:
                     directory["directories"] = []
-                new_directory = FileTools.build_directories(item_path)
+                if guard.admit(item_path) is None:
+                    continue
+                new_directory = FileTools.build_directories(
+                    item_path, style=style, cache=cache, guard=guard
+                )
 
                 # Check to see if  directory has contents
                 # add to parent directory if contents found
@@ -297,14 +899,338 @@ class FileTools:
                 if item.endswith(".py"):
                     if "files" not in directory:
                         directory["files"] = []
-                    new_file = FileTools.build_file(item_path)
-                    if (
-                        len(new_file["content"]["functions"]) > 0
-                        or len(new_file["content"]["classes"]) > 0
-                    ):
+                    if guard.admit(item_path) is None:
+                        continue
+                    new_file = FileTools.build_file(
+                        item_path, style=style, cache=cache
+                    )
+                    if FileTools.has_content(new_file["content"]):
                         directory["files"].append(new_file)
 
         # Remove excess list of directory contents
         del directory["items"]
 
         return directory
+
+
+class ParseCache:
+    """
+    Caches parsed file contents by path, keyed by modification time and size.
+
+    A walk is bracketed by `begin` and `end`, which report whether any file
+    was added, changed or removed since the previous walk.
+
+    A cache seeded with `from_tree` trusts its entries without checking the
+    filesystem, and treats files outside `parse_only` that it has no entry
+    for as having no documented content.
+
+    Lookups and stores are locked, so walks and parse workers running in
+    threads can share a cache.
+
+    Attributes:
+        entries (dict): Maps a path to its (mtime_ns, size, content), where
+                        trusted entries have None for mtime_ns and size.
+        parse_only (set): The only paths that may be parsed, or None.
+        prefetched (dict): Maps a path to content parsed ahead of the walk,
+                           e.g. by a `ParseScheduler`, used once on its miss.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that required parsing.
+    """
+
+    def __init__(self, parse_only=None):
+        """
+        Initializes an empty cache.
+
+        Args:
+            parse_only (set, optional): The absolute paths of the only files
+                                        that may be parsed, any other file is
+                                        served from the cache. Defaults to None.
+        """
+
+        self.entries = {}
+        self.parse_only = parse_only
+        self.prefetched = {}
+        self.hits = 0
+        self.misses = 0
+        self.seen = set()
+        self.changed = False
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_tree(cls, tree, parse_only):
+        """
+        Creates a cache trusting the file contents of a previously built tree.
+
+        The "inherited" lists of its classes are dropped, they are computed
+        again from the new tree with `--inherited`.
+
+        Args:
+            tree (dict): A file tree, e.g. loaded from a previous `doc.json`.
+            parse_only (set): The absolute paths of the files changed since the
+                              tree was built, which are parsed again.
+
+        Returns:
+            ParseCache: The seeded cache.
+        """
+
+        cache = cls(parse_only=parse_only)
+        directories = [tree]
+        while directories:
+            directory = directories.pop()
+            directories.extend(directory.get("directories", []))
+            for file in directory.get("files", []):
+                if file["path"] not in parse_only:
+                    content = ClassIndex.strip_inherited(file["content"])
+                    cache.entries[file["path"]] = (None, None, content)
+        return cache
+
+    def is_fresh(self, path, file_stat=None):
+        """
+        Checks whether a file is cached and unchanged, without counting a lookup.
+
+        Args:
+            path (str): The absolute path of the file.
+            file_stat (os.stat_result, optional): The current stat of the file.
+                                                  Defaults to None, in which case
+                                                  only trusted entries are fresh.
+
+        Returns:
+            bool: True if the cached content can be used.
+        """
+
+        entry = self.entries.get(path)
+        if entry is None:
+            return self.parse_only is not None and path not in self.parse_only
+        if entry[0] is None:
+            return True
+        return file_stat is not None and entry[:2] == (
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+        )
+
+    def get(self, path, file_stat=None):
+        """
+        Gets the cached content of a file if it is unchanged.
+
+        Args:
+            path (str): The absolute path of the file.
+            file_stat (os.stat_result, optional): The current stat of the file.
+                                                  Defaults to None.
+
+        Returns:
+            dict (or None): The cached or prefetched content, or None if the
+                            file needs parsing.
+        """
+
+        with self.lock:
+            self.seen.add(path)
+            if self.is_fresh(path, file_stat):
+                self.hits += 1
+                if path in self.entries:
+                    return self.entries[path][2]
+                return {"functions": [], "classes": []}
+            self.misses += 1
+            self.changed = True
+            content = self.prefetched.pop(path, None)
+        if content is not None and file_stat is not None:
+            self.put(path, file_stat, content)
+        return content
+
+    def put(self, path, file_stat, content):
+        """
+        Stores the parsed content of a file.
+
+        Args:
+            path (str): The absolute path of the file.
+            file_stat (os.stat_result): The stat of the file when it was read.
+            content (dict): The parsed content.
+        """
+
+        with self.lock:
+            self.entries[path] = (file_stat.st_mtime_ns, file_stat.st_size, content)
+
+    def begin(self):
+        """
+        Starts a walk.
+        """
+
+        self.seen = set()
+        self.changed = False
+
+    def end(self):
+        """
+        Ends a walk, dropping entries for files that no longer exist.
+
+        Returns:
+            bool: True if any file was added, changed or removed during the walk.
+        """
+
+        removed = self.entries.keys() - self.seen
+        for path in removed:
+            del self.entries[path]
+        return self.changed or len(removed) > 0
+
+
+class WalkGuard:
+    """
+    Tracks the physical directories and files visited by a walk.
+
+    The root of the walk is admitted first with `admit_root`. Symbolic links to
+    targets inside the root are skipped, as the walk reaches the target by
+    its real path, which also breaks links back to a parent directory.
+    Everything else is identified by `(st_dev, st_ino)`, so a directory or
+    file outside the root reached through several links, or a hard link, is
+    only documented the first time it is reached.
+
+    Attributes:
+        follow_symlinks (str): "once" follows symbolic links to directories
+                               and files not visited yet, "never" skips every
+                               symbolic link.
+        root (str): The real path of the root of the walk.
+        visited (dict): Maps `(st_dev, st_ino)` to the first path it was
+                        reached by.
+        skipped (list): (path, reason) of every directory and file skipped.
+    """
+
+    def __init__(self, follow_symlinks="once"):
+        """
+        Initializes the WalkGuard.
+
+        Args:
+            follow_symlinks (str, optional): A key of `FOLLOW_SYMLINKS`.
+                                             Defaults to "once".
+        """
+
+        self.follow_symlinks = follow_symlinks
+        self.root = None
+        self.visited = {}
+        self.skipped = []
+
+    def admit_root(self, path):
+        """
+        Records the root of the walk as visited.
+
+        The root is entered even if it is a symbolic link, whatever the link
+        policy, and is identified by its real path, so links back to it are
+        reported as loops.
+
+        Args:
+            path (str): The absolute path of the root.
+        """
+
+        self.root = realpath(path)
+        try:
+            root_stat = stat(self.root)
+        except OSError:
+            return
+        self.visited[(root_stat.st_dev, root_stat.st_ino)] = path
+
+    def admit(self, path, file_stat=None, is_link=None):
+        """
+        Checks whether the walk should enter a directory or document a file,
+        and records it as visited.
+
+        Args:
+            path (str): The absolute path of the directory or file.
+            file_stat (os.stat_result, optional): The stat of the target, if
+                                                  already known. Defaults to None.
+            is_link (bool, optional): Whether `path` is a symbolic link, if
+                                      already known. Defaults to None.
+
+        Returns:
+            os.stat_result: The stat of the target, or None if it is skipped.
+        """
+
+        if self.root is None:
+            self.root = realpath(path)
+        if is_link is None:
+            is_link = islink(path)
+        if is_link:
+            if self.follow_symlinks == "never":
+                self.skipped.append((path, "symbolic link"))
+                return None
+            target = realpath(path)
+            if target == self.root or target.startswith(f"{self.root}/"):
+                parent = realpath(dirname(path))
+                if parent == target or parent.startswith(f"{target}/"):
+                    self.skipped.append((path, f"loop back to {target}"))
+                else:
+                    self.skipped.append((path, f"link to {target}"))
+                return None
+        if file_stat is None:
+            try:
+                file_stat = stat(path)
+            except OSError:
+                self.skipped.append((path, "broken symbolic link"))
+                return None
+
+        key = (file_stat.st_dev, file_stat.st_ino)
+        first = self.visited.get(key)
+        if first is not None:
+            self.skipped.append((path, f"same as {first}"))
+            return None
+        self.visited[key] = path
+        return file_stat
+
+
+class DocStringStyleSampler:
+    """
+    Parses the first docstrings with "auto" and then locks in their dominant style.
+
+    The sampled docstrings are not parsed twice, their "auto" results are kept.
+
+    Attributes:
+        sample_size (int): The number of docstrings parsed with "auto".
+        style (str): The style used for the next docstring.
+        counts (Counter): The number of sampled docstrings per detected style.
+    """
+
+    def __init__(self, sample_size=DETECT_FILE_SAMPLE_SIZE):
+        """
+        Initializes the sampler.
+
+        Args:
+            sample_size (int, optional): The number of docstrings parsed with
+                                         "auto". Defaults to `DETECT_FILE_SAMPLE_SIZE`.
+        """
+
+        self.sample_size = sample_size
+        self.sampled = 0
+        self.style = "auto"
+        self.counts = Counter()
+
+    def parse(self, doc_string):
+        """
+        Parses a docstring, sampling its style until the style is locked in.
+
+        Args:
+            doc_string (str): The docstring to be parsed.
+
+        Returns:
+            dict: The parsed docstring, as returned by `FileTools.parse_doc_string`.
+        """
+
+        if self.sampled >= self.sample_size:
+            return FileTools.parse_doc_string(doc_string, style=self.style)
+
+        self.sampled += 1
+        converted = FileTools.parse_doc_string(doc_string)
+        # Docstrings without sections fit every style, so they carry no signal
+        if converted["meta"] and "style" in converted:
+            self.counts[converted["style"]["name"]] += 1
+        if self.sampled >= self.sample_size:
+            self.style = self.dominant_style()
+        return converted
+
+    def dominant_style(self):
+        """
+        Gets the most common style among the sampled docstrings.
+
+        Returns:
+            str: A key of `DOC_STRING_STYLES`, or "auto" if no style was detected.
+        """
+
+        if not self.counts:
+            return "auto"
+        names = {style: name for name, style in DOC_STRING_STYLES.items()}
+        return names[self.counts.most_common(1)[0][0]]
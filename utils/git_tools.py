@@ -0,0 +1,83 @@
+"""
+Classes:
+
+    GitTools:
+        Provides static methods for asking the local git repository which
+        files changed, without any network access.
+"""
+
+from os import fsdecode
+from os.path import abspath
+
+
+class GitTools:
+    """
+    This class provides static methods for working with the local git repository.
+    """
+
+    @staticmethod
+    def run_git(directory, arguments):
+        """
+        Runs a git command in a directory.
+
+        Args:
+            directory (str): The directory to run git in.
+            arguments (list): The git arguments.
+
+        Returns:
+            str: The output of the command, decoded like file system paths, or
+                 None on errors.
+            str: An error message, or None on success.
+        """
+
+        import subprocess
+
+        try:
+            result = subprocess.run(
+                ["git", "-C", directory, *arguments],
+                capture_output=True,
+                check=False,
+            )
+        except FileNotFoundError:
+            return None, "git is not installed"
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", "replace").strip()
+            return None, f"git {' '.join(arguments)} failed: {stderr}"
+        return fsdecode(result.stdout), None
+
+    @staticmethod
+    def changed_python_files(base_path, revision):
+        """
+        Lists the Python files under a directory that were added, modified or
+        deleted since a revision, including uncommitted and untracked files.
+
+        Args:
+            base_path (str): The directory inside a git work tree.
+            revision (str): The revision to compare against, e.g. "HEAD~1".
+
+        Returns:
+            set: The absolute paths of the changed files, or None on errors.
+            str: An error message, or None on success.
+        """
+
+        absolute_path = abspath(base_path)
+
+        # --relative keeps the paths relative to (and inside) the base path, -z
+        # lists them unquoted and NUL separated, as git quotes unusual paths
+        diff, error = GitTools.run_git(
+            absolute_path,
+            ["diff", "--name-only", "-z", "--no-renames", "--relative", revision, "--"],
+        )
+        if error is not None:
+            return None, error
+        untracked, error = GitTools.run_git(
+            absolute_path, ["ls-files", "-z", "--others", "--exclude-standard"]
+        )
+        if error is not None:
+            return None, error
+
+        return {
+            f"{absolute_path}/{path}"
+            for path in (diff + untracked).split("\0")
+            if path.endswith(".py")
+        }, None
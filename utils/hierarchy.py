@@ -0,0 +1,365 @@
+"""
+This module resolves the class hierarchy of a project, so subclasses document
+the methods they inherit.
+
+Classes:
+
+    ClassIndex:
+        Indexes the classes of a file tree by module and name, resolves their
+        bases to project classes, computes their method resolution order once
+        per class, and attaches the inherited documented methods.
+"""
+
+from os.path import splitext
+
+
+class ClassIndex:
+    """
+    A project wide index of the classes in a file tree.
+
+    Every class is identified by its file path and name. A base is resolved
+    within the class's own file first, then among the classes whose qualified
+    name ends with it (e.g. "models.Base" matches the class `Base` of
+    `app/models.py`), and it stays unresolved when no or several classes
+    match. Unresolved bases, such as classes of other libraries,
+    contribute nothing to the MRO.
+
+    Each lookup is a dictionary access and each MRO is computed once from the
+    memoized MROs of the bases, so building the index and resolving every
+    class is linear in the number of classes and the length of their MROs.
+    The memos are only added to with `setdefault`, so threads sharing an
+    index may compute a value twice but always use the same one.
+
+    Attributes:
+        classes (dict): Maps a class key (file path, name) to its class dict.
+        modules (dict): Maps a class key to the dotted module of its file.
+        suffixes (dict): Maps every dotted suffix of a qualified class name to
+                         the keys of the classes it matches.
+        mros (dict): Maps a class key to its memoized MRO, a list of keys.
+        shared (dict): Maps a class key to the method dicts its subclasses
+                       inherit, see `inheritable_methods`.
+    """
+
+    def __init__(self, tree):
+        """
+        Indexes the classes of a file tree.
+
+        Args:
+            tree (dict): The file tree, with "bases" recorded on the classes.
+        """
+
+        self.classes = {}
+        self.modules = {}
+        self.suffixes = {}
+        self.mros = {}
+        self.shared = {}
+        root = tree["path"]
+        stack = [tree]
+        while stack:
+            branch = stack.pop()
+            stack.extend(branch.get("directories", []))
+            for file in branch.get("files", []):
+                module = self.module_name(file["path"], root)
+                for class_doc in file["content"]["classes"]:
+                    key = (file["path"], class_doc["name"])
+                    # A name defined twice in a file keeps its first class
+                    if key in self.classes:
+                        continue
+                    self.classes[key] = class_doc
+                    self.modules[key] = module
+                    parts = f"{module}.{class_doc['name']}".split(".")
+                    for start in range(len(parts)):
+                        suffix = ".".join(parts[start:])
+                        self.suffixes.setdefault(suffix, []).append(key)
+
+    @staticmethod
+    def module_name(path, root):
+        """
+        Gets the dotted module name of a file relative to the project root.
+
+        Args:
+            path (str): The absolute path of the file.
+            root (str): The absolute path of the project root.
+
+        Returns:
+            str: The module name, e.g. "utils.file_tools" or "utils" for
+                 "utils/__init__.py".
+        """
+
+        parts = splitext(path[len(root) :].lstrip("/\\"))[0].replace("\\", "/")
+        parts = parts.split("/")
+        if parts[-1] == "__init__" and len(parts) > 1:
+            parts.pop()
+        return ".".join(parts)
+
+    def resolve(self, key, base):
+        """
+        Resolves a base of a class to a project class.
+
+        Args:
+            key (tuple): The key of the class.
+            base (str): The dotted base expression, e.g. "models.Base".
+
+        Returns:
+            tuple: The key of the base class, or None if it is unresolved.
+        """
+
+        if "." not in base:
+            local = (key[0], base)
+            if local in self.classes and local != key:
+                return local
+        candidates = [
+            candidate for candidate in self.suffixes.get(base, []) if candidate != key
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+        return None
+
+    def mro(self, key):
+        """
+        Gets the method resolution order of a class, memoized.
+
+        The bases are resolved iteratively, so arbitrarily deep hierarchies do
+        not hit the recursion limit. The order is the C3 linearization, as in
+        Python itself; if the bases cannot be linearized, e.g. in code that
+        would not run, it falls back to a depth first order without repeats.
+        Inheritance cycles are cut where they are found.
+
+        Args:
+            key (tuple): The key of the class.
+
+        Returns:
+            list: The keys of the class and its resolved ancestors.
+        """
+
+        if key in self.mros:
+            return self.mros[key]
+
+        # Iterative post-order over the bases, each class is resolved once
+        visiting = set()
+        stack = [(key, None)]
+        while stack:
+            current, bases = stack.pop()
+            if current in self.mros:
+                continue
+            if bases is None:
+                visiting.add(current)
+                bases = []
+                for base in self.classes[current].get("bases", []):
+                    resolved = self.resolve(current, base)
+                    if resolved is not None and resolved not in visiting:
+                        bases.append(resolved)
+                stack.append((current, bases))
+                stack.extend((base, None) for base in bases if base not in self.mros)
+                continue
+            visiting.discard(current)
+            bases = [base for base in bases if base in self.mros]
+            self.mros.setdefault(
+                current,
+                [current] + self.merge([self.mros[base] for base in bases] + [bases]),
+            )
+        return self.mros[key]
+
+    @staticmethod
+    def merge(sequences):
+        """
+        Merges the MROs of the bases with the C3 rule.
+
+        Args:
+            sequences (list): The MROs of the bases followed by the bases.
+
+        Returns:
+            list: The merged order.
+        """
+
+        # Single inheritance, the common case, is the base's MRO itself
+        if len(sequences) == 2 and len(sequences[1]) == 1:
+            return list(sequences[0])
+        if len(sequences) == 1:
+            return []
+
+        sequences = [list(sequence) for sequence in sequences if sequence]
+        merged = []
+        while sequences:
+            tails = {item for sequence in sequences for item in sequence[1:]}
+            head = next(
+                (sequence[0] for sequence in sequences if sequence[0] not in tails),
+                None,
+            )
+            if head is None:
+                # Not linearizable, fall back to depth first without repeats
+                for sequence in sequences:
+                    merged.extend(item for item in sequence if item not in merged)
+                return merged
+            merged.append(head)
+            sequences = [
+                [item for item in sequence if item != head] for sequence in sequences
+            ]
+            sequences = [sequence for sequence in sequences if sequence]
+        return merged
+
+    def display_name(self, key):
+        """
+        Gets the qualified name of a class, e.g. "utils.output.Html".
+
+        Args:
+            key (tuple): The key of the class.
+
+        Returns:
+            str: The dotted module and class name.
+        """
+
+        return f"{self.modules[key]}.{key[1]}".lstrip(".")
+
+    def inherited_methods(self, key):
+        """
+        Gets the documented methods a class inherits and does not override.
+
+        Args:
+            key (tuple): The key of the class.
+
+        Returns:
+            list: Method dicts in MRO order, each with "name", "doc_string" and
+                  "inherited_from", the qualified name of the defining class.
+        """
+
+        seen = {method["name"] for method in self.classes[key].get("methods", [])}
+        inherited = []
+        for ancestor in self.mro(key)[1:]:
+            for method in self.inheritable_methods(ancestor):
+                if method["name"] in seen:
+                    continue
+                seen.add(method["name"])
+                inherited.append(method)
+        return inherited
+
+    def inheritable_methods(self, key):
+        """
+        Gets the methods of a class as its subclasses inherit them, memoized,
+        so every subclass shares the same method dicts.
+
+        Args:
+            key (tuple): The key of the class.
+
+        Returns:
+            list: Method dicts with "name", "doc_string" and "inherited_from".
+        """
+
+        methods = self.shared.get(key)
+        if methods is None:
+            inherited_from = self.display_name(key)
+            methods = self.shared.setdefault(
+                key,
+                [
+                    {
+                        "name": method["name"],
+                        "doc_string": method["doc_string"],
+                        "inherited_from": inherited_from,
+                    }
+                    for method in self.classes[key].get("methods", [])
+                ],
+            )
+        return methods
+
+    @staticmethod
+    def attach_inherited(tree):
+        """
+        Attaches the inherited documented methods to every class of a tree.
+
+        The file contents may be shared with a `ParseCache`, so they are never
+        changed: every file with a class that inherits methods gets a copy of
+        its content, with copies of those classes holding an "inherited" list.
+        An "inherited" list left from an earlier build, e.g. on content reused
+        with `--since`, is always replaced, or dropped if nothing is inherited.
+
+        Args:
+            tree (dict): The file tree, its file dicts are changed in place.
+
+        Returns:
+            int: The number of classes that inherit documented methods.
+        """
+
+        index = ClassIndex(tree)
+        count = 0
+        stack = [tree]
+        while stack:
+            branch = stack.pop()
+            stack.extend(branch.get("directories", []))
+            for file in branch.get("files", []):
+                content = file["content"]
+                classes = []
+                for class_doc in content["classes"]:
+                    key = (file["path"], class_doc["name"])
+                    inherited = (
+                        index.inherited_methods(key)
+                        if index.classes.get(key) is class_doc
+                        else []
+                    )
+                    if inherited:
+                        class_doc = {**class_doc, "inherited": inherited}
+                        count += 1
+                    elif "inherited" in class_doc:
+                        class_doc = ClassIndex.without_inherited(class_doc)
+                    classes.append(class_doc)
+                if any(
+                    new is not old for new, old in zip(classes, content["classes"])
+                ):
+                    file["content"] = {**content, "classes": classes}
+        return count
+
+    @staticmethod
+    def without_inherited(class_doc):
+        """
+        Copies a class dict without its "inherited" list.
+
+        Args:
+            class_doc (dict): A class dict.
+
+        Returns:
+            dict: The copy.
+        """
+
+        return {key: value for key, value in class_doc.items() if key != "inherited"}
+
+    @staticmethod
+    def strip_inherited(content):
+        """
+        Drops the "inherited" lists of the classes of a file's content, so
+        content reused from an earlier build never carries lists computed
+        from another tree.
+
+        Args:
+            content (dict): The content of a file, which is not changed.
+
+        Returns:
+            dict: The content itself if no class has an "inherited" list,
+                  otherwise a copy without them.
+        """
+
+        classes = content["classes"]
+        if not any("inherited" in class_doc for class_doc in classes):
+            return content
+        return {
+            **content,
+            "classes": [ClassIndex.without_inherited(item) for item in classes],
+        }
+
+    @staticmethod
+    def inherited_items(class_doc):
+        """
+        Gets the inherited methods of a class as items for the renderers.
+
+        Args:
+            class_doc (dict): A class dict, as attached by `attach_inherited`.
+
+        Returns:
+            list: Method dicts whose name notes the defining class.
+        """
+
+        return [
+            {
+                "name": f"{method['name']} (inherited from {method['inherited_from']})",
+                "doc_string": method["doc_string"],
+            }
+            for method in class_doc.get("inherited", [])
+        ]
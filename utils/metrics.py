@@ -0,0 +1,300 @@
+"""
+This module collects the metrics of a run and writes them for CI dashboards.
+
+Classes:
+
+    Metrics:
+        Collects stage durations, counts, cache statistics, bytes read and
+        written, peak memory and worker counts, and writes them as
+        OpenMetrics text or JSON.
+
+    StageTimer:
+        Times a stage, used as a context manager.
+"""
+
+import json
+import sys
+import threading
+import time
+
+
+# Metric name -> (unit, help). Names are prefixed with `METRIC_PREFIX` in
+# OpenMetrics output, metrics with a unit end with it.
+METRIC_DEFINITIONS = {
+    "stage_duration_seconds": ("seconds", "Wall time of each stage"),
+    "files": ("", "Python files documented"),
+    "files_with_diagnostics": ("", "Python files that could not be parsed"),
+    "parsed_files": ("", "Python files parsed, not reused from a cache"),
+    "symbols": ("", "Documented functions, classes and methods"),
+    "parsed_docstrings": ("", "Docstrings parsed, not reused from a cache"),
+    "cache_lookups": ("", "Parse cache lookups by result"),
+    "cache_hit_ratio": ("", "Share of parse cache lookups served from the cache"),
+    "read_bytes": ("bytes", "Bytes of Python source read"),
+    "written_bytes": ("bytes", "Bytes of output written"),
+    "peak_memory_bytes": ("bytes", "Peak resident memory by process"),
+    "workers": ("", "Configured workers by kind"),
+}
+METRIC_PREFIX = "pydocgen_"
+
+
+class Metrics:
+    """
+    Collects the metrics of a run.
+
+    Metrics are disabled by default and the instrumented code then only
+    checks `enabled`. Every sample is a metric name from `METRIC_DEFINITIONS`
+    with optional labels, e.g. `("symbols", (("kind", "method"),))`.
+
+    Attributes:
+        enabled (bool): Whether metrics are collected.
+        samples (dict): Maps (name, labels) to the value.
+    """
+
+    def __init__(self):
+        """
+        Initializes disabled Metrics.
+        """
+
+        self.enabled = False
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def enable(self):
+        """
+        Starts collecting metrics.
+        """
+
+        self.enabled = True
+
+    @staticmethod
+    def key(name, labels):
+        """
+        Gets the key of a sample.
+
+        Args:
+            name (str): The metric name, a key of `METRIC_DEFINITIONS`.
+            labels (dict): The labels of the sample.
+
+        Returns:
+            tuple: The metric name and the sorted label pairs.
+        """
+
+        return name, tuple(sorted(labels.items()))
+
+    def add(self, name, value=1, **labels):
+        """
+        Adds to a sample, from any thread.
+
+        Args:
+            name (str): The metric name.
+            value (int or float, optional): The amount to add. Defaults to 1.
+            **labels: The labels of the sample.
+        """
+
+        key = self.key(name, labels)
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        Sets a sample.
+
+        Args:
+            name (str): The metric name.
+            value (int or float): The value.
+            **labels: The labels of the sample.
+        """
+
+        self.samples[self.key(name, labels)] = value
+
+    def stage(self, stage, **labels):
+        """
+        Times a stage, adding its wall time to "stage_duration_seconds".
+
+        Args:
+            stage (str): The stage, e.g. "walk".
+            **labels: Further labels, e.g. the output type of a render.
+
+        Returns:
+            StageTimer: A context manager timing the stage.
+        """
+
+        return StageTimer(self, stage, labels)
+
+    def add_tree(self, tree):
+        """
+        Counts the files and symbols of the file tree.
+
+        Args:
+            tree (dict): The file tree.
+        """
+
+        from .file_tools import FileTools
+
+        self.set("files", 0)
+        for kind in ("function", "class", "method"):
+            self.set("symbols", 0, kind=kind)
+        stack = [tree]
+        while stack:
+            branch = stack.pop()
+            stack.extend(branch.get("directories", []))
+            for file in branch.get("files", []):
+                content = file["content"]
+                self.add("files")
+                self.add("symbols", len(content["functions"]), kind="function")
+                self.add("symbols", len(content["classes"]), kind="class")
+                self.add(
+                    "symbols",
+                    sum(len(item.get("methods", [])) for item in content["classes"]),
+                    kind="method",
+                )
+        self.set("files_with_diagnostics", len(FileTools.collect_diagnostics(tree)))
+
+    def add_cache(self, cache):
+        """
+        Records the lookups of a parse cache.
+
+        Args:
+            cache (ParseCache): The cache used by the walk, or None.
+        """
+
+        hits = 0 if cache is None else cache.hits
+        misses = 0 if cache is None else cache.misses
+        self.set("cache_lookups", hits, result="hit")
+        self.set("cache_lookups", misses, result="miss")
+        if hits + misses:
+            self.set("cache_hit_ratio", hits / (hits + misses))
+
+    def add_peak_memory(self):
+        """
+        Records the peak resident memory of this process and its workers.
+
+        Only available where the `resource` module is, i.e. not on Windows.
+        """
+
+        try:
+            import resource
+        except ImportError:
+            return
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        for process, who in (
+            ("main", resource.RUSAGE_SELF),
+            ("workers", resource.RUSAGE_CHILDREN),
+        ):
+            self.set(
+                "peak_memory_bytes",
+                resource.getrusage(who).ru_maxrss * scale,
+                process=process,
+            )
+
+    def to_json(self):
+        """
+        Serializes the metrics as JSON.
+
+        Metrics without labels map to their value, metrics with labels to a
+        list of {"labels": ..., "value": ...} objects.
+
+        Returns:
+            str: The metrics as a JSON string.
+        """
+
+        metrics = {}
+        for (name, labels), value in sorted(self.samples.items()):
+            if labels:
+                metrics.setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+            else:
+                metrics[name] = value
+        return json.dumps(metrics, indent=2)
+
+    def to_openmetrics(self):
+        """
+        Serializes the metrics in the OpenMetrics text format.
+
+        Returns:
+            str: The metrics, ending with "# EOF".
+        """
+
+        lines = []
+        for name, (unit, description) in METRIC_DEFINITIONS.items():
+            samples = sorted(
+                (labels, value)
+                for (sample_name, labels), value in self.samples.items()
+                if sample_name == name
+            )
+            if not samples:
+                continue
+            metric = f"{METRIC_PREFIX}{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            if unit:
+                lines.append(f"# UNIT {metric} {unit}")
+            lines.append(f"# HELP {metric} {description}.")
+            for labels, value in samples:
+                label_text = ",".join(
+                    f'{label}="{json.dumps(str(text))[1:-1]}"' for label, text in labels
+                )
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{metric}{label_text} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """
+        Writes the metrics, as JSON if the path ends with ".json" and as
+        OpenMetrics text otherwise.
+
+        Args:
+            path (str): The path of the metrics file, e.g. "metrics.prom".
+
+        Returns:
+            None: If the file was written successfully.
+            str: An error message otherwise.
+        """
+
+        from .file_tools import FileTools
+
+        if path.endswith(".json"):
+            return FileTools.write_file(path, self.to_json())
+        return FileTools.write_file(path, self.to_openmetrics())
+
+
+class StageTimer:
+    """
+    Times a stage, used as a context manager.
+    """
+
+    __slots__ = ("metrics", "stage", "labels", "start")
+
+    def __init__(self, metrics, stage, labels):
+        """
+        Initializes the StageTimer.
+
+        Args:
+            metrics (Metrics): The metrics the duration is added to.
+            stage (str): The stage.
+            labels (dict): Further labels of the sample.
+        """
+
+        self.metrics = metrics
+        self.stage = stage
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.metrics.enabled:
+            self.metrics.add(
+                "stage_duration_seconds",
+                time.perf_counter() - self.start,
+                stage=self.stage,
+                **self.labels,
+            )
+
+
+# The metrics collected by the whole pipeline
+METRICS = Metrics()
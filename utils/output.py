@@ -10,17 +10,107 @@ Classes:
     Html:
         Generates HTML documentation with a basic style.
 
+    TemplateHtml:
+        Generates the same HTML from precompiled, user overridable templates.
+
+    LazyHtml:
+        Generates an HTML skeleton of the directories and files, loading the
+        content of each file from a fragment when it is opened.
+
     Markdown:
         Generates Markdown documentation.
 
     Builder:
         Orchestrates the building process for different output formats 
-        (HTML, Markdown, JSON).
+        (HTML, Markdown, JSON, SQLite and the binary tree format).
 """
 
 import json
+import re
+from html import escape
+from os.path import dirname, join
 from .terminal import Print
 from .file_tools import FileTools
+from .hierarchy import ClassIndex
+from .templates import Template, TEMPLATES, TEMPLATE_FIELDS
+from .trace import TRACER
+
+
+# Name of the generated file for each output type
+OUTPUT_FILE_NAMES = {
+    "html": "index.html",
+    "markdown": "doc.md",
+    "json": "doc.json",
+    "sqlite": "doc.sqlite",
+    "tree": "doc.tree",
+    "lazy-html": "lazy.html",
+}
+
+# Directory of the per-file fragments of "lazy-html", next to `lazy.html`
+LAZY_FRAGMENT_DIRECTORY = "lazy"
+
+# Name of the external stylesheet, `digest` is a hash of its minified content
+STYLESHEET_NAME = "style.{digest}.css"
+
+# The stylesheet of the HTML outputs, inlined in the page by default
+STYLE = """  body {
+    font-family: sans-serif;
+    margin: 0;
+  }
+  
+  .container {
+    margin: 20px;
+  }
+  
+  h3 {
+    font-style: oblique; 
+  }
+    
+  details {
+    margin: 1rem 0;
+    border: 1px solid #ccc;
+    border-radius: 5px;
+    padding: 1rem;
+    background-color: #f8f8f8; /* Light gray background */
+  }
+  
+  summary {
+    cursor: pointer;
+    font-weight: bold;
+  }
+  
+  section {
+    margin-left: 1rem;
+  }
+  
+  .item {
+    margin: 0.5rem 0;
+    border: 1px solid #eee;
+    border-radius: 3px;
+    padding: 0.5rem;
+    background-color: #f0f0f0; /* Lighter gray background */
+  }
+  
+  .item h3 {
+    margin-bottom: 0.25rem;
+  }
+  
+  .doc-string-list-item {
+    margin-left: 1rem;
+    list-style-type: disc;
+  }
+
+  .diagnostic {
+    color: #b00020;
+    font-family: monospace;
+  }
+  
+"""
+
+# Elements whose whitespace is significant, kept as is by `Html.minify_html`
+PRESERVED_ELEMENTS = re.compile(
+    r"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.DOTALL | re.IGNORECASE
+)
 
 
 class Json(Print):
@@ -78,7 +168,8 @@ class Html:
     This class handles the generation of HTML documentation for the codebase.
 
     Attributes:
-        style (str): The inline CSS style content to be included in the HTML.
+        stylesheet (str): The URL of an external stylesheet linked instead of
+                          inlining `STYLE`, or None to inline it.
 
     Methods:
 
@@ -104,68 +195,21 @@ class Html:
             Builds the HTML representation for a single parameter or return value.
     """
 
-    def build_html(self, tree):
+    stylesheet = None
+
+    def build_html(self, tree, mapper=map):
         """
         Builds the complete HTML content from the parsed file tree structure.
 
         Args:
           tree (dict): The parsed file tree structure representing the codebase.
+          mapper (callable, optional): A `map` compatible function used to render
+                                       the top level files and directories, e.g.
+                                       `ProcessPoolExecutor.map`. Defaults to `map`.
 
         Returns:
           str: The complete HTML content as a string.
         """
-        style = """
-    <style>
-  body {
-    font-family: sans-serif;
-    margin: 0;
-  }
-  
-  .container {
-    margin: 20px;
-  }
-  
-  h3 {
-    font-style: oblique; 
-  }
-    
-  details {
-    margin: 1rem 0;
-    border: 1px solid #ccc;
-    border-radius: 5px;
-    padding: 1rem;
-    background-color: #f8f8f8; /* Light gray background */
-  }
-  
-  summary {
-    cursor: pointer;
-    font-weight: bold;
-  }
-  
-  section {
-    margin-left: 1rem;
-  }
-  
-  .item {
-    margin: 0.5rem 0;
-    border: 1px solid #eee;
-    border-radius: 3px;
-    padding: 0.5rem;
-    background-color: #f0f0f0; /* Lighter gray background */
-  }
-  
-  .item h3 {
-    margin-bottom: 0.25rem;
-  }
-  
-  .doc-string-list-item {
-    margin-left: 1rem;
-    list-style-type: disc;
-  }
-  
-</style>
-    """
-
         html = f"""<!DOCTYPE html>
 <html lang="en">
   <head>
@@ -173,38 +217,118 @@ class Html:
     <meta name="viewport" content="width=device-width, initial-scale=1.0" />
     <title>Documentation</title>
   </head>
-  {style}
+  {self.build_style()}
   <body>
   
-  {self.build_directory(tree, base=True)}
+  {self.build_directory(tree, base=True, mapper=mapper)}{self.build_scripts()}
   
   </body>
 </html>
 """
         return html
 
-    def build_directory(self, directory, base=False):
+    def build_scripts(self):
+        """
+        Builds the scripts included at the end of the page.
+
+        Returns:
+          str: The script tags, none by default.
+        """
+
+        return ""
+
+    def build_style(self):
+        """
+        Builds the style of the page, inline or linking `stylesheet`.
+
+        Returns:
+          str: The `<style>` element, or the `<link>` to the stylesheet.
+        """
+
+        if self.stylesheet is None:
+            return f"\n    <style>\n{STYLE}</style>\n    "
+        return f'<link rel="stylesheet" href="{escape(self.stylesheet)}" />'
+
+    @staticmethod
+    def stylesheet_asset():
+        """
+        Gets the minified stylesheet and its content hashed file name, so
+        browsers can cache it for as long as it does not change.
+
+        Returns:
+          str: The file name, e.g. "style.1a2b3c4d5e6f.css".
+          str: The minified CSS.
+        """
+
+        import hashlib
+
+        css = Html.minify_css(STYLE)
+        digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+        return STYLESHEET_NAME.format(digest=digest), css
+
+    @staticmethod
+    def minify_css(css):
+        """
+        Minifies a stylesheet, removing its comments and the whitespace that is
+        not needed to separate values.
+
+        Args:
+          css (str): The stylesheet, such as `STYLE`.
+
+        Returns:
+          str: The minified stylesheet.
+        """
+
+        css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+        css = re.sub(r"\s+", " ", css)
+        css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+        return css.replace(";}", "}").strip()
+
+    @staticmethod
+    def minify_html(html):
+        """
+        Minifies a page or fragment, collapsing whitespace runs to one space
+        and removing the whitespace between tags. The content of the elements
+        in `PRESERVED_ELEMENTS` is kept as is.
+
+        Args:
+          html (str): The HTML.
+
+        Returns:
+          str: The minified HTML, rendered like the original.
+        """
+
+        parts = PRESERVED_ELEMENTS.split(html)
+        minified = []
+        # split() yields text, then the preserved element and its tag name
+        for index in range(0, len(parts), 3):
+            text = re.sub(r"\s+", " ", parts[index])
+            minified.append(re.sub(r">\s+<", "><", text))
+            if index + 1 < len(parts):
+                minified.append(parts[index + 1])
+        return "".join(minified).strip()
+
+    def build_directory(self, directory, base=False, mapper=map):
         """
         Recursively builds the HTML representation for a folder within the tree.
 
         Args:
           folder (dict): A dictionary representing a folder within the file tree.
+          mapper (callable, optional): A `map` compatible function used to render
+                                       the direct children. Defaults to `map`.
 
         Returns:
           str: The HTML representation of the folder and its contents.
         """
         directory_name = directory["name"] if "name" in directory else ""
         file_list = (
-            [self.build_file(file) for file in directory["files"]]
+            list(mapper(self.build_file, directory["files"]))
             if "files" in directory
             else ""
         )
         files_content = f"<section>{''.join(file_list)}</section>"
         folder_list = (
-            [
-                self.build_directory(directory_item)
-                for directory_item in directory["directories"]
-            ]
+            list(mapper(self.build_directory, directory["directories"]))
             if "directories" in directory
             else []
         )
@@ -239,6 +363,10 @@ class Html:
         """
         start_tag = "<details>"
         title = f"<summary>{file['name']}</summary>"
+        diagnostics_content = "".join(
+            f'<p class="diagnostic">{escape(FileTools.describe_diagnostic(diagnostic))}</p>'
+            for diagnostic in file["content"].get("diagnostics", [])
+        )
         class_list = [
             self.build_item(item, item_type="Class")
             for item in file["content"]["classes"]
@@ -256,7 +384,14 @@ class Html:
         )
 
         end_tag = "</details>"
-        return start_tag + title + classes_content + functions_content + end_tag
+        return (
+            start_tag
+            + title
+            + diagnostics_content
+            + classes_content
+            + functions_content
+            + end_tag
+        )
 
     def build_item(self, item, item_type="Function"):
         """
@@ -274,7 +409,7 @@ class Html:
         short_description, long_description = self.build_description(item)
         meta_items = self.build_meta_items(item["doc_string"]["meta"])
         sub_items = (
-            self.build_sub_items(item["methods"])
+            self.build_sub_items(item["methods"] + ClassIndex.inherited_items(item))
             if item_type == "Class" and "methods" in item
             else ""
         )
@@ -375,6 +510,382 @@ class Html:
         return f'<li class="doc-string-list-item">{arg_name} ({type_name}){description}</li>'
 
 
+class TemplateHtml(Html):
+    """
+    An HTML renderer driven by precompiled, user overridable templates.
+
+    Each file is rendered into a single buffer, and docstring meta is
+    partitioned into params and returns in one pass.
+
+    Attributes:
+        templates (dict): The template sources in use.
+    """
+
+    def __init__(self, templates=None):
+        """
+        Initializes the renderer and compiles the templates.
+
+        Args:
+            templates (dict, optional): Templates overriding the defaults in
+                                        `TEMPLATES`. Defaults to None.
+
+        Raises:
+            ValueError: If a template name or field is unknown.
+        """
+
+        self.templates = dict(TEMPLATES)
+        for name, text in (templates or {}).items():
+            if name not in TEMPLATES:
+                raise ValueError(f"Unknown template '{name}'")
+            self.templates[name] = text
+        self.compile_templates()
+
+    def compile_templates(self):
+        """
+        Compiles the templates, keeping templates without fields as plain strings.
+        """
+
+        self.compiled = {}
+        for name, text in self.templates.items():
+            if name in TEMPLATE_FIELDS:
+                self.compiled[name] = Template(text, TEMPLATE_FIELDS[name]).render
+            else:
+                self.compiled[name] = text
+
+    def __getstate__(self):
+        """
+        Drops the compiled functions, which cannot be pickled.
+
+        Returns:
+            dict: The picklable state.
+        """
+
+        return {"templates": self.templates}
+
+    def __setstate__(self, state):
+        """
+        Restores the templates and compiles them again.
+
+        Args:
+            state (dict): The state returned by `__getstate__`.
+        """
+
+        self.templates = state["templates"]
+        self.compile_templates()
+
+    def build_file(self, file):
+        """
+        Builds the HTML representation for a single file with its docstrings.
+
+        Args:
+          file (dict): A dictionary representing a file with its docstring information.
+
+        Returns:
+          str: The HTML representation of the file and its docstrings.
+        """
+
+        buffer = []
+        self.render_file(buffer.append, file)
+        return "".join(buffer)
+
+    def build_item(self, item, item_type="Function"):
+        """
+        Builds the HTML representation for a docstring item (function, class, etc.).
+
+        Args:
+          item (dict): A dictionary representing a docstring item.
+
+        Returns:
+          str: The HTML representation of the docstring item.
+        """
+
+        buffer = []
+        self.render_item(buffer.append, item, item_type)
+        return "".join(buffer)
+
+    def build_meta_items(self, items):
+        """
+        Processes docstring meta information (parameters, returns) into HTML.
+
+        Args:
+          items (list): A list of dictionaries containing docstring meta information.
+
+        Returns:
+          str: The HTML representation of the parameters and return values sections.
+        """
+
+        buffer = []
+        self.render_meta_items(buffer.append, items)
+        return "".join(buffer)
+
+    def build_list_item(self, item):
+        """
+        Builds the HTML representation for a single parameter or return value.
+
+        Args:
+          item (dict): A dictionary representing a single parameter or return value.
+
+        Returns:
+          str: The HTML representation of the parameter or return value list item.
+        """
+
+        return self.compiled["list_item"](
+            arg_name=item["arg_name"] if "arg_name" in item else "",
+            type_name=item["type_name"],
+            description=item["description"],
+        )
+
+    def render_file(self, append, file):
+        """
+        Appends the HTML for a file to the output buffer.
+
+        Args:
+            append (callable): The `append` method of the output buffer.
+            file (dict): A dictionary representing a file.
+        """
+
+        append(self.compiled["file_start"](name=file["name"]))
+        self.render_file_content(append, file)
+        append(self.compiled["file_end"])
+
+    def render_file_content(self, append, file):
+        """
+        Appends the HTML for the diagnostics, classes and functions of a file.
+
+        Args:
+            append (callable): The `append` method of the output buffer.
+            file (dict): A dictionary representing a file.
+        """
+
+        compiled = self.compiled
+        for diagnostic in file["content"].get("diagnostics", []):
+            append(
+                compiled["diagnostic"](
+                    message=escape(FileTools.describe_diagnostic(diagnostic))
+                )
+            )
+        for items, item_type in (
+            (file["content"]["classes"], "Class"),
+            (file["content"]["functions"], "Function"),
+        ):
+            if len(items) > 0:
+                append(compiled["group_start"])
+                for item in items:
+                    self.render_item(append, item, item_type)
+                append(compiled["group_end"])
+
+    def render_item(self, append, item, item_type="Function"):
+        """
+        Appends the HTML for a docstring item to the output buffer.
+
+        Args:
+            append (callable): The `append` method of the output buffer.
+            item (dict): A dictionary representing a docstring item.
+            item_type (str, optional): "Class" or "Function". Defaults to "Function".
+        """
+
+        compiled = self.compiled
+        doc_string = item["doc_string"]
+        append(compiled["item_start"](name=item["name"]))
+        if doc_string:
+            if "short_description" in doc_string:
+                append(
+                    compiled["short_description"](
+                        short_description=doc_string["short_description"]
+                    )
+                )
+            if "long_description" in doc_string:
+                append(
+                    compiled["long_description"](
+                        long_description=doc_string["long_description"]
+                    )
+                )
+        self.render_meta_items(append, doc_string["meta"])
+        if item_type == "Class" and "methods" in item:
+            for method in item["methods"] + ClassIndex.inherited_items(item):
+                self.render_item(append, method)
+        append(compiled["item_end"])
+
+    def render_meta_items(self, append, items):
+        """
+        Appends the params and returns sections to the output buffer,
+        partitioning the meta list in a single pass.
+
+        Args:
+            append (callable): The `append` method of the output buffer.
+            items (list): A list of dictionaries containing docstring meta information.
+        """
+
+        params = []
+        returns = []
+        for item in items:
+            args = item["args"]
+            if args:
+                if args[0] == "param":
+                    params.append(item)
+                elif args[0] == "returns":
+                    returns.append(item)
+
+        compiled = self.compiled
+        list_item = compiled["list_item"]
+        append(compiled["meta_start"])
+        for heading, section in (
+            (compiled["params_heading"], params),
+            (compiled["returns_heading"], returns),
+        ):
+            if section:
+                append(heading)
+                for item in section:
+                    append(
+                        list_item(
+                            arg_name=item["arg_name"] if "arg_name" in item else "",
+                            type_name=item["type_name"],
+                            description=item["description"],
+                        )
+                    )
+
+
+class LazyHtml(TemplateHtml):
+    """
+    An HTML renderer that ships only the directory and file skeleton.
+
+    Every file is a closed `<details>` referencing a fragment with its
+    content, which a small script fetches and inserts the first time the
+    file is opened. The page and its DOM hold one element per directory and
+    file however many symbols there are. Browsers only fetch fragments over
+    HTTP, not from `file://` pages.
+
+    Attributes:
+        fragment_directory (str): The directory of the fragments, relative to
+                                  the page.
+        fragments (list): (relative path, HTML) of every fragment of the last
+                          build.
+    """
+
+    def __init__(self, templates=None, fragment_directory=LAZY_FRAGMENT_DIRECTORY):
+        """
+        Initializes the renderer and compiles the templates.
+
+        Args:
+            templates (dict, optional): Templates overriding the defaults in
+                                        `TEMPLATES`. Defaults to None.
+            fragment_directory (str, optional): The directory of the fragments,
+                                                relative to the page.
+                                                Defaults to "lazy".
+        """
+
+        super().__init__(templates)
+        self.fragment_directory = fragment_directory
+        self.fragments = []
+        self.numbers = {}
+
+    def __getstate__(self):
+        """
+        Drops the compiled functions and the fragments of the last build.
+
+        Returns:
+            dict: The picklable state.
+        """
+
+        return {
+            "templates": self.templates,
+            "fragment_directory": self.fragment_directory,
+        }
+
+    def __setstate__(self, state):
+        """
+        Restores the templates and compiles them again.
+
+        Args:
+            state (dict): The state returned by `__getstate__`.
+        """
+
+        super().__setstate__(state)
+        self.fragment_directory = state["fragment_directory"]
+        self.fragments = []
+        self.numbers = {}
+
+    def build_html(self, tree, mapper=map):
+        """
+        Builds the skeleton page, and the fragments into `fragments`.
+
+        Args:
+          tree (dict): The parsed file tree structure representing the codebase.
+          mapper (callable, optional): A `map` compatible function used to render
+                                       the fragments. Defaults to `map`.
+
+        Returns:
+          str: The skeleton page.
+        """
+
+        files = []
+        stack = [tree]
+        while stack:
+            directory = stack.pop()
+            files.extend(directory.get("files", []))
+            stack.extend(reversed(directory.get("directories", [])))
+        self.numbers = {file["path"]: number for number, file in enumerate(files)}
+        self.fragments = [
+            (self.fragment_path(number), fragment)
+            for number, fragment in enumerate(mapper(self.build_fragment, files))
+        ]
+        # The skeleton itself is small, it is rendered in this process
+        return super().build_html(tree)
+
+    def fragment_path(self, number):
+        """
+        Gets the path of a fragment relative to the page.
+
+        Args:
+            number (int): The number of the file.
+
+        Returns:
+            str: The relative path, e.g. "lazy/12.html".
+        """
+
+        return f"{self.fragment_directory}/{number}.html"
+
+    def build_fragment(self, file):
+        """
+        Builds the fragment holding the content of a file.
+
+        Args:
+            file (dict): A dictionary representing a file.
+
+        Returns:
+            str: The HTML of the file's diagnostics, classes and functions.
+        """
+
+        buffer = []
+        self.render_file_content(buffer.append, file)
+        return "".join(buffer)
+
+    def build_file(self, file):
+        """
+        Builds the closed `<details>` of a file, referencing its fragment.
+
+        Args:
+          file (dict): A dictionary representing a file.
+
+        Returns:
+          str: The HTML of the file in the skeleton.
+        """
+
+        return self.compiled["lazy_file"](
+            name=file["name"], src=self.fragment_path(self.numbers[file["path"]])
+        )
+
+    def build_scripts(self):
+        """
+        Builds the script loading the fragments.
+
+        Returns:
+          str: The script tag.
+        """
+
+        return self.compiled["lazy_script"]
+
+
 class Markdown:
     """
     This class handles the generation of Markdown documentation for the codebase.
@@ -406,42 +917,42 @@ class Markdown:
             Builds the Markdown representation for a single parameter or return value.
     """
 
-    def build_markdown(self, tree):
+    def build_markdown(self, tree, mapper=map):
         """
         Builds the complete Markdown content from the parsed file tree structure.
 
         Args:
           tree (dict): The parsed file tree structure representing the codebase.
+          mapper (callable, optional): A `map` compatible function used to render
+                                       the top level files and directories, e.g.
+                                       `ProcessPoolExecutor.map`. Defaults to `map`.
 
         Returns:
           str: The complete Markdown content as a string.
         """
 
-        return self.build_directory(tree, base=True)
+        return self.build_directory(tree, base=True, mapper=mapper)
 
-    def build_directory(self, directory, base=False):
+    def build_directory(self, directory, base=False, mapper=map):
         """
         Recursively builds the Markdown representation for a directory within the tree.
 
         Args:
           directory (dict): A dictionary representing a folder within the file tree.
+          mapper (callable, optional): A `map` compatible function used to render
+                                       the direct children. Defaults to `map`.
 
         Returns:
           str: The Markdown representation of the folder and its contents.
         """
         directory_name = directory["name"] if "name" in directory else ""
         files_content = "\n".join(
-            [self.build_file(file) for file in directory["files"]]
+            list(mapper(self.build_file, directory["files"]))
             if "files" in directory
             else ""
         )
         folder_content = (
-            "\n".join(
-                [
-                    self.build_directory(directory_item)
-                    for directory_item in directory["directories"]
-                ]
-            )
+            "\n".join(list(mapper(self.build_directory, directory["directories"])))
             if "directories" in directory
             else ""
         )
@@ -462,6 +973,8 @@ class Markdown:
           str: The Markdown representation of the file and its docstrings.
         """
         title = f"**{file['name']}**\n"
+        for diagnostic in file["content"].get("diagnostics", []):
+            title += f"\n> {FileTools.describe_diagnostic(diagnostic)}\n"
         classes_content = (
             "\n".join(
                 [
@@ -495,7 +1008,7 @@ class Markdown:
         short_description, long_description = self.build_description(item)
         meta_items = self.build_meta_items(item["doc_string"]["meta"])
         sub_items = (
-            self.build_sub_items(item["methods"])
+            self.build_sub_items(item["methods"] + ClassIndex.inherited_items(item))
             if item_type == "Class" and "methods" in item
             else ""
         )
@@ -601,54 +1114,184 @@ class Builder:
 
     """
 
-    def __init__(self):
+    def __init__(self, external_css=False, minify=False):
         """
         Initializes the Builder instance.
 
+        Args:
+            external_css (bool, optional): Link the HTML outputs to a shared,
+                                           minified and content hashed
+                                           stylesheet written next to them,
+                                           instead of inlining the style.
+                                           Defaults to False.
+            minify (bool, optional): Minify the HTML outputs. Defaults to False.
+
         Sets up initial attributes:
             - `self.content`: Stores the generated content.
-            - `self.html`: An instance of the Html class.
+            - `self.assets`: (relative path, content) of the files written next
+                             to the content, such as the stylesheet.
+            - `self.html`: An instance of the TemplateHtml class.
+            - `self.lazy_html`: An instance of the LazyHtml class.
             - `self.markdown`: An instance of the Markdown class.
             - `self.json`: An instance of the Json class.
         """
 
+        self.external_css = external_css
+        self.minify = minify
         self.content = None
-        self.html = Html()
+        self.assets = []
+        self.html = TemplateHtml()
+        self.lazy_html = LazyHtml()
         self.markdown = Markdown()
         self.json = Json()
 
-    def build(self, tree, output_type):
+    def build(self, tree, output_type, workers=1):
         """
         Builds the output content based on the specified output type.
 
         Args:
             tree: The input data structure (likely a tree-like representation).
-            output_type: The desired output format ("html", "markdown", or "json").
+            output_type: The desired output format ("html", "markdown", "json",
+                         "sqlite", "tree" or "lazy-html").
+            workers (int, optional): Number of processes rendering the top level
+                                     files and directories of html and markdown
+                                     output, or the fragments of lazy-html. The
+                                     fragments are joined in order, so the
+                                     content is identical to a serial build.
+                                     Defaults to 1.
+
+        Returns:
+            The generated content string, or bytes for "sqlite" and "tree".
+        """
+
+        with TRACER.span(
+            "render", "render", output_type=output_type, workers=workers
+        ) as span:
+            if workers > 1 and output_type in ("html", "markdown", "lazy-html"):
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    content = self.render(tree, output_type, executor.map)
+            else:
+                content = self.render(tree, output_type)
+            if content is not None:
+                span.args["size"] = len(content)
+        return content
+
+    def render(self, tree, output_type, mapper=map):
+        """
+        Renders the tree with the renderer for the output type.
+
+        Args:
+            tree (dict): The file tree.
+            output_type (str): The desired output format ("html", "markdown", or "json").
+            mapper (callable, optional): A `map` compatible function used to render
+                                         the top level files and directories.
+                                         Defaults to `map`.
 
         Returns:
             The generated content string.
         """
 
-        if output_type == "html":
-            self.content = self.html.build_html(tree)
+        self.assets = []
+        if output_type in ("html", "lazy-html"):
+            return self.render_html(tree, output_type, mapper)
         if output_type == "markdown":
-            self.content = self.markdown.build_markdown(tree)
+            self.content = self.markdown.build_markdown(tree, mapper=mapper)
         if output_type == "json":
             self.content = self.json.build_json(tree)
+        if output_type == "sqlite":
+            from .database import Sqlite
+
+            self.content = Sqlite().build_database(tree)
+        if output_type == "tree":
+            from .tree_format import TreeFormat
+
+            self.content = TreeFormat.dumps(tree)
 
         return self.content
 
-    def output_content(self, output_path):
+    def render_html(self, tree, output_type, mapper=map):
+        """
+        Renders an HTML output type with its assets, minified if `minify` is set.
+
+        Args:
+            tree (dict): The file tree.
+            output_type (str): "html" or "lazy-html".
+            mapper (callable, optional): See `render`. Defaults to `map`.
+
+        Returns:
+            str: The page.
+        """
+
+        renderer = self.lazy_html if output_type == "lazy-html" else self.html
+        stylesheet = Html.stylesheet_asset() if self.external_css else None
+        renderer.stylesheet = None if stylesheet is None else stylesheet[0]
+        self.content = renderer.build_html(tree, mapper=mapper)
+        if output_type == "lazy-html":
+            self.assets.extend(renderer.fragments)
+        if self.minify:
+            self.content = Html.minify_html(self.content)
+            self.assets = [
+                (path, Html.minify_html(fragment)) for path, fragment in self.assets
+            ]
+        if stylesheet is not None:
+            self.assets.append(stylesheet)
+        return self.content
+
+    def output_content(self, output_path, compress=None, keep_uncompressed=False):
         """
         Writes the generated content to the specified output path.
 
+        All files are written atomically and only renamed into place together.
+
         Utilizes the `write_file` method inherited from the `FileOpts` base class.
 
         Args:
             output_path: The path to the output file.
+            compress (str, optional): A codec from `COMPRESSION_CODECS`, compressing
+                                      the content while it is written.
+                                      Defaults to None.
+            keep_uncompressed (bool, optional): Also write the plain file, so the
+                                                compressed file is a pre-compressed
+                                                sibling (e.g. `index.html.gz`).
+                                                Defaults to False.
 
         Returns:
             The result of the `write_file` operation (likely a boolean indicating success).
         """
 
-        return FileTools.write_file(output_path, self.content)
+        return FileTools.write_files(
+            self.output_files(output_path, compress, keep_uncompressed)
+        )
+
+    def output_files(self, output_path, compress=None, keep_uncompressed=False):
+        """
+        Lists the files to write for the generated content, so the files of
+        several outputs can be written together.
+
+        Args:
+            output_path: The path to the output file.
+            compress (str, optional): See `output_content`. Defaults to None.
+            keep_uncompressed (bool, optional): See `output_content`.
+                                                Defaults to False.
+
+        Returns:
+            list: (path, content, compress) tuples for `FileTools.write_files`.
+                  The assets, the fragments of "lazy-html" and the stylesheet,
+                  are always written plain, for the page to fetch, with a
+                  compressed sibling if `compress` is set.
+        """
+
+        files = []
+        if compress is None or keep_uncompressed:
+            files.append((output_path, self.content, None))
+        if compress is not None:
+            files.append((output_path, self.content, compress))
+        directory = dirname(output_path)
+        for relative_path, asset in self.assets:
+            path = join(directory, relative_path)
+            files.append((path, asset, None))
+            if compress is not None:
+                files.append((path, asset, compress))
+        return files
@@ -0,0 +1,249 @@
+"""
+This module reports the progress of the walk while the files are parsed.
+
+Classes:
+
+    Progress:
+        Counts the discovered and parsed files and reports them with the
+        throughput and an estimated time remaining at a fixed rate.
+"""
+
+import sys
+import threading
+import time
+from os import stat
+
+
+# Seconds between updates of the progress line on a terminal
+PROGRESS_INTERVAL = 0.25
+
+# Seconds between progress log lines when the output is not a terminal
+PROGRESS_LOG_INTERVAL = 10.0
+
+
+class Progress:
+    """
+    Reports the progress of the walk from a background thread.
+
+    The walk and the parse scheduler only increment counters through
+    `add_file`, so reporting costs the same however many files there are. A
+    discovery thread lists the Python files ahead of the walk, which gives the
+    totals the estimated time remaining is computed from. When a parse
+    scheduler lists the files anyway, it hands them over with `set_files`
+    instead, so the tree is not listed twice. On a terminal the
+    progress line is redrawn every `PROGRESS_INTERVAL` seconds, otherwise a
+    line is logged every `PROGRESS_LOG_INTERVAL` seconds.
+
+    Attributes:
+        enabled (bool): Whether files are counted.
+        discovered (int): The number of Python files found by discovery.
+        discovered_bytes (int): Their total size in bytes.
+        discovery_done (bool): Whether discovery has listed every file.
+        files (int): The number of files parsed, or reused from a cache.
+        symbols (int): The number of functions, classes and methods in them.
+        bytes (int): The total size of the files in bytes.
+    """
+
+    def __init__(self):
+        """
+        Initializes a disabled Progress.
+        """
+
+        self.enabled = False
+        self.stream = sys.stderr
+        self.interval = PROGRESS_INTERVAL
+        self.start_time = 0.0
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the counters.
+        """
+
+        self.discovered = 0
+        self.discovered_bytes = 0
+        self.discovery_done = False
+        self.files = 0
+        self.symbols = 0
+        self.bytes = 0
+
+    def start(self, root, follow_symlinks="once", stream=None, discover=True):
+        """
+        Starts counting files, discovering them and reporting the progress.
+
+        Args:
+            root (str): The directory being documented.
+            follow_symlinks (str, optional): The symbolic link policy of the
+                                             walk. Defaults to "once".
+            stream (file, optional): The stream the progress is written to.
+                                     Defaults to None, using `sys.stderr`.
+            discover (bool, optional): List the files in a discovery thread.
+                                       Defaults to True; False when they are
+                                       handed over with `set_files`.
+        """
+
+        self.reset()
+        self.stream = sys.stderr if stream is None else stream
+        is_terminal = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.interval = PROGRESS_INTERVAL if is_terminal else PROGRESS_LOG_INTERVAL
+        self.start_time = time.perf_counter()
+        self.stopped.clear()
+        self.enabled = True
+        self.threads = [
+            threading.Thread(target=self.report, args=(is_terminal,), daemon=True)
+        ]
+        if discover:
+            self.threads.append(
+                threading.Thread(
+                    target=self.discover, args=(root, follow_symlinks), daemon=True
+                )
+            )
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stops counting and reporting, and writes the final progress line.
+        """
+
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def discover(self, root, follow_symlinks):
+        """
+        Lists the Python files the walk will document, to know the totals.
+
+        Runs in the discovery thread.
+
+        Args:
+            root (str): The directory being documented.
+            follow_symlinks (str): The symbolic link policy of the walk.
+        """
+
+        from .file_tools import FileTools, WalkGuard
+
+        try:
+            files = FileTools.list_python_files(root, WalkGuard(follow_symlinks))
+        except OSError:
+            return
+        self.set_files(files)
+
+    def set_files(self, files):
+        """
+        Sets the files the walk will document, to know the totals.
+
+        Args:
+            files (list): (absolute path, size) tuples, as listed by
+                          `FileTools.list_python_files`.
+        """
+
+        self.discovered_bytes = sum(size for _, size in files)
+        self.discovered = len(files)
+        self.discovery_done = True
+
+    def report(self, is_terminal):
+        """
+        Writes the progress at a fixed rate until stopped.
+
+        Runs in the reporting thread.
+
+        Args:
+            is_terminal (bool): Redraw one line instead of logging lines.
+        """
+
+        while True:
+            stopped = self.stopped.wait(self.interval)
+            if is_terminal:
+                # Redraw the line, and end it with the final counts
+                end = "\n" if stopped else ""
+                self.stream.write(f"\r{self.describe()}\033[K{end}")
+            else:
+                self.stream.write(f"{self.describe()}\n")
+            self.stream.flush()
+            if stopped:
+                return
+
+    @staticmethod
+    def count_symbols(content):
+        """
+        Counts the functions, classes and methods of a file's content.
+
+        Args:
+            content (dict): The content of a file, or None.
+
+        Returns:
+            int: The number of symbols.
+        """
+
+        if not content:
+            return 0
+        return len(content["functions"]) + sum(
+            1 + len(class_doc.get("methods", [])) for class_doc in content["classes"]
+        )
+
+    def add_file(self, path, file_stat, content):
+        """
+        Counts a file as parsed, from any thread.
+
+        Args:
+            path (str): The absolute path of the file.
+            file_stat (os.stat_result): The stat of the file, or None.
+            content (dict): The content of the file, or None if it was skipped.
+        """
+
+        if file_stat is None:
+            try:
+                file_stat = stat(path)
+            except OSError:
+                file_stat = None
+        symbols = self.count_symbols(content)
+        with self.lock:
+            self.files += 1
+            self.symbols += symbols
+            if file_stat is not None:
+                self.bytes += file_stat.st_size
+
+    def describe(self):
+        """
+        Describes the progress in one line.
+
+        Returns:
+            str: The progress, e.g. "Parsed 120/149 files (81%), 350 files/s,
+                 2100 symbols/s, 1.2 MB/s, ETA 0:03".
+        """
+
+        elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+        files, total = self.files, self.discovered
+        if self.discovery_done:
+            # The walk may document a file discovery skipped, never show > 100%
+            total = max(total, files)
+            counts = f"{files}/{total} files ({files / max(total, 1):.0%})"
+        else:
+            counts = f"{files} files (discovering)"
+        line = (
+            f"Parsed {counts}, {files / elapsed:.0f} files/s, "
+            f"{self.symbols / elapsed:.0f} symbols/s, "
+            f"{self.bytes / elapsed / 1e6:.1f} MB/s"
+        )
+        if self.discovery_done and 0 < files < total:
+            if self.discovered_bytes and self.bytes:
+                remaining = max(self.discovered_bytes - self.bytes, 0) / (
+                    self.bytes / elapsed
+                )
+            else:
+                remaining = (total - files) / (files / elapsed)
+            minutes, seconds = divmod(int(remaining + 0.5), 60)
+            line += f", ETA {minutes}:{seconds:02d}"
+        return line
+
+
+# The progress reporter used by the whole pipeline
+PROGRESS = Progress()
@@ -0,0 +1,532 @@
+"""
+This module parses Python files in worker processes or threads ahead of the
+walk.
+
+Classes:
+
+    ParseScheduler:
+        Dispatches files to a pool of parse workers largest first, so one big
+        file does not leave the other workers idle at the end of the run,
+        enforces the file size and parse time limits, and reports how busy
+        each worker was.
+"""
+
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from os import stat
+from .file_tools import FileTools, ParseCache, WalkGuard
+from .metrics import METRICS
+from .progress import PROGRESS, Progress
+from .trace import TRACER
+
+
+# "auto" parses in threads when the interpreter runs without the GIL
+PARSE_EXECUTORS = ("auto", "process", "thread")
+
+
+class ParseScheduler:
+    """
+    Parses the files a walk would parse in worker processes, largest first.
+
+    `prefetch` lists the files, skips those the cache can already serve, and
+    hands the rest to the workers ordered by descending size. Each worker gets
+    one file at a time and the next as soon as it is done, so the small files
+    fill in around the large ones. The parsed contents are handed to the
+    cache, and the walk that follows picks them up instead of parsing.
+
+    Files larger than `max_file_size` are never parsed. A worker still
+    parsing a file after `timeout` seconds is killed and replaced. Either way
+    the file is documented as empty and listed in `skipped`.
+
+    The workers are processes, or threads on free-threaded Python builds,
+    where they parse in parallel and hand the contents over without pickling
+    them. Threads cannot be killed: a thread past the timeout is abandoned,
+    it finishes its file in the background and its result is dropped.
+
+    Attributes:
+        workers (int): The number of workers.
+        executor (str): "process" or "thread", the kind of the workers.
+        style (str): The docstring style, a key of `DOC_STRING_STYLES` or
+                     "detect-file".
+        max_file_size (int): The largest file size in bytes parsed, or None.
+        timeout (float): The seconds a worker may spend on one file, or None.
+        follow_symlinks (str): The symbolic link policy of the walk.
+        busy (dict): Maps a worker number to its (files, seconds parsing).
+        skipped (list): (path, size, seconds, reason) of every file not parsed.
+        wall_time (float): The seconds from the first dispatch to the last result.
+        parsed_bytes (int): The total size of the parsed files.
+    """
+
+    def __init__(
+        self,
+        workers,
+        style="auto",
+        max_file_size=None,
+        timeout=None,
+        follow_symlinks="once",
+        executor="auto",
+    ):
+        """
+        Initializes the ParseScheduler.
+
+        Args:
+            workers (int): The number of workers.
+            style (str, optional): The docstring style. Defaults to "auto".
+            max_file_size (int, optional): The largest file size in bytes that is
+                                           parsed. Defaults to None, no limit.
+            timeout (float, optional): The seconds a worker may spend parsing one
+                                       file. Defaults to None, no limit.
+            follow_symlinks (str, optional): The symbolic link policy of the walk,
+                                             a key of `FOLLOW_SYMLINKS`.
+                                             Defaults to "once".
+            executor (str, optional): A key of `PARSE_EXECUTORS`, see
+                                      `choose_executor`. Defaults to "auto".
+        """
+
+        self.workers = max(1, workers)
+        self.executor = self.choose_executor(executor, timeout)
+        self.style = style
+        self.max_file_size = max_file_size
+        self.timeout = timeout
+        self.follow_symlinks = follow_symlinks
+        self.busy = {}
+        self.skipped = []
+        self.wall_time = 0.0
+        self.parsed_bytes = 0
+
+    @staticmethod
+    def gil_enabled():
+        """
+        Checks whether the GIL is enabled, as it always is before Python 3.13.
+
+        Returns:
+            bool: False on a free-threaded build running without the GIL.
+        """
+
+        is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+        return True if is_gil_enabled is None else is_gil_enabled()
+
+    @staticmethod
+    def choose_executor(executor, timeout=None):
+        """
+        Resolves the kind of parse workers.
+
+        "auto" uses threads only without the GIL, where they parse in parallel,
+        and when there is no timeout, which only processes can enforce.
+
+        Args:
+            executor (str): A key of `PARSE_EXECUTORS`.
+            timeout (float, optional): The parse timeout. Defaults to None.
+
+        Returns:
+            str: "process" or "thread".
+
+        Raises:
+            ValueError: If the executor is unknown.
+        """
+
+        if executor not in PARSE_EXECUTORS:
+            raise ValueError(f"Unknown parse executor: {executor}")
+        if executor == "auto":
+            use_threads = timeout is None and not ParseScheduler.gil_enabled()
+            return "thread" if use_threads else "process"
+        return executor
+
+    @staticmethod
+    def parse_files(connection, style, trace_name=None):
+        """
+        Parses the files sent over a connection until it receives None.
+
+        Runs in a worker process.
+
+        Args:
+            connection (multiprocessing.connection.Connection): The worker's end
+                                                                of the pipe.
+            style (str): The docstring style.
+            trace_name (str, optional): The name of the worker in the trace, the
+                                        spans it records are sent back with
+                                        each result. Defaults to None, not
+                                        tracing.
+        """
+
+        # A forked worker inherits the events recorded so far, they are dropped,
+        # and the parent counts the parsed files from the results
+        TRACER.drain()
+        METRICS.enabled = PROGRESS.enabled = False
+        if trace_name is not None:
+            TRACER.enable(trace_name)
+        while True:
+            path = connection.recv()
+            if path is None:
+                return
+            start = time.perf_counter()
+            try:
+                content, error = FileTools.build_file_content(path, style=style), None
+            except Exception as exception:  # pylint: disable=broad-except
+                content, error = None, FileTools.build_diagnostic(exception)
+            connection.send(
+                (content, error, time.perf_counter() - start, TRACER.drain())
+            )
+
+    @staticmethod
+    def parse_in_thread(inbox, results, style):
+        """
+        Parses the files put in an inbox until it receives None.
+
+        Runs in a worker thread. The pipeline's tracer and metrics are shared
+        with the thread and record its parsing directly.
+
+        Args:
+            inbox (queue.SimpleQueue): The paths to parse.
+            results (queue.SimpleQueue): Receives (inbox, content, error,
+                                         seconds) for every path.
+            style (str): The docstring style.
+        """
+
+        while True:
+            path = inbox.get()
+            if path is None:
+                return
+            start = time.perf_counter()
+            try:
+                content, error = FileTools.build_file_content(path, style=style), None
+            except Exception as exception:  # pylint: disable=broad-except
+                content, error = None, FileTools.build_diagnostic(exception)
+            results.put((inbox, content, error, time.perf_counter() - start))
+
+    def start_thread(self, results):
+        """
+        Starts a worker thread.
+
+        Args:
+            results (queue.SimpleQueue): The queue the thread puts results in.
+
+        Returns:
+            queue.SimpleQueue: The inbox of the thread.
+        """
+
+        inbox = queue.SimpleQueue()
+        threading.Thread(
+            target=self.parse_in_thread, args=(inbox, results, self.style), daemon=True
+        ).start()
+        return inbox
+
+    def start_worker(self, number):
+        """
+        Starts a worker process.
+
+        Args:
+            number (int): The worker number.
+
+        Returns:
+            tuple: The process and the parent's end of its pipe.
+        """
+
+        trace_name = f"parse worker {number}" if TRACER.enabled else None
+        connection, child_connection = Pipe()
+        process = Process(
+            target=self.parse_files,
+            args=(child_connection, self.style, trace_name),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        return process, connection
+
+    @staticmethod
+    def pending_files(files, cache):
+        """
+        Gets the files the cache cannot serve, largest first.
+
+        Args:
+            files (list): A list of (absolute path, size) tuples.
+            cache (ParseCache): The cache used by the walk.
+
+        Returns:
+            list: (absolute path, stat) tuples ordered by descending size, ties
+                  in walk order. Files removed since they were listed are left
+                  out.
+        """
+
+        pending = []
+        for path, _ in files:
+            if cache.is_fresh(path):
+                continue
+            try:
+                file_stat = stat(path)
+            except OSError:
+                continue
+            if not cache.is_fresh(path, file_stat):
+                pending.append((path, file_stat))
+        pending.sort(key=lambda file: file[1].st_size, reverse=True)
+        return pending
+
+    def skip(self, cache, path, file_stat, seconds, reason):
+        """
+        Documents a file as empty and records why it was not parsed.
+
+        Args:
+            cache (ParseCache): The cache the walk will use.
+            path (str): The absolute path of the file.
+            file_stat (os.stat_result): The stat of the file.
+            seconds (float): The seconds spent on the file, or None.
+            reason (str): Why the file was not parsed.
+        """
+
+        cache.prefetched[path] = {"functions": [], "classes": []}
+        self.skipped.append((path, file_stat.st_size, seconds, reason))
+        if PROGRESS.enabled:
+            PROGRESS.add_file(path, file_stat, None)
+
+    def prefetch(self, base_path, cache=None):
+        """
+        Parses every file under a directory that the cache cannot serve.
+
+        Args:
+            base_path (str): The directory the walk will start from.
+            cache (ParseCache, optional): The cache the walk will use.
+                                          Defaults to None, creating one.
+
+        Returns:
+            ParseCache: The cache holding the parsed contents, to pass to the walk.
+        """
+
+        if cache is None:
+            cache = ParseCache()
+        pending = deque()
+        limit = self.max_file_size
+        files = FileTools.list_python_files(base_path, WalkGuard(self.follow_symlinks))
+        if PROGRESS.enabled:
+            PROGRESS.set_files(files)
+        for path, file_stat in self.pending_files(files, cache):
+            if limit is not None and file_stat.st_size > limit:
+                self.skip(cache, path, file_stat, None, "larger than the maximum file size")
+            else:
+                pending.append((path, file_stat))
+        if not pending:
+            return cache
+
+        start = time.perf_counter()
+        if self.executor == "thread":
+            self.parse_in_threads(cache, pending)
+        else:
+            self.parse_in_processes(cache, pending)
+        self.wall_time = time.perf_counter() - start
+        return cache
+
+    def store(self, cache, number, path, file_stat, content, error, seconds):
+        """
+        Hands a parsed file to the cache and counts it.
+
+        Args:
+            cache (ParseCache): The cache the walk will use.
+            number (int): The number of the worker that parsed the file.
+            path (str): The absolute path of the file.
+            file_stat (os.stat_result): The stat of the file.
+            content (dict): The parsed content, or None if the worker failed.
+            error (dict): The diagnostic of the worker's failure, documenting
+                          the file as empty, or None.
+            seconds (float): The seconds the worker spent parsing.
+        """
+
+        if error is not None:
+            content = {"functions": [], "classes": [], "diagnostics": [error]}
+        cache.prefetched[path] = content
+        self.parsed_bytes += file_stat.st_size
+        if PROGRESS.enabled:
+            PROGRESS.add_file(path, file_stat, content)
+        # Worker threads share the metrics and counted the file as they parsed
+        if METRICS.enabled and self.executor == "process":
+            METRICS.add("parsed_files")
+            METRICS.add("read_bytes", file_stat.st_size)
+            METRICS.add("parsed_docstrings", Progress.count_symbols(content))
+        files, busy = self.busy.get(number, (0, 0.0))
+        self.busy[number] = (files + 1, busy + seconds)
+
+    def parse_in_processes(self, cache, pending):
+        """
+        Parses the pending files in worker processes.
+
+        Args:
+            cache (ParseCache): The cache the walk will use.
+            pending (deque): (absolute path, stat) of the files, largest first.
+        """
+
+        workers = {
+            number: self.start_worker(number)
+            for number in range(1, min(self.workers, len(pending)) + 1)
+        }
+        idle = deque(workers)
+        # Maps a connection to (worker number, path, stat, dispatch time)
+        running = {}
+        try:
+            while pending or running:
+                while pending and idle:
+                    number = idle.popleft()
+                    path, file_stat = pending.popleft()
+                    workers[number][1].send(path)
+                    running[workers[number][1]] = (
+                        number,
+                        path,
+                        file_stat,
+                        time.perf_counter(),
+                    )
+
+                wait_time = None
+                if self.timeout is not None:
+                    oldest = min(dispatched for *_, dispatched in running.values())
+                    wait_time = max(0, oldest + self.timeout - time.perf_counter())
+
+                for connection in wait(list(running), timeout=wait_time):
+                    number, path, file_stat, dispatched = running.pop(connection)
+                    try:
+                        content, error, seconds, events = connection.recv()
+                    except EOFError:
+                        # The worker died, e.g. killed for running out of memory
+                        seconds = time.perf_counter() - dispatched
+                        self.skip(cache, path, file_stat, seconds, "worker crashed")
+                        workers[number][0].join()
+                        connection.close()
+                        workers[number] = self.start_worker(number)
+                    else:
+                        TRACER.extend(events)
+                        self.store(cache, number, path, file_stat, content, error, seconds)
+                    idle.append(number)
+
+                if self.timeout is not None:
+                    now = time.perf_counter()
+                    for connection, (number, path, file_stat, dispatched) in list(
+                        running.items()
+                    ):
+                        if now - dispatched < self.timeout:
+                            continue
+                        del running[connection]
+                        process, _ = workers[number]
+                        process.kill()
+                        process.join()
+                        connection.close()
+                        self.skip(cache, path, file_stat, now - dispatched, "timed out")
+                        files, busy = self.busy.get(number, (0, 0.0))
+                        self.busy[number] = (files, busy + now - dispatched)
+                        workers[number] = self.start_worker(number)
+                        idle.append(number)
+        finally:
+            # Workers still parsing are only left on errors, they are killed
+            for process, connection in workers.values():
+                if connection in running:
+                    process.kill()
+                else:
+                    connection.send(None)
+                process.join()
+                connection.close()
+
+    def parse_in_threads(self, cache, pending):
+        """
+        Parses the pending files in worker threads.
+
+        Args:
+            cache (ParseCache): The cache the walk will use.
+            pending (deque): (absolute path, stat) of the files, largest first.
+        """
+
+        results = queue.SimpleQueue()
+        workers = {
+            number: self.start_thread(results)
+            for number in range(1, min(self.workers, len(pending)) + 1)
+        }
+        idle = deque(workers)
+        # Maps an inbox to (worker number, path, stat, dispatch time)
+        running = {}
+        try:
+            while pending or running:
+                while pending and idle:
+                    number = idle.popleft()
+                    path, file_stat = pending.popleft()
+                    workers[number].put(path)
+                    running[workers[number]] = (
+                        number,
+                        path,
+                        file_stat,
+                        time.perf_counter(),
+                    )
+
+                wait_time = None
+                if self.timeout is not None:
+                    oldest = min(dispatched for *_, dispatched in running.values())
+                    wait_time = max(0, oldest + self.timeout - time.perf_counter())
+
+                try:
+                    inbox, content, error, seconds = results.get(timeout=wait_time)
+                except queue.Empty:
+                    pass
+                else:
+                    # Results of abandoned threads are no longer running
+                    if inbox in running:
+                        number, path, file_stat, _ = running.pop(inbox)
+                        self.store(cache, number, path, file_stat, content, error, seconds)
+                        idle.append(number)
+
+                if self.timeout is not None:
+                    now = time.perf_counter()
+                    for inbox, (number, path, file_stat, dispatched) in list(
+                        running.items()
+                    ):
+                        if now - dispatched < self.timeout:
+                            continue
+                        # The thread is abandoned, it stops after this file
+                        del running[inbox]
+                        inbox.put(None)
+                        self.skip(cache, path, file_stat, now - dispatched, "timed out")
+                        files, busy = self.busy.get(number, (0, 0.0))
+                        self.busy[number] = (files, busy + now - dispatched)
+                        workers[number] = self.start_thread(results)
+                        idle.append(number)
+        finally:
+            # Threads still parsing stop after their file
+            for inbox in workers.values():
+                inbox.put(None)
+
+    def utilization(self):
+        """
+        Gets the share of the wall time the workers spent parsing.
+
+        Returns:
+            float: The utilization between 0 and 1, or None if nothing was parsed.
+        """
+
+        if not self.wall_time:
+            return None
+        busy = sum(seconds for _, seconds in self.busy.values())
+        return busy / (self.wall_time * len(self.busy))
+
+    def summary(self):
+        """
+        Describes the parse run, one line per worker and per skipped file.
+
+        Returns:
+            list: The lines of the summary.
+        """
+
+        lines = []
+        utilization = self.utilization()
+        if utilization is not None:
+            files = sum(count for count, _ in self.busy.values())
+            lines.append(
+                f"Parsed {files} files ({self.parsed_bytes / 1e6:.1f} MB) on "
+                f"{len(self.busy)} {self.executor} workers in {self.wall_time:.2f}s, "
+                f"utilization {utilization:.0%}"
+            )
+            for number, (count, seconds) in sorted(self.busy.items()):
+                lines.append(
+                    f"  worker {number}: {count} files, {seconds:.2f}s parsing "
+                    f"({seconds / self.wall_time:.0%} busy)"
+                )
+        for path, size, seconds, reason in self.skipped:
+            elapsed = "" if seconds is None else f", {seconds:.1f}s"
+            lines.append(f"Skipped {path} ({size / 1e6:.2f} MB{elapsed}): {reason}")
+        return lines
@@ -0,0 +1,341 @@
+"""
+This module serves generated documentation from a warm in-memory tree.
+
+Classes:
+
+    DocServer:
+        Keeps the parsed file tree and the rendered output in memory, re-parsing
+        only files whose modification time changed since the last request.
+
+    DocRequestHandler:
+        Answers HTTP requests for the rendered documentation and server stats.
+
+    ThreadingUnixHTTPServer:
+        An HTTP server listening on a Unix domain socket.
+"""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import remove
+from os.path import exists
+from socketserver import ThreadingMixIn, UnixStreamServer
+from threading import Lock
+from .api import build_tree
+from .file_tools import FileTools, ParseCache, WalkGuard
+from .output import Builder
+from .terminal import Print
+
+
+# Request path -> (output type, content type)
+ROUTES = {
+    "/": ("html", "text/html; charset=utf-8"),
+    "/index.html": ("html", "text/html; charset=utf-8"),
+    "/doc.md": ("markdown", "text/markdown; charset=utf-8"),
+    "/doc.json": ("json", "application/json"),
+}
+
+
+class DocServer(Print):
+    """
+    Serves documentation for a directory from a warm in-memory tree.
+
+    Every request lists and stats the files again. The tree is only built
+    again, parsing the files whose modification time or size changed, and
+    output only rendered again, when a file was added, changed or removed.
+
+    Attributes:
+        root_path (str): The directory to document.
+        style (str): The docstring style passed to `build_tree`.
+        io_mode (str): The I/O mode passed to `build_tree`.
+        cache (ParseCache): The cache of parsed file contents.
+        rendered (dict): Maps an output type to its rendered content.
+        latencies (list): Request latencies in milliseconds.
+    """
+
+    def __init__(
+        self,
+        root_path,
+        style="auto",
+        io_mode="serial",
+        max_in_flight=16,
+        parse_workers=1,
+        max_file_size=None,
+        parse_timeout=None,
+        parse_executor="auto",
+        follow_symlinks="once",
+        inherited=False,
+    ):
+        """
+        Initializes the DocServer.
+
+        Args:
+            root_path (str): The directory to document.
+            style (str, optional): The docstring style. Defaults to "auto".
+            io_mode (str, optional): "serial" or "async". Defaults to "serial".
+            max_in_flight (int, optional): The maximum concurrent I/O calls in
+                                           "async" mode. Defaults to 16.
+            parse_workers (int, optional): Processes parsing changed files.
+                                           Defaults to 1.
+            max_file_size (int, optional): Files larger than this many bytes are
+                                           not parsed. Defaults to None.
+            parse_timeout (float, optional): Seconds a parse may take before it is
+                                             killed. Defaults to None.
+            parse_executor (str, optional): "auto", "process" or "thread".
+                                            Defaults to "auto".
+            follow_symlinks (str, optional): "once" or "never". Defaults to "once".
+            inherited (bool, optional): Attach inherited methods to classes.
+                                        Defaults to False.
+        """
+
+        self.root_path = root_path
+        self.style = style
+        self.io_mode = io_mode
+        self.max_in_flight = max_in_flight
+        self.parse_workers = parse_workers
+        self.max_file_size = max_file_size
+        self.parse_timeout = parse_timeout
+        self.parse_executor = parse_executor
+        self.follow_symlinks = follow_symlinks
+        self.inherited = inherited
+        self.cache = ParseCache()
+        self.builder = Builder()
+        self.tree = None
+        self.rendered = {}
+        self.latencies = []
+        self.lock = Lock()
+
+    def is_stale(self):
+        """
+        Checks whether any file was added, changed or removed since the last walk,
+        without parsing anything or building the tree.
+
+        Returns:
+            bool: True if the tree must be built again.
+        """
+
+        from .scheduler import ParseScheduler
+
+        files = FileTools.list_python_files(
+            self.root_path, WalkGuard(self.follow_symlinks)
+        )
+        if {path for path, _ in files} != self.cache.entries.keys():
+            return True
+        return bool(ParseScheduler.pending_files(files, self.cache))
+
+    def refresh(self):
+        """
+        Walks the directory if it is stale, parsing only changed files.
+
+        Returns:
+            bool: True if any file was added, changed or removed.
+        """
+
+        if self.tree is not None and not self.is_stale():
+            return False
+        self.cache.begin()
+        tree = build_tree(
+            self.root_path,
+            style=self.style,
+            io_mode=self.io_mode,
+            max_in_flight=self.max_in_flight,
+            cache=self.cache,
+            parse_workers=self.parse_workers,
+            max_file_size=self.max_file_size,
+            parse_timeout=self.parse_timeout,
+            parse_executor=self.parse_executor,
+            follow_symlinks=self.follow_symlinks,
+            inherited=self.inherited,
+        )
+        changed = self.cache.end() or self.tree is None
+        if changed:
+            self.tree = tree
+            self.rendered = {}
+        return changed
+
+    def render(self, output_type):
+        """
+        Gets the up to date content for an output type.
+
+        Args:
+            output_type (str): "html", "markdown" or "json".
+
+        Returns:
+            tuple: The content (None if it could not be built) and a dict of
+                   timings in milliseconds for the "refresh" and "render" steps.
+        """
+
+        with self.lock:
+            start = time.perf_counter()
+            self.refresh()
+            refreshed = time.perf_counter()
+            if output_type not in self.rendered:
+                self.rendered[output_type] = self.builder.build(self.tree, output_type)
+            content = self.rendered[output_type]
+            rendered = time.perf_counter()
+
+        return content, {
+            "refresh": (refreshed - start) * 1000,
+            "render": (rendered - refreshed) * 1000,
+        }
+
+    def record_latency(self, path, latency):
+        """
+        Records and prints the latency of a request.
+
+        Args:
+            path (str): The request path.
+            latency (float): The latency in milliseconds.
+        """
+
+        with self.lock:
+            self.latencies.append(latency)
+        self.print(f"{path} served in {latency:.1f} ms", color="cyan")
+
+    def stats(self):
+        """
+        Gets request latency and cache statistics.
+
+        Returns:
+            dict: The number of requests, latency percentiles in milliseconds,
+                  and cache hits, misses and size.
+        """
+
+        with self.lock:
+            latencies = sorted(self.latencies)
+            hits, misses = self.cache.hits, self.cache.misses
+            files = len(self.cache.entries)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(len(latencies) * fraction))
+            return round(latencies[index], 3)
+
+        return {
+            "requests": len(latencies),
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": percentile(1),
+            },
+            "cache": {"hits": hits, "misses": misses, "files": files},
+        }
+
+    def serve(self, host="127.0.0.1", port=8000, socket_path=None):
+        """
+        Serves the documentation until interrupted.
+
+        Args:
+            host (str, optional): The host to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 8000.
+            socket_path (str, optional): A Unix socket path to listen on instead
+                                         of a TCP port. Defaults to None.
+        """
+
+        # Warm the tree before accepting requests
+        self.refresh()
+
+        if socket_path is not None:
+            if exists(socket_path):
+                remove(socket_path)
+            server = ThreadingUnixHTTPServer(socket_path, DocRequestHandler)
+            address = f"unix:{socket_path}"
+        else:
+            server = ThreadingHTTPServer((host, port), DocRequestHandler)
+            address = f"http://{host}:{server.server_address[1]}"
+        server.doc_server = self
+
+        self.print(f"Serving {self.root_path} on {address}", color="green")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.print("Server stopped", color="yellow")
+        finally:
+            server.server_close()
+            if socket_path is not None and exists(socket_path):
+                remove(socket_path)
+
+
+class DocRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers requests for the documentation of a `DocServer`.
+
+    Routes:
+        / and /index.html: The HTML documentation.
+        /doc.md: The Markdown documentation.
+        /doc.json: The JSON documentation.
+        /stats: Request latency and cache statistics as JSON.
+    """
+
+    def do_GET(self):
+        """
+        Handles a GET request.
+        """
+
+        start = time.perf_counter()
+        doc_server = self.server.doc_server
+        path = self.path.split("?", 1)[0]
+
+        if path == "/stats":
+            self.send_content(
+                json.dumps(doc_server.stats(), indent=4), "application/json", {}
+            )
+        elif path in ROUTES:
+            output_type, content_type = ROUTES[path]
+            content, timings = doc_server.render(output_type)
+            if content is None:
+                self.send_error(500, f"Unable to build {output_type} content")
+            else:
+                self.send_content(content, content_type, timings)
+        else:
+            self.send_error(404, f"Unknown path: {path}")
+
+        doc_server.record_latency(path, (time.perf_counter() - start) * 1000)
+
+    def send_content(self, content, content_type, timings):
+        """
+        Sends a 200 response with the content and a Server-Timing header.
+
+        Args:
+            content (str): The response body.
+            content_type (str): The Content-Type header.
+            timings (dict): Step timings in milliseconds.
+        """
+
+        body = content.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if timings:
+            self.send_header(
+                "Server-Timing",
+                ", ".join(f"{name};dur={value:.1f}" for name, value in timings.items()),
+            )
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        """
+        Gets the client address, which is empty for Unix sockets.
+
+        Returns:
+            str: The client address.
+        """
+
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """
+        Silences the default request log, `DocServer` prints its own.
+        """
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """
+    An HTTP server handling each request in a thread on a Unix domain socket.
+    """
+
+    daemon_threads = True
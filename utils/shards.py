@@ -0,0 +1,296 @@
+"""
+This module splits generation across several machines.
+
+Classes:
+
+    Shards:
+        Provides static methods for deterministically partitioning the Python
+        files of a project into shards, writing each shard's partial tree as an
+        intermediate artifact, and merging the artifacts back together.
+"""
+
+import heapq
+import json
+from zlib import crc32
+from .file_tools import FileTools, ParseCache, WalkGuard
+from .hierarchy import ClassIndex
+
+
+# Partitioning strategies accepted by `Shards.partition`
+SHARD_STRATEGIES = ("hash", "size")
+
+# Format name and version written into every shard artifact
+SHARD_FORMAT = "py-doc-generator-shard"
+SHARD_VERSION = 2
+
+
+class Shards:
+    """
+    This class provides static methods for sharded generation.
+
+    Every node walks the project and computes the same partition, parses only
+    the files of its own shard and writes the resulting partial tree, with the
+    files it was assigned. The `merge` step checks that the shards partition
+    one file list with one strategy, then walks the project once more with a
+    cache seeded from all the shards, so it parses nothing and its tree is
+    identical to a single build.
+    """
+
+    @staticmethod
+    def parse_spec(spec):
+        """
+        Parses a shard specification such as "2/4".
+
+        Args:
+            spec (str): The shard number and the shard count, separated by "/".
+                        Shards are numbered from 1.
+
+        Returns:
+            tuple: The shard number and count, or None on errors.
+            str: An error message, or None on success.
+        """
+
+        try:
+            number, count = (int(part) for part in spec.split("/"))
+        except ValueError:
+            return None, f"Invalid shard '{spec}', expected i/N such as 1/4"
+        if count < 1 or not 1 <= number <= count:
+            return None, f"Invalid shard '{spec}', i must be between 1 and N"
+        return (number, count), None
+
+    @staticmethod
+    def relative_path(path, root_path):
+        """
+        Gets a path relative to the project root, identical on every machine.
+
+        Args:
+            path (str): An absolute path inside the project.
+            root_path (str): The absolute path of the project root.
+
+        Returns:
+            str: The relative path with "/" separators.
+        """
+
+        return path[len(root_path) :].lstrip("/\\").replace("\\", "/")
+
+    @staticmethod
+    def partition(files, root_path, count, strategy="hash"):
+        """
+        Deterministically partitions files into shards.
+
+        "hash" assigns each file by a CRC32 of its relative path, which is
+        stable as files come and go. "size" assigns the largest files first,
+        each to the currently smallest shard, balancing the bytes parsed.
+
+        Args:
+            files (list): A list of (absolute path, size) tuples.
+            root_path (str): The absolute path of the project root.
+            count (int): The number of shards.
+            strategy (str, optional): "hash" or "size". Defaults to "hash".
+
+        Returns:
+            list: One set of absolute paths per shard.
+        """
+
+        shards = [set() for _ in range(count)]
+        if strategy == "hash":
+            for path, _ in files:
+                key = Shards.relative_path(path, root_path).encode("utf-8")
+                shards[crc32(key) % count].add(path)
+            return shards
+
+        # Ties are broken by the relative path, so every node agrees
+        ordered = sorted(
+            files, key=lambda file: (-file[1], Shards.relative_path(file[0], root_path))
+        )
+        loads = [(0, index) for index in range(count)]
+        for path, size in ordered:
+            load, index = heapq.heappop(loads)
+            shards[index].add(path)
+            heapq.heappush(loads, (load + size, index))
+        return shards
+
+    @staticmethod
+    def shard_cache(root_path, number, count, strategy="hash", follow_symlinks="once"):
+        """
+        Creates a cache that restricts parsing to the files of one shard.
+
+        Args:
+            root_path (str): The absolute path of the project root.
+            number (int): The shard number, from 1.
+            count (int): The number of shards.
+            strategy (str, optional): "hash" or "size". Defaults to "hash".
+            follow_symlinks (str, optional): The symbolic link policy of the
+                                             walk, so the partition lists the
+                                             same files. Defaults to "once".
+
+        Returns:
+            ParseCache: A cache parsing only this shard's files.
+            list: The (relative path, size) pairs of this shard's files.
+        """
+
+        files = FileTools.list_python_files(root_path, WalkGuard(follow_symlinks))
+        shards = Shards.partition(files, root_path, count, strategy)
+        assigned = sorted(
+            [Shards.relative_path(path, root_path), size]
+            for path, size in files
+            if path in shards[number - 1]
+        )
+        return ParseCache(parse_only=shards[number - 1]), assigned
+
+    @staticmethod
+    def build_artifact(tree, number, count, strategy, files):
+        """
+        Builds the intermediate artifact for a shard.
+
+        The "inherited" lists are left out, as they would be computed from the
+        partial tree; `merge --inherited` computes them from the whole one.
+
+        Args:
+            tree (dict): The partial tree built for the shard, its file dicts
+                         are changed in place.
+            number (int): The shard number, from 1.
+            count (int): The number of shards.
+            strategy (str): The partitioning strategy.
+            files (list): The (relative path, size) pairs of the files assigned
+                          to the shard, as returned by `shard_cache`.
+
+        Returns:
+            str: The artifact as a JSON string.
+        """
+
+        stack = [tree]
+        while stack:
+            branch = stack.pop()
+            stack.extend(branch.get("directories", []))
+            for file in branch.get("files", []):
+                file["content"] = ClassIndex.strip_inherited(file["content"])
+        return json.dumps(
+            {
+                "format": SHARD_FORMAT,
+                "version": SHARD_VERSION,
+                "shard": number,
+                "shards": count,
+                "strategy": strategy,
+                "root": tree["path"],
+                "files": files,
+                "tree": tree,
+            },
+            separators=(",", ":"),
+        )
+
+    @staticmethod
+    def load_artifacts(paths):
+        """
+        Loads shard artifacts and checks that they form one complete set.
+
+        The shards must share their count and strategy, and partitioning the
+        union of their files again must give each shard exactly its own files,
+        which fails when the nodes listed different files.
+
+        Args:
+            paths (list): The paths of the artifacts.
+
+        Returns:
+            list: The loaded artifacts, or None on errors.
+            str: An error message, or None on success.
+        """
+
+        artifacts = []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    artifact = json.load(file)
+            except (OSError, ValueError) as error:
+                return None, f"Unable to read shard {path}: {error}"
+            if artifact.get("format") != SHARD_FORMAT:
+                return None, f"Not a shard artifact: {path}"
+            if artifact.get("version") != SHARD_VERSION:
+                return None, f"Unsupported shard version in {path}"
+            artifacts.append(artifact)
+
+        if not artifacts:
+            return None, "No shards given"
+        count = artifacts[0]["shards"]
+        numbers = sorted(artifact["shard"] for artifact in artifacts)
+        if any(artifact["shards"] != count for artifact in artifacts):
+            return None, "Shards come from runs with different shard counts"
+        if numbers != list(range(1, count + 1)):
+            return None, f"Expected shards 1 to {count}, got {numbers}"
+        strategy = artifacts[0]["strategy"]
+        if any(artifact["strategy"] != strategy for artifact in artifacts):
+            return None, "Shards come from runs with different shard strategies"
+
+        # Relative paths are partitioned under an empty root
+        files = [
+            ("/" + path, size)
+            for artifact in artifacts
+            for path, size in artifact["files"]
+        ]
+        shards = Shards.partition(files, "", count, strategy)
+        for artifact in artifacts:
+            assigned = {"/" + path for path, _ in artifact["files"]}
+            if shards[artifact["shard"] - 1] != assigned:
+                return None, (
+                    "Shards were partitioned from different file lists, "
+                    "run every shard on the same checkout"
+                )
+        return artifacts, None
+
+    @staticmethod
+    def relocate(branch, old_root, new_root):
+        """
+        Rewrites the paths of a tree built under another root directory.
+
+        Args:
+            branch (dict): A directory of the tree, changed in place.
+            old_root (str): The absolute root path the tree was built under.
+            new_root (str): The absolute root path to move it to.
+        """
+
+        branch["path"] = new_root + branch["path"][len(old_root) :]
+        for file in branch.get("files", []):
+            file["path"] = new_root + file["path"][len(old_root) :]
+        for directory in branch.get("directories", []):
+            Shards.relocate(directory, old_root, new_root)
+
+    @staticmethod
+    def covered_paths(artifacts, root_path):
+        """
+        Gets the files assigned to any of the shards.
+
+        Args:
+            artifacts (list): The loaded shard artifacts.
+            root_path (str): The absolute path of the project root on this machine.
+
+        Returns:
+            set: The absolute paths of the files under `root_path`.
+        """
+
+        return {
+            f"{root_path}/{path}"
+            for artifact in artifacts
+            for path, _ in artifact["files"]
+        }
+
+    @staticmethod
+    def merge_cache(artifacts, root_path):
+        """
+        Creates a cache holding the contents parsed by all shards.
+
+        Args:
+            artifacts (list): The loaded shard artifacts.
+            root_path (str): The absolute path of the project root on this machine.
+
+        Returns:
+            ParseCache: A cache that parses nothing and serves every file
+                        from the shards.
+        """
+
+        cache = ParseCache(parse_only=set())
+        for artifact in artifacts:
+            tree = artifact["tree"]
+            if artifact["root"] != root_path:
+                Shards.relocate(tree, artifact["root"], root_path)
+            cache.entries.update(ParseCache.from_tree(tree, set()).entries)
+        return cache
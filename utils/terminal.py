@@ -140,6 +140,12 @@ class PrintInfoToTerminal(Print):
             color="cyan",
         )
         if "content" in file:
+            for diagnostic in file["content"].get("diagnostics", []):
+                self.print(
+                    f"{"".join(["\t" for i in range(0, level + 1)])}"
+                    f"∟ {diagnostic["type"]}: {diagnostic["message"]}",
+                    color="red",
+                )
             if "functions" in file["content"]:
                 for func in file["content"]["functions"]:
                     self.print_doc_item(func, level=level + 1)
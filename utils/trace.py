@@ -0,0 +1,199 @@
+"""
+This module records a timeline of the generation pipeline in the Chrome Trace
+Event format, which trace viewers such as Perfetto and chrome://tracing load.
+
+Classes:
+
+    Tracer:
+        Records spans for directory listings, file reads, parsing, rendering
+        and writing, tagged with the path, size, process and thread.
+
+    Span:
+        A span being recorded, used as a context manager.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class Span:
+    """
+    A span being recorded, from entering to exiting the context manager.
+
+    Attributes:
+        args (dict): The tags of the span, which may be added to until it ends.
+    """
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        """
+        Initializes the Span.
+
+        Args:
+            tracer (Tracer): The tracer recording the span.
+            name (str): The name of the span, e.g. "read".
+            category (str): The category of the span, e.g. "io".
+            args (dict): The tags of the span.
+        """
+
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        self.tracer.events.append(
+            {
+                "name": self.name,
+                "cat": self.category,
+                "ph": "X",
+                "ts": self.start / 1000,
+                "dur": (end - self.start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args,
+            }
+        )
+
+
+class NullSpan:
+    """
+    A span that records nothing, returned while tracing is disabled.
+    """
+
+    __slots__ = ("args",)
+
+    def __init__(self):
+        self.args = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+class Tracer:
+    """
+    Records spans of the generation pipeline.
+
+    Tracing is disabled by default and `span` then returns a shared no-op
+    span, so the instrumented code costs one call per span. Worker processes
+    record into their own copy of the tracer and send their events back with
+    their results, see `drain` and `extend`.
+
+    Attributes:
+        enabled (bool): Whether spans are recorded.
+        events (list): The recorded trace events.
+    """
+
+    def __init__(self):
+        """
+        Initializes a disabled Tracer.
+        """
+
+        self.enabled = False
+        self.events = []
+        self.null_span = NullSpan()
+
+    def enable(self, process_name="main"):
+        """
+        Starts recording spans.
+
+        Args:
+            process_name (str, optional): The name shown for this process.
+                                          Defaults to "main".
+        """
+
+        self.enabled = True
+        self.name_process(process_name)
+
+    def name_process(self, process_name):
+        """
+        Names the current process in the trace.
+
+        Args:
+            process_name (str): The name shown for this process.
+        """
+
+        self.events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "args": {"name": process_name},
+            }
+        )
+
+    def span(self, name, category, **args):
+        """
+        Creates a span, recorded when its context manager exits.
+
+        Args:
+            name (str): The name of the span, e.g. "read".
+            category (str): The category of the span, e.g. "io".
+            **args: Tags of the span, e.g. path and size.
+
+        Returns:
+            Span: The span, or a no-op span while tracing is disabled.
+        """
+
+        if not self.enabled:
+            return self.null_span
+        return Span(self, name, category, args)
+
+    def drain(self):
+        """
+        Takes the recorded events, e.g. to send them from a worker process.
+
+        Returns:
+            list: The events recorded since the last drain.
+        """
+
+        events, self.events = self.events, []
+        return events
+
+    def extend(self, events):
+        """
+        Adds events recorded by another process.
+
+        Args:
+            events (list): The events.
+        """
+
+        self.events.extend(events)
+
+    def save(self, path):
+        """
+        Writes the recorded events as a Chrome Trace Event file.
+
+        Args:
+            path (str): The path of the trace file, e.g. "trace.json".
+
+        Returns:
+            None: If the file was written successfully.
+            str: An error message otherwise.
+        """
+
+        from .file_tools import FileTools
+
+        return FileTools.write_file(
+            path,
+            json.dumps(
+                {"traceEvents": self.events, "displayTimeUnit": "ms"},
+                separators=(",", ":"),
+            ),
+        )
+
+
+# The tracer used by the whole pipeline
+TRACER = Tracer()
@@ -0,0 +1,134 @@
+"""
+This module provides a compact binary format for the parsed file tree, so a
+tree can be parsed once and rendered many times, e.g. by separate jobs.
+
+Classes:
+
+    TreeFormat:
+        Provides static methods for saving the file tree to, and loading it
+        from, the binary format.
+"""
+
+import marshal
+import sys
+
+
+# Magic bytes and format version at the start of every tree file
+TREE_MAGIC = b"PDGT"
+TREE_FORMAT_VERSION = 2
+
+# The Python version writing the file follows the format version, marshal
+# data is only guaranteed to load on the same major and minor version
+TREE_PYTHON_VERSION = bytes(sys.version_info[:2])
+
+# marshal version 4 is readable by every Python 3.4+ and writes repeated
+# objects as back-references to their first occurrence
+MARSHAL_VERSION = 4
+
+
+class TreeFormat:
+    """
+    This class provides static methods for the binary tree format.
+
+    A tree file is the magic bytes, a one byte format version, the major and
+    minor version of the Python that wrote it, and the marshal serialization
+    of the tree. Equal strings in the tree are first made the same object, so
+    marshal writes each string once and references it everywhere else, and
+    loading shares a single copy of each string.
+
+    As marshal is not stable across Python versions, a tree file only loads
+    on the Python version that wrote it; jobs exchanging trees must run the
+    same one.
+
+    Only load tree files from trusted sources, as for `marshal` itself.
+    """
+
+    @staticmethod
+    def dumps(tree):
+        """
+        Serializes the file tree to the binary format.
+
+        Args:
+            tree (dict): The file tree.
+
+        Returns:
+            bytes: The serialized tree.
+        """
+
+        strings = {}
+        canonical = strings.setdefault
+
+        def share(value):
+            value_type = type(value)
+            if value_type is str:
+                return canonical(value, value)
+            if value_type is dict:
+                return {canonical(key, key): share(item) for key, item in value.items()}
+            if value_type is list:
+                return [share(item) for item in value]
+            return value
+
+        return (
+            TREE_MAGIC
+            + bytes([TREE_FORMAT_VERSION])
+            + TREE_PYTHON_VERSION
+            + marshal.dumps(share(tree), MARSHAL_VERSION)
+        )
+
+    @staticmethod
+    def loads(data):
+        """
+        Deserializes a file tree from the binary format.
+
+        Args:
+            data (bytes): The serialized tree.
+
+        Returns:
+            dict: The file tree, or None on errors.
+            str: An error message, or None on success.
+        """
+
+        if len(data) <= len(TREE_MAGIC) or data[: len(TREE_MAGIC)] != TREE_MAGIC:
+            return None, "Not a tree file"
+        version = data[len(TREE_MAGIC)]
+        if version != TREE_FORMAT_VERSION:
+            return None, f"Unsupported tree format version {version}"
+        start = len(TREE_MAGIC) + 1
+        python_version = data[start : start + len(TREE_PYTHON_VERSION)]
+        if python_version != TREE_PYTHON_VERSION:
+            written = ".".join(str(number) for number in python_version)
+            running = ".".join(str(number) for number in TREE_PYTHON_VERSION)
+            return None, (
+                f"Tree file written by Python {written}, "
+                f"it can only be loaded by Python {written}, not {running}"
+            )
+        try:
+            tree = marshal.loads(data[start + len(TREE_PYTHON_VERSION) :])
+        except (EOFError, ValueError, TypeError) as error:
+            return None, f"Corrupt tree file: {error}"
+        if not isinstance(tree, dict):
+            return None, "Corrupt tree file: unexpected content"
+        return tree, None
+
+    @staticmethod
+    def load(path):
+        """
+        Loads a file tree saved with the "tree" output type.
+
+        Args:
+            path (str): The path of the tree file.
+
+        Returns:
+            dict: The file tree, or None on errors.
+            str: An error message, or None on success.
+        """
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError as error:
+            return None, f"Unable to read tree file {path}: {error}"
+        tree, error = TreeFormat.loads(data)
+        if error is not None:
+            return None, f"{error}: {path}"
+        return tree, None